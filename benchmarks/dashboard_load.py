@@ -0,0 +1,369 @@
+"""Нагрузочная проверка веб-дашборда (/getstate, /gethistory, /getresult) на синтетических базах
+
+Три части:
+    seed   - заполняет CourtActions.db и ArchiveCourtActions.db: N сотрудников x M реестров x K подач в архиве
+             (конечные статусы, время обновления за --days дней) и --active активных реестров на сотрудника;
+             поля клиентов и судов берутся из rmc_test_data.json, параметры сохраняются в load_test.json
+    run    - запускает веб-сервер (waitress, как main.py) на заполненных базах или использует --url
+             и воспроизводит опрос дашборда из --clients потоков: /getstate и /gethistory раз в --interval секунд
+             (с If-None-Match, как браузер), /getresult по случайной подаче с вероятностью --search
+    отчет  - по каждому эндпоинту: количество, ошибки, доля 304, запросов в секунду, p50/p95/p99/max;
+             --save сохраняет отчет в json, --baseline сравнивает с сохраненным ранее
+
+Запуск:
+    python benchmarks/dashboard_load.py seed --dir D:/load --users 10 --registers 100 --lawsuits 1000
+    python benchmarks/dashboard_load.py run --dir D:/load --clients 50 --interval 0 --duration 60 --save after.json
+    python benchmarks/dashboard_load.py run --dir D:/load --clients 50 --interval 0 --duration 60 --baseline after.json
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_PATH))
+
+#параметры заполнения, по ним run выбирает lawsuit_id для /getresult
+SEED_INFO_FILE = 'load_test.json'
+
+#первый lawsuit_id синтетических подач
+FIRST_LAWSUIT_ID = 10_000_000
+
+#размер пачки вставки в архив
+INSERT_BATCH_SIZE = 20_000
+
+#периоды графика и их доля в опросе (по умолчанию дашборд открыт на Daily)
+HISTORY_PERIODS = {'Daily': 0.7, 'Weekly': 0.1, 'Monthly': 0.1, 'Quarterly': 0.05, 'Yearly': 0.05}
+
+#поля клиента и суда из реестра РМЦ -> поля CourtActions (как в core.rmc.data_unloading_from_RMC)
+CLIENT_FIELDS = {
+    'client_last_name': 'lastName', 'client_first_name': 'firstName', 'client_father_name': 'fatherName',
+    'client_birthday': 'birthday', 'client_gender': 'gender', 'client_birth_place': 'birthPlace',
+    'client_series': 'series', 'client_number': 'number', 'client_issue_on': 'issueOn',
+    'client_issue_by': 'issueBy', 'client_code': 'code', 'client_snils': 'snils', 'client_inn': 'inn',
+    'client_registration_index': 'registrationIndex', 'client_reg_address': 'registrationAddressLine',
+    'client_actual_index': 'actualIndex', 'client_actual_address': 'actualAddressLine',
+    'client_phone': 'phoneNumber',
+}
+
+
+def _templates() -> list[dict]:
+    """Поля подач из rmc_test_data.json в формате строк CourtActions"""
+    with open(PROJECT_PATH / 'rmc_test_data.json', encoding='utf-8') as file:
+        data = json.load(file)
+    templates = []
+    for lawsuit in data['lawsuits']:
+        client, court = lawsuit.get('client', {}), lawsuit.get('court', {})
+        row = {column: client.get(field, '') for column, field in CLIENT_FIELDS.items()}
+        row.update({'register_id': data['printRegisterId'], 'court_name': court.get('name', ''),
+                    'region_name': court.get('regionName', '')})
+        templates.append(row)
+    return templates
+
+
+def _owners(count:int) -> list[str]:
+    """Сотрудники из файла сотрудников дашборда, при нехватке - синтетические user_<n>"""
+    from utils.users import get_users
+
+    owners = list(get_users())[:count]
+    return owners + [f'user_{idx}' for idx in range(len(owners), count)]
+
+
+def _fill_archive(owners:list[str], registers:int, lawsuits:int, days:int, rnd:random.Random) -> int:
+    """Завершенные реестры в архиве: конечные статусы, подачи реестра идут с интервалом ~1 минута"""
+    from sqlalchemy import insert
+
+    from database import CourtActionsArchive
+    from database.database import engine_archive
+    from models import db_models
+
+    statuses = [db_models.Status.COMPLETED] * 17 + [db_models.Status.ERROR] * 2 + [db_models.Status.ERROR_RMC]
+    templates = _templates()
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    lawsuit_id, batch, total = FIRST_LAWSUIT_ID, [], 0
+    with engine_archive.begin() as conn:
+        for owner_idx, owner in enumerate(owners):
+            for register_idx in range(registers):
+                register_num = str(100_000 + owner_idx * registers + register_idx)
+                started = now - datetime.timedelta(seconds=rnd.randrange(days * 86400))
+                for idx in range(lawsuits):
+                    status = rnd.choice(statuses)
+                    updated_on = started + datetime.timedelta(seconds=idx * 60 + rnd.randrange(60))
+                    completed = status==db_models.Status.COMPLETED
+                    batch.append({
+                        **rnd.choice(templates),
+                        'court_action_id': f'CA-load-{lawsuit_id}', 'lawsuit_id': lawsuit_id,
+                        'status': status, 'rmc_register_num': register_num, 'owner': owner,
+                        'project': 'Интел', 'activity_type': db_models.ActivityType.NORMAL,
+                        'package_of_docs_checked': True, 'missing_docs_added': True,
+                        'date_uploaded_docs_on_gas': updated_on if completed else None,
+                        'result_number': f'{lawsuit_id}/{updated_on:%Y}' if completed else None,
+                        'error_msg': None if completed else 'Синтетическая ошибка',
+                        'created_on': started - datetime.timedelta(hours=1), 'updated_on': updated_on,
+                    })
+                    lawsuit_id += 1
+                    if len(batch) >= INSERT_BATCH_SIZE:
+                        conn.execute(insert(CourtActionsArchive.__table__), batch)
+                        total += len(batch)
+                        batch = []
+        if batch:
+            conn.execute(insert(CourtActionsArchive.__table__), batch)
+            total += len(batch)
+    return total
+
+
+def _fill_active(owners:list[str], active:int, lawsuits:int, first_id:int, rnd:random.Random) -> int:
+    """Активные реестры: подачи загружаются append_bulk, часть переводится в промежуточные и конечные статусы"""
+    from database import CourtActions
+    from models import db_models
+
+    templates = _templates()
+    lawsuit_id, total = first_id, 0
+    for owner_idx, owner in enumerate(owners):
+        for register_idx in range(active):
+            ids = list(range(lawsuit_id, lawsuit_id + lawsuits))
+            lawsuit_id += lawsuits
+            total += CourtActions.append_bulk(
+                rmc_register_num=str(900_000 + owner_idx * active + register_idx), owner=owner, project='Интел',
+                activity_type=db_models.ActivityType.NORMAL,
+                data_list=[{**rnd.choice(templates), 'lawsuit_id': idx} for idx in ids])
+            done = rnd.randrange(lawsuits + 1)
+            CourtActions.change_status_many(status=db_models.Status.COMPLETED, lawsuit_ids=ids[:done],
+                                            date_and_time_gus=datetime.datetime.now().strftime('%d.%m.%Y %H:%M:%S'))
+            CourtActions.change_status_many(status=db_models.Status.DOCS_FORMED,
+                                            lawsuit_ids=ids[done:done + (lawsuits - done) // 2])
+    return total
+
+
+def seed(args) -> None:
+    os.environ['DATABASE_DIRECTORY'] = str(Path(args.dir).resolve())
+    Path(args.dir).mkdir(parents=True, exist_ok=True)
+    from database.counters import rebuild_counters
+    from database.migrations import migrate_all
+    from database.rollup import rebuild_rollup
+
+    rnd = random.Random(args.seed)
+    migrate_all()
+    owners = _owners(args.users)
+    started = time.perf_counter()
+    archived = _fill_archive(owners, args.registers, args.lawsuits, args.days, rnd)
+    print(f"Архив: {archived} подач за {time.perf_counter() - started:.1f} с")
+    started = time.perf_counter()
+    first_active = FIRST_LAWSUIT_ID + archived
+    active = _fill_active(owners, args.active, args.lawsuits, first_active, rnd)
+    print(f"Активная база: {active} подач за {time.perf_counter() - started:.1f} с")
+    started = time.perf_counter()
+    rebuild_counters()
+    rebuild_rollup()
+    print(f"Счетчики и почасовые количества пересчитаны за {time.perf_counter() - started:.1f} с")
+    with open(Path(args.dir) / SEED_INFO_FILE, 'w', encoding='utf-8') as file:
+        json.dump({'users': owners, 'registers': args.registers, 'lawsuits': args.lawsuits,
+                   'active': args.active, 'archived': archived, 'first_lawsuit_id': FIRST_LAWSUIT_ID,
+                   'last_lawsuit_id': first_active + active - 1}, file, ensure_ascii=False, indent=4)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(db_dir:str, threads:int) -> tuple[subprocess.Popen, str]:
+    """Веб-сервер в отдельном процессе (чтобы нагрузчик не делил с ним GIL)"""
+    import requests
+
+    port = _free_port()
+    code = ("from waitress import serve; from web.app import app; "
+            f"serve(app, host='127.0.0.1', port={port}, threads={threads}, _quiet=True)")
+    env = {**os.environ, 'DATABASE_DIRECTORY': str(Path(db_dir).resolve())}
+    process = subprocess.Popen([sys.executable, '-c', code], cwd=PROJECT_PATH, env=env)
+    url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            requests.get(url + '/getstate', timeout=5)
+            return process, url
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('Веб-сервер не запустился')
+
+
+class Client(threading.Thread):
+    """Вкладка дашборда: опрос /getstate и /gethistory, поиск подачи по id"""
+
+    def __init__(self, url:str, args, lawsuit_ids:tuple[int, int], stop_at:float, seed:int) -> None:
+        super().__init__(daemon=True)
+        self.url = url
+        self.args = args
+        self.lawsuit_ids = lawsuit_ids
+        self.stop_at = stop_at
+        self.rnd = random.Random(seed)
+        self.etags: dict[str, str] = {}
+        #(эндпоинт, длительность, код ответа или None при исключении, размер тела)
+        self.samples: list[tuple[str, float, int|None, int]] = []
+
+
+    def _request(self, endpoint:str, method:str, path:str, **kwargs) -> None:
+        import requests
+
+        headers = {}
+        if not self.args.no_etag and method=='GET' and path in self.etags:
+            headers['If-None-Match'] = self.etags[path]
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.url + path, headers=headers, timeout=60, **kwargs)
+        except requests.RequestException:
+            self.samples.append((endpoint, time.perf_counter() - started, None, 0))
+            return
+        self.samples.append((endpoint, time.perf_counter() - started, response.status_code, len(response.content)))
+        if etag:=response.headers.get('ETag'):
+            self.etags[path] = etag
+
+
+    def run(self) -> None:
+        import requests
+
+        self.session = requests.Session()
+        periods, weights = list(HISTORY_PERIODS), list(HISTORY_PERIODS.values())
+        period = self.rnd.choices(periods, weights)[0]
+        while time.perf_counter() < self.stop_at:
+            started = time.perf_counter()
+            self._request('/getstate', 'GET', '/getstate')
+            self._request('/gethistory', 'GET', f'/gethistory?period={period}')
+            if self.rnd.random() < self.args.search:
+                self._request('/getresult', 'POST', '/getresult',
+                              data={'lawsuitId': self.rnd.randint(*self.lawsuit_ids)})
+            if self.rnd.random() < 0.05:
+                #пользователь переключил период графика
+                period = self.rnd.choices(periods, weights)[0]
+            time.sleep(max(0.0, self.args.interval - (time.perf_counter() - started)))
+        self.session.close()
+
+
+def _percentile(values:list[float], pct:float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def _report(samples:list[tuple], duration:float) -> dict:
+    by_endpoint = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample[0]].append(sample)
+    report = {}
+    for endpoint, items in sorted(by_endpoint.items()):
+        latencies = [item[1] for item in items]
+        report[endpoint] = {
+            'requests': len(items),
+            'errors': sum(1 for item in items if item[2] is None or item[2] >= 400),
+            'not_modified': sum(1 for item in items if item[2]==304),
+            'rps': len(items) / duration,
+            'p50_ms': statistics.median(latencies) * 1000,
+            'p95_ms': _percentile(latencies, 0.95) * 1000,
+            'p99_ms': _percentile(latencies, 0.99) * 1000,
+            'max_ms': max(latencies) * 1000,
+            'avg_bytes': sum(item[3] for item in items) / len(items),
+        }
+    return report
+
+
+def _print_report(report:dict, baseline:dict|None) -> None:
+    print(f"{'эндпоинт':<12} {'запросов':>9} {'ошибок':>7} {'304':>6} {'зап/с':>8} "
+          f"{'p50 мс':>8} {'p95 мс':>8} {'p99 мс':>8} {'max мс':>8} {'байт':>8}")
+    for endpoint, row in report.items():
+        print(f"{endpoint:<12} {row['requests']:>9} {row['errors']:>7} {row['not_modified']:>6} {row['rps']:>8.1f} "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} "
+              f"{row['avg_bytes']:>8.0f}")
+        if baseline and (base:=baseline.get(endpoint)):
+            deltas = ', '.join(f"{key} {(row[key] / base[key] - 1) * 100:+.0f}%"
+                               for key in ('rps', 'p50_ms', 'p95_ms', 'p99_ms') if base[key])
+            print(f"{'':<12} к baseline: {deltas}")
+
+
+def run(args) -> None:
+    server = None
+    if args.url:
+        url = args.url.rstrip('/')
+    else:
+        server, url = _start_server(args.dir, args.threads)
+    try:
+        lawsuit_ids = (FIRST_LAWSUIT_ID, FIRST_LAWSUIT_ID)
+        if args.dir and (info_path:=Path(args.dir) / SEED_INFO_FILE).exists():
+            with open(info_path, encoding='utf-8') as file:
+                info = json.load(file)
+            lawsuit_ids = (info['first_lawsuit_id'], info['last_lawsuit_id'])
+
+        stop_at = time.perf_counter() + args.duration
+        clients = [Client(url, args, lawsuit_ids, stop_at, seed=args.seed + idx) for idx in range(args.clients)]
+        started = time.perf_counter()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        duration = time.perf_counter() - started
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    report = _report([sample for client in clients for sample in client.samples], duration)
+    print(f"Клиентов {args.clients}, интервал опроса {args.interval} с, {duration:.1f} с, "
+          f"If-None-Match {'выключен' if args.no_etag else 'включен'}")
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)['endpoints']
+    _print_report(report, baseline)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({'clients': args.clients, 'interval': args.interval, 'duration': duration,
+                       'etag': not args.no_etag, 'endpoints': report}, file, ensure_ascii=False, indent=4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Нагрузочная проверка веб-дашборда')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = commands.add_parser('seed', help='заполнить базы синтетическими подачами')
+    seed_parser.add_argument('--dir', required=True, help='папка баз (DATABASE_DIRECTORY)')
+    seed_parser.add_argument('--users', type=int, default=10, help='количество сотрудников')
+    seed_parser.add_argument('--registers', type=int, default=100, help='реестров в архиве на сотрудника')
+    seed_parser.add_argument('--lawsuits', type=int, default=1000, help='подач в реестре')
+    seed_parser.add_argument('--active', type=int, default=1, help='активных реестров на сотрудника')
+    seed_parser.add_argument('--days', type=int, default=365, help='за сколько дней распределены подачи архива')
+    seed_parser.add_argument('--seed', type=int, default=1, help='начальное значение генератора')
+    seed_parser.set_defaults(func=seed)
+
+    run_parser = commands.add_parser('run', help='опрос дашборда и отчет')
+    run_parser.add_argument('--dir', help='папка заполненных баз, без --url веб-сервер запускается на них')
+    run_parser.add_argument('--url', help='адрес уже запущенного веб-сервера')
+    run_parser.add_argument('--threads', type=int, default=15, help='потоков waitress (как в main.py)')
+    run_parser.add_argument('--clients', type=int, default=20, help='количество вкладок дашборда')
+    run_parser.add_argument('--interval', type=float, default=10, help='период опроса вкладки, секунды '
+                                                                      '(0 - без пауз, максимальная нагрузка)')
+    run_parser.add_argument('--search', type=float, default=0.2, help='вероятность /getresult за период опроса')
+    run_parser.add_argument('--duration', type=float, default=60, help='длительность, секунды')
+    run_parser.add_argument('--no-etag', action='store_true', help='не отправлять If-None-Match')
+    run_parser.add_argument('--seed', type=int, default=1, help='начальное значение генератора')
+    run_parser.add_argument('--save', help='сохранить отчет в json')
+    run_parser.add_argument('--baseline', help='сравнить с отчетом, сохраненным через --save')
+    run_parser.set_defaults(func=run)
+
+    args = parser.parse_args()
+    if args.command=='run' and not (args.dir or args.url):
+        parser.error('нужен --dir или --url')
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Сравнение расчета истории подач (/gethistory): разбор строк в python и GROUP BY в SQLite
+
+Архив заполняется синтетическими подачами за месяц, затем для периодов Daily/Weekly/Monthly
+сравниваются время и результат двух способов подсчета.
+
+Запуск (база создается во временной папке):
+    python benchmarks/history_bucketing.py --rows 300000 --users 10
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from itertools import chain
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_PATH))
+
+#период: (формат strftime SQLite, интервал из строки SQLite, интервал из datetime)
+PERIODS = {
+    'Daily': ('%H', int, lambda date: date.hour),
+    'Weekly': ('%w', lambda bucket: int(bucket) or 7, lambda date: date.isoweekday()),
+    'Monthly': ('%d', int, lambda date: date.day),
+}
+
+
+def _fill_archive(rows:int, users:int) -> None:
+    """Синтетические подачи в архиве: случайные сотрудник, конечный статус и время обновления за 31 день"""
+    from sqlalchemy import insert
+
+    from database import CourtActionsArchive
+    from database.database import engine_archive
+    from models import db_models
+
+    statuses = [db_models.Status.COMPLETED] * 8 + [db_models.Status.ERROR, db_models.Status.ERROR_RMC]
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    data = [{'court_action_id': f'CA-{idx}', 'lawsuit_id': idx, 'owner': f'user_{idx % users}',
+             'rmc_register_num': str(idx // 1000), 'status': random.choice(statuses),
+             'created_on': now, 'updated_on': now - datetime.timedelta(seconds=random.randrange(31 * 86400))}
+            for idx in range(rows)]
+    with engine_archive.begin() as conn:
+        conn.execute(insert(CourtActionsArchive.__table__), data)
+
+
+def _python_buckets(start_date:datetime.datetime, period:str, utc_offset:int) -> dict:
+    """Прежний способ: потоковое чтение (owner, status, updated_on) и разбор по интервалам в python"""
+    from database import CourtActions, CourtActionsArchive
+
+    interval_of = PERIODS[period][2]
+    offset = datetime.timedelta(hours=utc_offset)
+    counters = defaultdict(int)
+    columns = ('owner', 'status', 'updated_on')
+    for act in chain(CourtActions.iter_actions_updated_after(start_date, columns=columns),
+                     CourtActionsArchive.iter_actions_updated_after(start_date, columns=columns)):
+        counters[(act['owner'], act['status'], interval_of(act['updated_on'] + offset))] += 1
+    return dict(counters)
+
+
+def _sql_buckets(start_date:datetime.datetime, period:str, utc_offset:int) -> dict:
+    """GROUP BY (owner, status, интервал) в базе"""
+    from database import CourtActions, CourtActionsArchive
+
+    bucket_format, interval_of, _ = PERIODS[period]
+    counters = defaultdict(int)
+    for owner, status, bucket, count in chain(
+            CourtActions.count_updated_after(start_date, bucket_format, utc_offset),
+            CourtActionsArchive.count_updated_after(start_date, bucket_format, utc_offset)):
+        counters[(owner, status, interval_of(bucket))] += count
+    return dict(counters)
+
+
+def _measure(name:str, func, repeat:int) -> dict:
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<30} {best:8.3f} с  ({sum(result.values())} строк, {len(result)} групп)")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Расчет истории подач по архиву за месяц')
+    parser.add_argument('--rows', type=int, default=300_000, help='количество подач в архиве')
+    parser.add_argument('--users', type=int, default=10, help='количество сотрудников')
+    parser.add_argument('--repeat', type=int, default=3, help='количество повторов (берется лучший)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ['DATABASE_DIRECTORY'] = tmp_dir
+        from config import LOCAL_UTC_OFFSET_HOURS
+        from database.migrations import migrate_all
+
+        migrate_all()
+        _fill_archive(args.rows, args.users)
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        start_date = now - datetime.timedelta(days=31)
+        for period in PERIODS:
+            print(period)
+            expected = _measure('  python (iter_actions)',
+                                lambda: _python_buckets(start_date, period, LOCAL_UTC_OFFSET_HOURS), args.repeat)
+            actual = _measure('  SQL GROUP BY',
+                              lambda: _sql_buckets(start_date, period, LOCAL_UTC_OFFSET_HOURS), args.repeat)
+            print(f"  результаты совпадают: {expected==actual}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Сравнение отображения строк court_actions: ORM + _row_to_dict (прежний путь) и RowMapper
+
+Запуск (база создается во временной папке):
+    python benchmarks/row_mapping.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import sqlalchemy
+
+PROJECT_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_PATH))
+
+
+def _legacy_row_to_dict(cls, row) -> dict:
+    """Прежняя реализация Base._row_to_dict: обход cls.__dict__ для каждой строки"""
+    return_dict = {}
+    for key, val in cls.__dict__.items():
+        if isinstance(val, sqlalchemy.orm.attributes.InstrumentedAttribute):
+            return_dict[key.rstrip("_")] = getattr(row, key)
+    return return_dict
+
+
+def _measure(name:str, func, repeat:int) -> None:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<45} {best:8.3f} с  ({len(result)} строк)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Отображение строк court_actions в dict/ClientData')
+    parser.add_argument('--rows', type=int, default=100_000, help='количество строк')
+    parser.add_argument('--repeat', type=int, default=3, help='количество повторов (берется лучший)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ['DATABASE_DIRECTORY'] = tmp_dir
+        from sqlalchemy import and_
+        from sqlalchemy.orm import Session
+
+        from database import CourtActions
+        from database.database import engine_read
+        from database.migrations import migrate_all
+        from models import ClientData, db_models
+
+        migrate_all()
+        CourtActions.append_bulk(
+            rmc_register_num='1', owner='bench', project='bench', activity_type=db_models.ActivityType.NORMAL,
+            data_list=[{'lawsuit_id': idx, 'register_id': 1, 'court_name': 'Судебный участок № 1',
+                        'region_name': 'Кемеровская область', 'client_last_name': 'Иванов',
+                        'client_first_name': 'Иван', 'client_father_name': 'Иванович',
+                        'client_reg_address': 'г. Кемерово, ул. Ленина, д. 1',
+                        'status': db_models.Status.DOCS_FORMED} for idx in range(args.rows)],
+        )
+        filt = and_(CourtActions.status==db_models.Status.DOCS_FORMED, CourtActions.owner=='bench')
+
+        def legacy_dicts():
+            with Session(autoflush=False, bind=engine_read) as db:
+                return [_legacy_row_to_dict(CourtActions, row) for row in db.query(CourtActions).filter(filt).all()]
+
+        def legacy_clients():
+            return [ClientData.from_dict(data) for data in legacy_dicts()]
+
+        def orm_cached_dicts():
+            with Session(autoflush=False, bind=engine_read) as db:
+                return [CourtActions._row_to_dict(row) for row in db.query(CourtActions).filter(filt).all()]
+
+        def mapper_dicts():
+            return CourtActions.get_actions(owner='bench', status=db_models.Status.DOCS_FORMED)
+
+        def mapper_clients():
+            return CourtActions.get_clients(owner='bench', status=db_models.Status.DOCS_FORMED)
+
+        _measure('ORM + _row_to_dict (прежний)', legacy_dicts, args.repeat)
+        _measure('ORM + _row_to_dict + ClientData.from_dict', legacy_clients, args.repeat)
+        _measure('ORM + _row_to_dict (кэш атрибутов)', orm_cached_dicts, args.repeat)
+        _measure('RowMapper -> dict (get_actions)', mapper_dicts, args.repeat)
+        _measure('RowMapper -> ClientData (get_clients)', mapper_clients, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Нагрузочная проверка конкурентного доступа к CourtActions.db
+
+Имитирует N процессов core/dispatcher.py, которые меняют статусы своих подач,
+и веб-интерфейс, который опрашивает базу (get_progress, get_action, get_actions_updated_after).
+Объем чтения у читателя постоянный, чтобы время отклика не зависело от скорости писателей.
+
+Запуск (база создается во временной папке):
+    python benchmarks/sqlite_concurrency.py --writers 8 --duration 20
+    python benchmarks/sqlite_concurrency.py --writers 8 --duration 20 --legacy   # настройки SQLite по умолчанию
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_PATH))
+
+ROWS_PER_WRITER = 200
+
+
+def _init_database(legacy:bool) -> None:
+    """Подменяет движки модуля database.database на движки с настройками по умолчанию (режим --legacy)"""
+    if not legacy:
+        return
+    from sqlalchemy import create_engine
+
+    import database.database as db_module
+    from database.engine import ARCHIVE_DB_PATH, COURT_ACTIONS_DB_PATH
+
+    db_module.engine = db_module.engine_read = create_engine(fr"sqlite:///{COURT_ACTIONS_DB_PATH}")
+    db_module.engine_archive = db_module.engine_archive_read = create_engine(fr"sqlite:///{ARCHIVE_DB_PATH}")
+
+
+def _writer(idx:int, legacy:bool, duration:float, result:multiprocessing.Queue) -> None:
+    """Процесс-писатель: меняет статусы своих подач по одной и пачками"""
+    _init_database(legacy)
+    from sqlalchemy.exc import OperationalError
+
+    from database import CourtActions
+    from models import db_models
+
+    lawsuit_ids = [idx * ROWS_PER_WRITER + i for i in range(ROWS_PER_WRITER)]
+    statuses = [db_models.Status.PROCESSING, db_models.Status.DOCS_FORMED, db_models.Status.DOCS_SIGNED]
+    ok, locked, latencies = 0, 0, []
+    stop_at = time.perf_counter() + duration
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        try:
+            if random.random() < 0.2:
+                CourtActions.change_status_many(status=random.choice(statuses),
+                                                lawsuit_ids=random.sample(lawsuit_ids, 20))
+            else:
+                CourtActions.change_status(status=random.choice(statuses), lawsuit_id=random.choice(lawsuit_ids))
+            ok += 1
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            locked += 1
+    result.put(('writer', ok, locked, latencies))
+
+
+def _reader(legacy:bool, duration:float, interval:float, result:multiprocessing.Queue) -> None:
+    """Процесс-читатель: опрос базы как у дашборда"""
+    _init_database(legacy)
+    from sqlalchemy.exc import OperationalError
+
+    from database import CourtActions
+
+    ok, locked, latencies = 0, 0, []
+    stop_at = time.perf_counter() + duration
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        try:
+            CourtActions.get_progress(owner='writer_0')
+            CourtActions.get_action(lawsuit_id=random.randrange(ROWS_PER_WRITER))
+            CourtActions.get_actions_updated_after(datetime.datetime.now() + datetime.timedelta(days=1))
+            ok += 1
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            locked += 1
+        time.sleep(interval)
+    result.put(('reader', ok, locked, latencies))
+
+
+def _prepare(writers:int) -> None:
+    """Создает схему и по ROWS_PER_WRITER подач на каждого писателя"""
+    from database import CourtActions
+    from database.migrations import migrate_all
+    from models import db_models
+
+    migrate_all()
+    for idx in range(writers):
+        CourtActions.append_bulk(
+            rmc_register_num=str(idx), owner=f'writer_{idx}', project='bench',
+            activity_type=db_models.ActivityType.NORMAL,
+            data_list=[{'lawsuit_id': idx * ROWS_PER_WRITER + i} for i in range(ROWS_PER_WRITER)],
+        )
+
+
+def _percentile(values:list[float], pct:float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def _report(name:str, stats:list[tuple]) -> None:
+    ok = sum(item[1] for item in stats)
+    locked = sum(item[2] for item in stats)
+    latencies = [val for item in stats for val in item[3]]
+    print(f"{name:>8}: операций {ok}, 'database is locked' {locked}, "
+          f"p50 {statistics.median(latencies) * 1000 if latencies else 0:.1f} мс, "
+          f"p95 {_percentile(latencies, 0.95) * 1000:.1f} мс, "
+          f"max {max(latencies, default=0) * 1000:.1f} мс")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Конкурентная запись/чтение CourtActions.db')
+    parser.add_argument('--writers', type=int, default=8, help='количество процессов-писателей')
+    parser.add_argument('--duration', type=float, default=20, help='длительность, секунды')
+    parser.add_argument('--interval', type=float, default=0.1, help='пауза между опросами читателя, секунды')
+    parser.add_argument('--legacy', action='store_true', help='движки с настройками SQLite по умолчанию')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ['DATABASE_DIRECTORY'] = tmp_dir
+        _init_database(args.legacy)
+        _prepare(args.writers)
+
+        result = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_writer, args=(idx, args.legacy, args.duration, result))
+                     for idx in range(args.writers)]
+        processes.append(multiprocessing.Process(target=_reader,
+                                                 args=(args.legacy, args.duration, args.interval, result)))
+        for process in processes:
+            process.start()
+        stats = [result.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        print(f"Режим: {'по умолчанию (rollback journal)' if args.legacy else 'WAL'}, "
+              f"писателей {args.writers}, {args.duration} с")
+        _report('writers', [item for item in stats if item[0]=='writer'])
+        _report('reader', [item for item in stats if item[0]=='reader'])
+
+
+if __name__ == "__main__":
+    main()
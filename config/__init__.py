@@ -1,9 +1,10 @@
 from .config import (PATH_TO_CRYPTCP, PATH_TO_JSON_THUMBPRINTS,
                      PATH_TO_PUBLIC_FOLDER, PATH_TO_RMC_CONFIG,
-                     PATH_TO_APPLICANTS_DETAILS, PATH_TO_SCREENSHOTS)
+                     PATH_TO_APPLICANTS_DETAILS, PATH_TO_SCREENSHOTS,
+                     LOCAL_UTC_OFFSET_HOURS, PATH_TO_PACING_CONFIG)
 
 __all__ = [
     "PATH_TO_PUBLIC_FOLDER", "PATH_TO_JSON_THUMBPRINTS",
     "PATH_TO_RMC_CONFIG", "PATH_TO_CRYPTCP", "PATH_TO_APPLICANTS_DETAILS",
-    "PATH_TO_SCREENSHOTS"
+    "PATH_TO_SCREENSHOTS", "LOCAL_UTC_OFFSET_HOURS", "PATH_TO_PACING_CONFIG"
     ]
@@ -12,9 +12,15 @@ PATH_TO_JSON_THUMBPRINTS = PATH_TO_CONFIG_DIR / "thumbprints" / "thumbprints.jso
 
 PATH_TO_RMC_CONFIG = PATH_TO_CONFIG_DIR / "rmc" / "config.toml"
 
+PATH_TO_PACING_CONFIG = PATH_TO_CONFIG_DIR / "browser" / "pacing.toml"
+
 PATH_TO_CRYPTCP = PATH_TO_CONFIG_DIR.parent / "auxiliary_programs" / "cryptcp.x64.exe"
 
 PATH_TO_SCREENSHOTS = PATH_TO_CONFIG_DIR.parent / "screenshots"
 
 # TODO: Путь до данных заявителей
 PATH_TO_APPLICANTS_DETAILS = Path(r"\\lime.local\dfs\Disk_S\Взаимодействие\ДСВ - ДАР\ГАСП\Данные_Заявителя\config.toml")
+
+# Смещение местного времени (Новосибирск) от UTC, часы: в базе время хранится в UTC,
+# интервалы истории подач (/gethistory) считаются по местному времени
+LOCAL_UTC_OFFSET_HOURS = 7
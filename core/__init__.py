@@ -1,5 +1,6 @@
 from .rmc.data_unloading_from_RMC import get_data_from_RMC
 from .browser.regular_serve import RegularServe
 from .dispatcher import process_manager
+from .orchestrator import Orchestrator
 
-__all__ = ["get_data_from_RMC", "RegularServe", "process_manager"]
+__all__ = ["get_data_from_RMC", "RegularServe", "process_manager", "Orchestrator"]
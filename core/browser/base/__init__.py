@@ -9,11 +9,14 @@ from .error_handler import (
     handle_critical_error,
     handle_browser_error
 )
+from .waits import WaitCondition, WaitEngine
 
 __all__ = [
     'BasePage',
     'BaseBrowserError',
     'CriticalBrowserError', 
     'handle_critical_error',
-    'handle_browser_error'
+    'handle_browser_error',
+    'WaitCondition',
+    'WaitEngine'
 ]
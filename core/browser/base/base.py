@@ -2,6 +2,8 @@ from pathlib import Path
 
 from playwright.sync_api import Page, sync_playwright
 
+from .pacing import pacer
+
 
 PATH_TO_DIR = Path(__file__).parent.parent.resolve()
 # TODO: Инструкция по добавлению плагина -> (вставить описание из конфлюенса)
@@ -33,7 +35,7 @@ class BaseBrowser:
                 f"--load-extension={PATH_TO_GOSPLAGIN_EXTENSION}",
                 "--start-maximized",
             ],
-            slow_mo=2000
+            slow_mo=pacer.slow_mo()
         )
 
         self.page = self.browser.pages[0] if self.browser.pages else self.browser.new_page()
@@ -82,3 +84,12 @@ class BasePage:
         """Инициализация параметров"""
 
         self.page = page
+
+    def pace(self, url: str | None = None) -> None:
+        """Ожидание очереди перед действием, которое отправляет запрос на сервер.
+
+        Args:
+            url (str | None, optional): Открываемый адрес. По умолчанию адрес текущей страницы.
+        """
+
+        pacer.wait(url or self.page.url)
@@ -0,0 +1,147 @@
+"""
+Ограничение темпа запросов браузера к порталам (token bucket по хосту) вместо slow_mo
+"""
+
+import threading
+import time
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from config import PATH_TO_PACING_CONFIG
+from database import metrics_store
+
+# Если файла настроек нет или он с ошибкой
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 3
+
+# Как часто проверять изменение файла настроек, секунды
+CONFIG_CHECK_INTERVAL = 5
+
+
+@dataclass(frozen=True, slots=True)
+class PaceLimit:
+    """Темп действий для хоста."""
+    rate: float             # действий в секунду в среднем
+    burst: int              # действий подряд без паузы
+
+
+class TokenBucket:
+    """Token bucket: токены пополняются со скоростью rate, в запасе не больше burst."""
+
+    def __init__(self, limit: PaceLimit) -> None:
+        """Инициализация параметров.
+
+        Args:
+            limit (PaceLimit): Темп действий.
+        """
+
+        self.limit = limit
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Резервирует токен.
+
+        Returns:
+            float: Сколько секунд ждать до использования токена (0 - сразу).
+        """
+
+        if self.limit.rate <= 0:
+            # rate = 0 в настройках - без ограничения
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.limit.burst, self._tokens + (now - self._updated) * self.limit.rate)
+            self._updated = now
+            # Токен может уйти в минус: следующие действия ждут по очереди
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.limit.rate
+
+
+class HostPacer:
+    """Темп действий по хостам, настройки из toml файла."""
+
+    def __init__(self, path: str | Path = PATH_TO_PACING_CONFIG) -> None:
+        """Инициализация параметров.
+
+        Args:
+            path (str | Path, optional): Путь до файла настроек. По умолчанию PATH_TO_PACING_CONFIG.
+        """
+
+        self.path = Path(path)
+        self._buckets: dict[str, TokenBucket] = {}
+        self._config: dict = {}
+        self._mtime: int | None = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _reload(self) -> None:
+        """Перечитывает файл настроек, если он изменился."""
+
+        now = time.monotonic()
+        if now - self._checked < CONFIG_CHECK_INTERVAL and self._mtime is not None:
+            return
+        self._checked = now
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            mtime = 0
+        if mtime == self._mtime:
+            return
+        try:
+            with self.path.open("rb") as file:
+                self._config = tomllib.load(file)
+        except (OSError, tomllib.TOMLDecodeError):
+            self._config = {}
+        self._mtime = mtime
+        # Новые настройки применяются к следующему действию
+        self._buckets.clear()
+
+    def _limit(self, host: str) -> PaceLimit:
+        section = self._config.get("hosts", {}).get(host) or self._config.get("default", {})
+        return PaceLimit(
+            rate=float(section.get("rate", DEFAULT_RATE)),
+            burst=max(1, int(section.get("burst", DEFAULT_BURST)))
+        )
+
+    def slow_mo(self) -> float:
+        """Пауза Playwright перед каждым действием из секции [browser], мс.
+
+        Returns:
+            float: slow_mo для запуска браузера.
+        """
+
+        with self._lock:
+            self._reload()
+            return float(self._config.get("browser", {}).get("slow_mo", 0))
+
+    def wait(self, url: str) -> float:
+        """Ожидание очереди на действие, отправляющее запрос на хост url.
+
+        Args:
+            url (str): Адрес текущей или открываемой страницы.
+
+        Returns:
+            float: Сколько секунд длилось ожидание.
+        """
+
+        host = urlsplit(url).hostname
+        if not host:
+            return 0.0
+        with self._lock:
+            self._reload()
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self._limit(host))
+        delay = bucket.reserve()
+        if delay > 0:
+            metrics_store.inc("gas_pacing_delay_seconds_total", delay, host=host)
+            time.sleep(delay)
+        return delay
+
+
+# Общий для всех браузеров процесса темп по хостам
+pacer = HostPacer()
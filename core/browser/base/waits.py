@@ -0,0 +1,324 @@
+"""
+Ожидание состояния страницы вместо фиксированных пауз sleep()
+"""
+
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Sequence
+
+from playwright._impl._errors import Error, TimeoutError
+from playwright.sync_api import Locator, Page, Request
+
+from database import metrics_store
+
+
+class WaitCondition:
+    """Условия ожидания."""
+    PAGE_READY = 'page_ready'           # страница загружена, запросы страницы завершены
+    NETWORK_IDLE = 'network_idle'       # XHR/fetch запросы страницы завершены
+    UPLOAD = 'upload'                   # запрос загрузки файла завершен
+    OPTIONS = 'options'                 # список <select> заполнен новыми вариантами
+    SIGNED = 'signed'                   # надпись 'Файл подписан УКЭП'
+    POPUP_OPENED = 'popup_opened'       # элемент popup окна появился
+    POPUP_CLOSED = 'popup_closed'       # кнопка popup окна скрыта (окно закрыто)
+
+
+# Таймауты условий по умолчанию, мс
+WAIT_TIMEOUTS = {
+    WaitCondition.PAGE_READY: 30_000,
+    WaitCondition.NETWORK_IDLE: 10_000,
+    WaitCondition.UPLOAD: 30_000,
+    WaitCondition.OPTIONS: 10_000,
+    WaitCondition.SIGNED: 30_000,
+    WaitCondition.POPUP_OPENED: 10_000,
+    WaitCondition.POPUP_CLOSED: 5_000,
+}
+
+# Сеть считается свободной, если запросов нет столько мс
+NETWORK_QUIET_MS = 300
+# Сколько ждать начала запроса загрузки после выбора файла, мс
+UPLOAD_START_MS = 2_000
+# Период проверки состояния сети, мс
+POLL_MS = 50
+
+# Типы запросов, которые ожидаются (страница ГАСП загружает файлы и списки через XHR)
+TRACKED_RESOURCE_TYPES = frozenset({"xhr", "fetch"})
+
+# Надпись после прикрепления подписи *.sig
+SIGNED_MARKER = '.form-group span:has-text("Файл подписан УКЭП")'
+
+# Варианты <select>, кроме пустого; сравниваются с вариантами до действия
+OPTIONS_CHANGED_JS = """([selector, previous]) => {
+    const options = [...document.querySelectorAll(selector + ' option:not([value=""])')];
+    const texts = options.map(option => option.textContent.trim());
+    return texts.length > 0 && (previous === null || texts.join('\\n') !== previous.join('\\n'));
+}"""
+
+
+class WaitEngine:
+    """Ожидание условий на странице с учётом фактического времени ожидания."""
+
+    def __init__(self, page: Page) -> None:
+        """Инициализация параметров.
+
+        Args:
+            page (Page): Объект страницы в браузере.
+        """
+
+        self.page = page
+        self._in_flight: set[Request] = set()
+        self._started = 0
+        self._last_activity = time.monotonic()
+        # Время и количество ожиданий по условиям с последнего reset()
+        self.totals: defaultdict[str, float] = defaultdict(float)
+        self.counts: defaultdict[str, int] = defaultdict(int)
+
+        page.on("request", self._request_started)
+        page.on("requestfinished", self._request_done)
+        page.on("requestfailed", self._request_done)
+
+    def _request_started(self, request: Request) -> None:
+        if request.resource_type in TRACKED_RESOURCE_TYPES:
+            self._in_flight.add(request)
+            self._started += 1
+            self._last_activity = time.monotonic()
+
+    def _request_done(self, request: Request) -> None:
+        if request in self._in_flight:
+            self._in_flight.discard(request)
+            self._last_activity = time.monotonic()
+
+    def _timeout(self, condition: str, timeout: float | None) -> float:
+        return WAIT_TIMEOUTS[condition] if timeout is None else timeout
+
+    def _wait(self, condition: str, check: Callable[[], None], required: bool) -> bool:
+        """Ожидание условия с записью его длительности.
+
+        Args:
+            condition (str): Условие из WaitCondition.
+            check (Callable[[], None]): Ожидание, при таймауте бросает TimeoutError.
+            required (bool): Пробросить TimeoutError, если условие не выполнено.
+
+        Returns:
+            bool: True, если условие выполнено, False - истёк таймаут.
+        """
+
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            check()
+            outcome = "ok"
+            return True
+        except TimeoutError:
+            outcome = "timeout"
+            if required:
+                raise
+            return False
+        finally:
+            elapsed = time.perf_counter() - started
+            self.totals[condition] += elapsed
+            self.counts[condition] += 1
+            metrics_store.observe("gas_wait_duration_seconds", elapsed, condition=condition, outcome=outcome)
+
+    def _until_network_idle(self, timeout: float, started_before: int | None = None) -> None:
+        """Ожидание завершения запросов страницы.
+
+        Args:
+            timeout (float): Таймаут, мс.
+            started_before (int | None, optional): Счётчик запросов до действия: сначала ждать
+                начала нового запроса (не дольше UPLOAD_START_MS). По умолчанию не ждать.
+
+        Raises:
+            TimeoutError: Запросы не завершились за timeout.
+        """
+
+        deadline = time.monotonic() + timeout / 1000
+        start_deadline = time.monotonic() + UPLOAD_START_MS / 1000
+        while True:
+            # Ожидание средствами Playwright: в это время обрабатываются события запросов
+            self.page.wait_for_timeout(POLL_MS)
+            now = time.monotonic()
+            waiting_start = started_before is not None and self._started == started_before and now < start_deadline
+            if not waiting_start and not self._in_flight and (now - self._last_activity) * 1000 >= NETWORK_QUIET_MS:
+                return
+            if now >= deadline:
+                raise TimeoutError(f"Запросы страницы не завершились за {timeout} мс")
+
+    def page_ready(self, timeout: float | None = None, required: bool = False) -> bool:
+        """Ожидание загрузки страницы и завершения её запросов.
+
+        Args:
+            timeout (float | None, optional): Таймаут, мс. По умолчанию из WAIT_TIMEOUTS.
+            required (bool, optional): Пробросить TimeoutError. По умолчанию False.
+
+        Returns:
+            bool: Условие выполнено.
+        """
+
+        timeout = self._timeout(WaitCondition.PAGE_READY, timeout)
+
+        def check():
+            self.page.wait_for_load_state("load", timeout=timeout)
+            self._until_network_idle(timeout)
+
+        return self._wait(WaitCondition.PAGE_READY, check, required)
+
+    def network_idle(self, timeout: float | None = None, required: bool = False) -> bool:
+        """Ожидание завершения XHR/fetch запросов страницы.
+
+        Args:
+            timeout (float | None, optional): Таймаут, мс. По умолчанию из WAIT_TIMEOUTS.
+            required (bool, optional): Пробросить TimeoutError. По умолчанию False.
+
+        Returns:
+            bool: Условие выполнено.
+        """
+
+        timeout = self._timeout(WaitCondition.NETWORK_IDLE, timeout)
+        return self._wait(WaitCondition.NETWORK_IDLE, lambda: self._until_network_idle(timeout), required)
+
+    def upload(
+            self,
+            file_input: Locator,
+            files: str | Path | Sequence[str | Path],
+            timeout: float = 30_000,
+            upload_timeout: float | None = None,
+            required: bool = False
+            ) -> bool:
+        """Выбор файла в поле загрузки и ожидание завершения запроса загрузки.
+
+        Ошибки выбора файла (поле не найдено) пробрасываются, как у Locator.set_input_files.
+
+        Args:
+            file_input (Locator): Поле загрузки файла.
+            files (str | Path | Sequence[str | Path]): Файл или файлы.
+            timeout (float, optional): Таймаут поиска поля, мс. По умолчанию 30_000.
+            upload_timeout (float | None, optional): Таймаут загрузки, мс. По умолчанию из WAIT_TIMEOUTS.
+            required (bool, optional): Пробросить TimeoutError загрузки. По умолчанию False.
+
+        Returns:
+            bool: Загрузка завершена.
+        """
+
+        upload_timeout = self._timeout(WaitCondition.UPLOAD, upload_timeout)
+        started_before = self._started
+        file_input.set_input_files(files, timeout=timeout)
+        return self._wait(
+            WaitCondition.UPLOAD,
+            lambda: self._until_network_idle(upload_timeout, started_before=started_before),
+            required
+        )
+
+    def option_texts(self, select: Locator) -> list[str]:
+        """Текущие варианты списка без пустого.
+
+        Args:
+            select (Locator): Список <select>.
+
+        Returns:
+            list[str]: Тексты вариантов.
+        """
+
+        try:
+            return select.locator('option:not([value=""])').all_text_contents()
+        except Error:
+            return []
+
+    def options(
+            self,
+            selector: str,
+            previous: list[str] | None = None,
+            timeout: float | None = None,
+            required: bool = False
+            ) -> bool:
+        """Ожидание заполнения списка <select> вариантами.
+
+        Args:
+            selector (str): CSS селектор списка, например, '#currentCourt'.
+            previous (list[str] | None, optional): Варианты до действия: ждать, пока список изменится.
+                По умолчанию достаточно непустого списка.
+            timeout (float | None, optional): Таймаут, мс. По умолчанию из WAIT_TIMEOUTS.
+            required (bool, optional): Пробросить TimeoutError. По умолчанию False.
+
+        Returns:
+            bool: Условие выполнено.
+        """
+
+        timeout = self._timeout(WaitCondition.OPTIONS, timeout)
+        previous = [text.strip() for text in previous] if previous is not None else None
+        return self._wait(
+            WaitCondition.OPTIONS,
+            lambda: self.page.wait_for_function(OPTIONS_CHANGED_JS, arg=[selector, previous], timeout=timeout),
+            required
+        )
+
+    def signed(self, timeout: float | None = None, required: bool = False) -> bool:
+        """Ожидание надписи 'Файл подписан УКЭП' после прикрепления подписи.
+
+        Args:
+            timeout (float | None, optional): Таймаут, мс. По умолчанию из WAIT_TIMEOUTS.
+            required (bool, optional): Пробросить TimeoutError. По умолчанию False.
+
+        Returns:
+            bool: Условие выполнено.
+        """
+
+        timeout = self._timeout(WaitCondition.SIGNED, timeout)
+        marker = self.page.locator(SIGNED_MARKER).first
+        return self._wait(WaitCondition.SIGNED, lambda: marker.wait_for(state="visible", timeout=timeout), required)
+
+    def popup_opened(
+            self,
+            element: Locator,
+            state: str = "visible",
+            timeout: float | None = None,
+            required: bool = False
+            ) -> bool:
+        """Ожидание элемента popup окна.
+
+        Args:
+            element (Locator): Элемент окна, например, кнопка или поле загрузки файла.
+            state (str, optional): Состояние элемента ('visible', 'attached'). По умолчанию 'visible'.
+            timeout (float | None, optional): Таймаут, мс. По умолчанию из WAIT_TIMEOUTS.
+            required (bool, optional): Пробросить TimeoutError. По умолчанию False.
+
+        Returns:
+            bool: Условие выполнено.
+        """
+
+        timeout = self._timeout(WaitCondition.POPUP_OPENED, timeout)
+        return self._wait(WaitCondition.POPUP_OPENED, lambda: element.wait_for(state=state, timeout=timeout), required)
+
+    def popup_closed(self, button: Locator, timeout: float | None = None, required: bool = False) -> bool:
+        """Ожидание закрытия popup окна: нажатая кнопка окна скрыта.
+
+        Args:
+            button (Locator): Кнопка окна, например, 'Сохранить' или 'Отменить'.
+            timeout (float | None, optional): Таймаут, мс. По умолчанию из WAIT_TIMEOUTS.
+            required (bool, optional): Пробросить TimeoutError. По умолчанию False.
+
+        Returns:
+            bool: Условие выполнено.
+        """
+
+        timeout = self._timeout(WaitCondition.POPUP_CLOSED, timeout)
+        return self._wait(WaitCondition.POPUP_CLOSED, lambda: button.wait_for(state="hidden", timeout=timeout), required)
+
+    def reset(self) -> None:
+        """Обнуление времени ожиданий (например, перед новым клиентом)."""
+
+        self.totals.clear()
+        self.counts.clear()
+
+    def summary(self) -> str:
+        """Время ожиданий по условиям с последнего reset().
+
+        Returns:
+            str: Например, 'upload: 4.1 с (6), signed: 1.3 с (3)'.
+        """
+
+        return ", ".join(
+            f"{condition}: {seconds:.1f} с ({self.counts[condition]})"
+            for condition, seconds in sorted(self.totals.items(), key=lambda item: -item[1])
+        )
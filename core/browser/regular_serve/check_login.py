@@ -1,15 +1,22 @@
+import threading
 from time import sleep
 
 from playwright._impl._errors import TimeoutError, Error
 from playwright.sync_api import Page
 from pywinauto import Desktop, timings
 
+from database import metrics_store
 from utils._logger import CustomLogger
 
 from ..base import BaseBrowserError, BasePage, handle_critical_error, handle_browser_error
 from ..config_words import WORDS
 
 
+# Окна ГосПлагина и КриптоПро общие для рабочего стола: при нескольких сотрудниках в одном процессе
+# (core/orchestrator.py) выбор сертификата и ввод пароля выполняются по очереди
+DESKTOP_DIALOG_LOCK = threading.Lock()
+
+
 class CheckLogin(BasePage):
     """Проверка авторизации пользователя"""
 
@@ -41,6 +48,7 @@ class CheckLogin(BasePage):
 
         try:
             # Проверка: Результат либо ФИО пользователя на сайте, либо ошибка (ошибка = вход)
+            self.pace()
             self.page.reload()
             self.page.locator("#profile-link a").first.inner_text(timeout=2_000).split()[0].lower().title()
             self.logger.info(f"Пользователь \"{self.user_name.title()}\" уже авторизован на сайте!")
@@ -67,6 +75,7 @@ class CheckLogin(BasePage):
 
         try:
             login_button = self.page.get_by_role("link", name=WORDS["Кнопка 'Вход' на главной странице"])
+            self.pace()
             login_button.first.click(timeout=2_000)
             sleep(1)
             self.logger.info("Успешно нажал на кнопку!")
@@ -112,6 +121,7 @@ class CheckLogin(BasePage):
 
         try:
             login_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Войти' на странице 'Авторизация пользователя'"])
+            self.pace()
             login_button.first.click(timeout=2_000)
             self.logger.info("Успешно нажал на кнопку!")
 
@@ -132,6 +142,7 @@ class CheckLogin(BasePage):
 
         try:
             electronic_signature_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Эл. подпись' на главной странице 'ГосУслуг'"])
+            self.pace()
             electronic_signature_button.first.click(timeout=5_000)
             return True
 
@@ -152,6 +163,7 @@ class CheckLogin(BasePage):
 
         try:
             continue_button = self.page.get_by_role("button", name=WORDS["Кнопка Продолжить на странице 'ГосУслуг'"])
+            self.pace()
             continue_button.first.click(timeout=5_000)
 
         except (TimeoutError, Error):
@@ -197,6 +209,7 @@ class CheckLogin(BasePage):
             )
 
         cards.nth(idx).scroll_into_view_if_needed()
+        self.pace()
         cards.nth(idx).click(timeout=5_000)
 
     def _desktop_gosplugin(self):
@@ -227,6 +240,7 @@ class CheckLogin(BasePage):
                 user_name=self.user_name
             )
 
+    @metrics_store.timed("gas_login_duration_seconds")
     def start_check(self) -> bool:
         """Порядок запуска методов.
         
@@ -249,6 +263,7 @@ class CheckLogin(BasePage):
             
             try:
                 try:
+                    self.pace("https://ej.sudrf.ru/")
                     self.page.goto("https://ej.sudrf.ru/")
                 except (TimeoutError, Error):
                     raise BaseBrowserError
@@ -261,8 +276,9 @@ class CheckLogin(BasePage):
                 self._click_login_button_on_authorization_page()
                 self._click_button_electronic_signature()
                 self._click_button_continue()
-                self._certificate_selection()
-                self._desktop_gosplugin()
+                with DESKTOP_DIALOG_LOCK:
+                    self._certificate_selection()
+                    self._desktop_gosplugin()
 
                 if self._user_is_authorized_or_not_authorized():
                     return True
@@ -37,6 +37,7 @@ class CleaningDrafts(BasePage):
 
         try:
             go_to_section_button = self.page.get_by_role("link", name=WORDS["Кнопка 'Перейти в раздел' на главной странице ГАСП"])
+            self.pace()
             go_to_section_button.first.click(timeout=10_000)
             self.logger.info("Успешно нажал на кнопку!")
 
@@ -69,6 +70,7 @@ class CleaningDrafts(BasePage):
 
             # Нажимает "Найти"
             find_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Найти' на странице 'Обращения'"])
+            self.pace()
             find_button.first.click()
             self.logger.info("Успешно нажал на кнопку!")
 
@@ -86,6 +88,7 @@ class CleaningDrafts(BasePage):
         self.logger.info(f"Нажимаю на кнопку {WORDS["Кнопка 'Удалить' на странице 'Обращения'"]!r} на странице с 'Обращениями'")
         try:
             del_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Удалить' на странице 'Обращения'"])
+            self.pace()
             del_button.first.click(timeout=30_000)
             del_button.last.click(timeout=10_000)
             self.logger.info("Успешно нажал на кнопку!")
@@ -98,6 +101,7 @@ class CleaningDrafts(BasePage):
         self.logger.info("Нажимаю на логотип")
         try:
             logo = self.page.locator("a.nav-logo").first
+            self.pace()
             logo.click()
             self.logger.info("Успешно нажал на логотип!")
         except (TimeoutError, Error):
@@ -141,6 +145,7 @@ class CleaningDrafts(BasePage):
 
                     # Переходим на главную страницу
                     try:
+                        self.pace("https://ej.sudrf.ru/")
                         self.page.goto("https://ej.sudrf.ru/")
                     except (TimeoutError, Error):
                         raise BaseBrowserError
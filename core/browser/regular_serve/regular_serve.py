@@ -1,25 +1,64 @@
 import shutil
 import time
+from functools import wraps
 from pathlib import Path
-from time import sleep
 
 from playwright._impl._errors import Error, TimeoutError
 from playwright.sync_api import Page
 
 from config import PATH_TO_APPLICANTS_DETAILS
-from database import CourtActions
+from database import CourtActions, metrics_store
+from database.court_directory import CourtMapping, GasOption, court_directory
+from database.spans import SpanKind, SpanRecorder
 from models.client.simple_clients import ClientData
 from models.database import db_models
 from utils import get_data_from_toml, is_similar
 from utils._logger import CustomLogger
 
-from ..base import BaseBrowserError, BasePage
+from ..base import BaseBrowserError, BasePage, WaitEngine
 from ..base.error_handler import handle_browser_error
 from ..config_words import WORDS
 from .cleaning_drafts import CleaningDrafts
 
 APPS_DIR = "Приложения"
 REGION_EXCEPTIONS = ["кемеровская"]
+# Минимальная схожесть наименования суда клиента и суда ГАСП
+COURT_SIMILARITY = 0.7
+
+# Шаги подачи по порядку (методы RegularServe)
+SUBMISSION_STEPS = (
+    "_click_submit_appeal",
+    "_click_representative_button",                 # Представитель + индекс и адрес
+    "_click_document_confirming_authority_button",  # Доверенность
+    "_click_applicants_details",                    # Данные заявителя
+    "_click_participants_details",                  # Данные участника
+    "_court_selection",                             # Выбор суда
+    "_essence_of_appeal",                           # Суть обращения
+    "_appendices_to_appeal",                        # Приложения
+    "_state_duty_receipt",                          # ГосПошлина
+    "_create_an_appeal",                            # Отправка
+)
+
+# Заголовок формы обращения: пока он на странице после перезагрузки, черновик с пройденными шагами не потерян
+DRAFT_FORM_MARKER = 'h2:has-text("Суть обращения")'
+
+
+def _timed_step(name: str):
+    """Шаг подачи: длительность в метрике 'gas_step_duration_seconds' и спан шага клиента.
+
+    Args:
+        name (str): Название шага (метода) подачи.
+    """
+
+    def decorator(func):
+        timed = metrics_store.timed("gas_step_duration_seconds", step=name)(func)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.spans.step(name):
+                return timed(self, *args, **kwargs)
+        return wrapper
+    return decorator
 
 
 class RegularServe(BasePage):
@@ -49,6 +88,14 @@ class RegularServe(BasePage):
 
         self.logger = logger
         self.logger_path = logger_path
+        # Ожидания состояния страницы вместо фиксированных пауз
+        self.waits = WaitEngine(page)
+        # Спаны шагов, попыток и перезагрузок по клиентам
+        self.spans = SpanRecorder(user_name)
+
+        # Контрольные точки клиента: пройденные шаги и прикреплённые приложения
+        self._completed_steps: list[str] = []
+        self._attached_appendices: set[str] = set()
 
         self.data_applicant: dict = get_data_from_toml(
             path_to_toml_file=PATH_TO_APPLICANTS_DETAILS,
@@ -56,13 +103,46 @@ class RegularServe(BasePage):
             logger_path=self.logger_path
             )[self.path_to_packages_dir.parent.name]
 
-    def _get_clients(self) -> dict[list]:
+    def _count_attempt(self, step: str, attempt: int) -> None:
+        """Начало попытки шага: спан попытки и учёт повторной попытки в метрике 'gas_step_retries_total'.
+
+        Args:
+            step (str): Название шага (метода) подачи.
+            attempt (int): Номер попытки, начиная с 1.
+        """
+        self.spans.attempt(attempt)
+        if attempt > 1:
+            metrics_store.inc("gas_step_retries_total", step=step)
+
+    def _reload(self, **kwargs) -> None:
+        """Перезагрузка страницы с ограничением темпа и спаном.
+
+        Args:
+            **kwargs: Параметры Page.reload, например, timeout.
+        """
+        self.pace()
+        with self.spans.action(SpanKind.RELOAD):
+            self.page.reload(**kwargs)
+
+    def _goto(self, url: str, **kwargs) -> None:
+        """Переход по адресу с ограничением темпа и спаном.
+
+        Args:
+            url (str): Адрес.
+            **kwargs: Параметры Page.goto, например, timeout.
+        """
+        self.pace(url)
+        with self.spans.action(SpanKind.GOTO):
+            self.page.goto(url, **kwargs)
+
+    def _get_clients(self) -> list[ClientData]:
         """Получение данных о клиенте."""
-        return CourtActions().get_actions(
+        return CourtActions.get_clients(
             owner=self.user_name,
             status=db_models.Status.DOCS_FORMED
         )
 
+    @_timed_step("_click_submit_appeal")
     def _click_submit_appeal(self) -> None:
         """Процесс 'Подать обращение' на главной странице ГАСП"""
 
@@ -74,6 +154,7 @@ class RegularServe(BasePage):
             _attempt = 5
             while _attempt > _step:
                 _step += 1
+                self._count_attempt("_click_submit_appeal", _step)
 
                 if _step + 1 == _attempt:
                     handle_browser_error(
@@ -86,25 +167,28 @@ class RegularServe(BasePage):
                 try:
                     # Кнопка 'Подать обращение' в верху страницы
                     login_button = self.page.get_by_role("link", name=WORDS["Кнопка 'Подать обращение' на главной странице ГАСП"])
+                    self.pace()
                     login_button.first.click(timeout=10_000)
 
                     # Секция 'Гражданское судопроизводство' и кнопка 'Подать обращение'
                     section = self.page.locator("div.mainpage-service").filter(
                         has = self.page.get_by_role("heading", name="Гражданское судопроизводство")
                     )
+                    self.pace()
                     section.get_by_role(
                         "link", name=WORDS["Кнопка 'Подать обращение' на странице, где есть 'Гражданское судопроизводство'"]
                         ).click(timeout=10_000)
 
                     # Ссылка "Заявление о вынесении судебного приказа (дубликата)"
                     application_button = self.page.get_by_role("link", name=WORDS["Кнопка 'Заявление о вынесении судебного приказа (дубликата)' на странице, где есть 'Гражданское судопроизводство'"])
+                    self.pace()
                     application_button.first.click(timeout=10_000)
-                    sleep(2)
+                    self.waits.page_ready()
                     break
 
                 except (TimeoutError, Error):
                     try:
-                        self.page.goto("https://ej.sudrf.ru/", timeout=60_000)
+                        self._goto("https://ej.sudrf.ru/", timeout=60_000)
                     except (TimeoutError, Error):
                         raise BaseBrowserError
                     continue
@@ -112,6 +196,7 @@ class RegularServe(BasePage):
         _click_button()
         self.logger.info("Перешёл на создание обращения!")
 
+    @_timed_step("_click_representative_button")
     def _click_representative_button(self) -> None:
         """Нажимает на кнопку 'Кнопка 'Я являюсь представителем' на странице 'Заявление о вынесении судебного приказа (дубликата)'"""
 
@@ -123,6 +208,7 @@ class RegularServe(BasePage):
             _attempt = 5
             while _attempt > _step:
                 _step += 1
+                self._count_attempt("_click_representative_button", _step)
 
                 if _step + 1 == _attempt:
                     handle_browser_error(
@@ -135,6 +221,7 @@ class RegularServe(BasePage):
                 try:
                     # Кнопка 'Я являюсь представителем' на странице 'Заявление о вынесении судебного приказа (дубликата)'
                     representative_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Я являюсь представителем' на странице 'Заявление о вынесении судебного приказа (дубликата)'"])
+                    self.pace()
                     representative_button.click(timeout=10_000)
 
                     # Поле для ввода 'Индекса'
@@ -146,7 +233,7 @@ class RegularServe(BasePage):
 
                 except (TimeoutError, Error):
                     try:
-                        self.page.reload(timeout=60_000)
+                        self._reload(timeout=60_000)
                     except (TimeoutError, Error):
                         raise BaseBrowserError
                     continue
@@ -154,6 +241,7 @@ class RegularServe(BasePage):
         _input_data()
         self.logger.info("Успешно выбрал 'Я являюсь представителем' и ввёл данные (индекс, адрес)")
 
+    @_timed_step("_click_document_confirming_authority_button")
     def _click_document_confirming_authority_button(self) -> None:
         """Нажимает на кнопку 'Добавить файл', рядышком с 'Документ, подтверждающий полномочия' на странице 'Заявление о вынесении судебного приказа (дубликата)'"""
         self.logger.info("Прикрепляю доверенность...")
@@ -179,6 +267,7 @@ class RegularServe(BasePage):
             _attempt = 5
             while _attempt > _step:
                 _step += 1
+                self._count_attempt("_click_document_confirming_authority_button", _step)
 
                 if _step + 1 == _attempt:
                     handle_browser_error(
@@ -195,7 +284,7 @@ class RegularServe(BasePage):
 
                 except (TimeoutError, Error):
                     try:
-                        self.page.reload(timeout=60_000)
+                        self._reload(timeout=60_000)
                     except (TimeoutError, Error):
                         raise BaseBrowserError
                     continue
@@ -206,6 +295,7 @@ class RegularServe(BasePage):
                     __attempt = 10
                     while __attempt > __step:
                         __step += 1
+                        self._count_attempt("_click_document_confirming_authority_button", __step)
 
                         if __step + 1 == __attempt:
                             handle_browser_error(
@@ -217,10 +307,11 @@ class RegularServe(BasePage):
 
                         try:
                             # Загрузка файла (Доверенность)
-                            self.page.locator(WORDS["JS для загрузки файла"]).first.set_input_files(power_attorney_file, timeout=10_000)
-                            sleep(3)
+                            self.pace()
+                            self.waits.upload(self.page.locator(WORDS["JS для загрузки файла"]).first, power_attorney_file, timeout=10_000)
 
                             # Кнопка 'Добавить'
+                            self.pace()
                             self.page.get_by_role("button", name=WORDS["Кнопка 'Добавить' в popup окне"]).first.click(timeout=2_000)
 
                             # Надпись 'Необходимо прикрепить файл'
@@ -229,7 +320,7 @@ class RegularServe(BasePage):
                             # Кнопка 'Отменить'
                             cancel_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Отменить'в popup окне"])
                             cancel_button.first.click(timeout=10_000)
-                            sleep(2)
+                            self.waits.popup_closed(cancel_button.first)
 
                             # Кнопка для 'Документ, подтверждающий полномочия'
                             document_confirming_authority_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Добавить файл' рядышком с 'Документ, подтверждающий полномочия'"])
@@ -243,6 +334,7 @@ class RegularServe(BasePage):
         _file_upload()
         self.logger.info("Доверенность успешно загружена!")
 
+    @_timed_step("_click_applicants_details")
     def _click_applicants_details(self) -> None:
         """Процесс, связанный с кнопкой 'Данные заявителей'"""
 
@@ -254,6 +346,7 @@ class RegularServe(BasePage):
             _attempt = 5
             while _attempt > _step:
                 _step += 1
+                self._count_attempt("_click_applicants_details", _step)
 
                 if _step + 1 == _attempt:
                     handle_browser_error(
@@ -267,15 +360,15 @@ class RegularServe(BasePage):
                     # Кнопка 'Добавить заявителя'
                     applicants_details_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Данные заявителей'"])
                     applicants_details_button.first.click(timeout=2_000)
-                    sleep(2)
 
                     # Кнопка 'Юридическое лицо'
                     legal_entity_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Юридическое лицо'"])
+                    self.waits.popup_opened(legal_entity_button.first)
                     legal_entity_button.first.click(timeout=2_000)
 
                 except (TimeoutError, Error):
                     try:
-                        self.page.reload(timeout=60_000)
+                        self._reload(timeout=60_000)
                     except (TimeoutError, Error):
                         raise BaseBrowserError
                     continue
@@ -314,8 +407,10 @@ class RegularServe(BasePage):
                         self.page.locator('#Phone').last.fill(self.data_applicant.get("phone"), timeout=2_000)
 
                         # Кнопка 'Сохранить'
-                        self.page.get_by_role("button", name=WORDS["Кнопка 'Сохранить' в popup окне"]).first.click(timeout=2_000)
-                        sleep(2)
+                        save_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Сохранить' в popup окне"]).first
+                        self.pace()
+                        save_button.click(timeout=2_000)
+                        self.waits.popup_closed(save_button)
                         return True
                     
                     except (TimeoutError, Error):
@@ -325,14 +420,15 @@ class RegularServe(BasePage):
                     break
                 else:
                     try:
-                        self.page.reload(timeout=60_000)
+                        self._reload(timeout=60_000)
                     except (TimeoutError, Error):
                         raise BaseBrowserError
-                    sleep(2)
+                    self.waits.network_idle()
 
         _input_data()
         self.logger.info("Данные заявителя успешно введены!")
 
+    @_timed_step("_click_participants_details")
     def _click_participants_details(self) -> None:
         """Процесс, связанный с кнопкой 'Данные участников процесса'"""
 
@@ -344,6 +440,7 @@ class RegularServe(BasePage):
             _attempt = 5
             while _attempt > _step:
                 _step += 1
+                self._count_attempt("_click_participants_details", _step)
 
                 if _step + 1 == _attempt:
                     handle_browser_error(
@@ -362,7 +459,7 @@ class RegularServe(BasePage):
                     natural_person_button.first.click(timeout=10_000)
                 except (TimeoutError, Error):
                     try:
-                        self.page.reload(timeout=60_000)
+                        self._reload(timeout=60_000)
                     except (TimeoutError, Error):
                         raise BaseBrowserError
                     continue
@@ -468,8 +565,10 @@ class RegularServe(BasePage):
                             self.page.locator('#Phone').last.fill(self.client.client_phone, timeout=2_000)
 
                         # Сохранить
-                        self.page.get_by_role("button", name=WORDS["Кнопка 'Сохранить' в popup окне"]).first.click(timeout=2_000)
-                        sleep(2)
+                        save_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Сохранить' в popup окне"]).first
+                        self.pace()
+                        save_button.click(timeout=2_000)
+                        self.waits.popup_closed(save_button)
                         return True
                     
                     except (TimeoutError, Error):
@@ -479,14 +578,133 @@ class RegularServe(BasePage):
                     break
                 else:
                     try:
-                        self.page.reload(timeout=60_000)
+                        self._reload(timeout=60_000)
                     except (TimeoutError, Error):
                         raise BaseBrowserError
-                    sleep(2)
+                    self.waits.network_idle()
 
         _input_data()
         self.logger.info("Данные участника успешно введены!")
 
+    def _read_options(self, selector: str) -> list[GasOption]:
+        """Варианты списка без пустого одним запросом к странице.
+
+        Args:
+            selector (str): CSS селектор списка, например, '#currentCourt'.
+
+        Returns:
+            list[GasOption]: Значения и тексты вариантов.
+        """
+
+        options = self.page.locator(f'{selector} option:not([value=""])').evaluate_all(
+            "options => options.map(option => [option.value, option.textContent.trim()])"
+        )
+        return [GasOption(value=value, name=name) for value, name in options]
+
+    def _select_region(self, region_value: str) -> None:
+        """Выбор региона по значению и ожидание списка судов этого региона.
+
+        Args:
+            region_value (str): Значение региона ГАСП.
+        """
+
+        # Судебные органы до выбора региона: ждём, пока список заполнится для нового региона
+        previous_courts = self.waits.option_texts(self.page.locator("#currentCourt"))
+        self.pace()
+        self.page.locator("#currentRegion").select_option(value=region_value, timeout=2_000)
+        self.waits.options("#currentCourt", previous=previous_courts or None)
+
+    def _best_region(self, regions: list[GasOption]) -> tuple[GasOption | None, float]:
+        """Регион ГАСП, наиболее похожий на регион клиента.
+
+        Args:
+            regions (list[GasOption]): Регионы ГАСП.
+
+        Returns:
+            tuple[GasOption | None, float]: Регион и схожесть.
+        """
+
+        client_region = self.client.region_name
+        best_region, best_region_sim = None, 0.0
+
+        for region in regions:
+            # Проверяем исключения
+            for exception in REGION_EXCEPTIONS:
+                if exception in client_region.lower() and exception in region.name.lower():
+                    return region, 1.0  # нашли точное совпадение
+
+            # Обычное сравнение
+            _, sim = is_similar(client_region, region.name)
+            if sim > best_region_sim:
+                best_region = region
+                best_region_sim = sim
+
+        return best_region, best_region_sim
+
+    def _best_court(self, courts: list[GasOption]) -> tuple[GasOption | None, float]:
+        """Суд ГАСП, наиболее похожий на суд клиента.
+
+        Args:
+            courts (list[GasOption]): Суды региона ГАСП.
+
+        Returns:
+            tuple[GasOption | None, float]: Суд и схожесть.
+        """
+
+        best_court, best_court_sim = None, 0.0
+
+        for court in courts:
+            _, sim = is_similar(self.client.court_name, court.name)
+            if sim > best_court_sim:
+                best_court = court
+                best_court_sim = sim
+
+        return best_court, best_court_sim
+
+    def _resolve_court(self) -> CourtMapping | None:
+        """Подбор региона и суда ГАСП для клиента, регион выбирается на странице.
+
+        Списки берутся из справочника, если его нет, он устарел или в нём нет суда клиента -
+        читаются со страницы и сохраняются в справочник.
+
+        Returns:
+            CourtMapping | None: Регион и суд ГАСП, None - подходящий суд не найден.
+        """
+
+        regions = court_directory.regions()
+        if regions is None:
+            self.waits.options("#currentRegion")
+            regions = self._read_options("#currentRegion")
+            if not regions:
+                return None
+            court_directory.save_regions(regions)
+
+        region, region_sim = self._best_region(regions)
+        if region is None:
+            return None
+        self.logger.info(f"Выбран регион: {region.name!r} (схожесть: '{region_sim:.2f})'")
+        self._select_region(region.value)
+
+        courts = court_directory.courts(region.value)
+        court, court_sim = self._best_court(courts or [])
+        if courts is None or court_sim < COURT_SIMILARITY:
+            # Справочник устарел или в нём нет суда клиента: список перечитывается со страницы
+            courts = self._read_options("#currentCourt")
+            if courts:
+                court_directory.save_courts(region.value, courts)
+            court, court_sim = self._best_court(courts)
+
+        if court is None or court_sim < COURT_SIMILARITY:
+            return None
+        return CourtMapping(
+            region_value=region.value,
+            region_name=region.name,
+            court_value=court.value,
+            court_name=court.name,
+            similarity=court_sim
+        )
+
+    @_timed_step("_court_selection")
     def _court_selection(self):
         """Процесс, связанный с кнопкой 'Выбрать суд'"""
 
@@ -496,6 +714,7 @@ class RegularServe(BasePage):
         _attempt = 5
         while _attempt > _step:
             _step += 1
+            self._count_attempt("_court_selection", _step)
 
             if _step + 1 == _attempt:
                 handle_browser_error(
@@ -507,110 +726,51 @@ class RegularServe(BasePage):
 
             try:
                 court_selection_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Выбрать суд'"])
+                self.pace()
                 court_selection_button.first.click(timeout=2_000)
             except (TimeoutError, Error):
                 try:
-                    self.page.reload()
+                    self._reload()
                 except (TimeoutError, Error):
                     raise BaseBrowserError
                 continue
             
-            # Сбор всех регионов
+            # Регион и суд: сохранённое соответствие или подбор по спискам справочника (страницы)
+            mapping = None
             try:
-                regions = self.page.locator("#currentRegion")
-                if regions.count() > 0:
-                    options_regions = self.page.locator('#currentRegion option:not([value=""])')
-                    list_regions = [options_regions.nth(reg).text_content().strip() for reg in range(options_regions.count())]
+                mapping = court_directory.mapping(self.client.region_name, self.client.court_name)
+                resolved = mapping is None
+                if mapping:
+                    self._select_region(mapping.region_value)
                 else:
-                    continue
-            except (TimeoutError, Error):
-                try:
-                    self.page.reload()
-                except (TimeoutError, Error):
-                    raise BaseBrowserError
-                continue
-
-            client_region = self.client.region_name
-            best_region, best_region_sim = None, 0.0
-
-            for region in list_regions:
-                _, sim = is_similar(client_region, region)
-                
-                # Проверяем исключения
-                exception_found = False
-                for exception in REGION_EXCEPTIONS:
-                    if exception in client_region.lower() and exception in region.lower():
-                        best_region = region
-                        best_region_sim = 1.0
-                        exception_found = True
-                        break
-
-                if exception_found:
-                    break  # выходим из основного цикла, нашли точное совпадение
-
-                # Обычное сравнение
-                if sim > best_region_sim:
-                    best_region = region
-                    best_region_sim = sim
-
-            try:
-                if best_region:
-                    self.logger.info(f"Выбран регион: {best_region!r} (схожесть: '{best_region_sim:.2f})'")
-                    regions.select_option(best_region, timeout=2_000)
-                    sleep(5)
-                else:
-                    continue
-            except (TimeoutError, Error):
-                try:
-                    self.page.reload()
-                except (TimeoutError, Error):
-                    raise BaseBrowserError
-                continue
-
-            try:
-                # Выбор судебного органа
-                judicial_authorities = self.page.locator("#currentCourt")
-                if judicial_authorities.count() > 0:
-                    options_judicial_authority = self.page.locator('#currentCourt option:not([value=""])')
-                    list_judicial_authority = [options_judicial_authority.nth(reg).text_content().strip() for reg in range(options_judicial_authority.count())]
-                else:
-                    continue
-            except (TimeoutError, Error):
-                try:
-                    self.page.reload()
-                except (TimeoutError, Error):
-                    raise BaseBrowserError
-                continue
-
-            client_court_name = self.client.court_name
-            best_court, best_court_sim = None, 0.0
-
-            for judicial_authority in list_judicial_authority:
-                _, sim = is_similar(client_court_name, judicial_authority)
-
-                if sim > best_court_sim:
-                    best_court = judicial_authority
-                    best_court_sim = sim
+                    mapping = self._resolve_court()
+                    if mapping is None:
+                        continue
 
-            try:
-                if best_court and best_court_sim >= 0.7:
-                    self.logger.info(f"Выбран судебный орган: {best_court!r} (схожесть: '{best_court_sim:.2f})'")
-                    judicial_authorities.select_option(best_court, timeout=2_000)
-                    sleep(5)
-                else:
-                    continue
+                self.logger.info(f"Выбран судебный орган: {mapping.court_name!r} (схожесть: '{mapping.similarity:.2f})'")
+                self.page.locator("#currentCourt").select_option(value=mapping.court_value, timeout=2_000)
+                self.waits.network_idle()
+                if resolved:
+                    court_directory.save_mapping(self.client.region_name, self.client.court_name, mapping)
             except (TimeoutError, Error):
+                # Значения на странице могли измениться: соответствие удаляется, списки перечитываются
+                court_directory.forget(
+                    self.client.region_name,
+                    self.client.court_name,
+                    region_value=mapping.region_value if mapping else None
+                )
                 try:
-                    self.page.reload()
+                    self._reload()
                 except (TimeoutError, Error):
                     raise BaseBrowserError
                 continue
 
             try:
+                self.pace()
                 self.page.get_by_role("button", name=WORDS["Кнопка 'Сохранить' в popup окне"]).first.click(timeout=2_000)
             except (TimeoutError, Error):
                 try:
-                    self.page.reload()
+                    self._reload()
                 except (TimeoutError, Error):
                     raise BaseBrowserError
                 continue
@@ -618,6 +778,7 @@ class RegularServe(BasePage):
             break
         self.logger.info("Суд успешно выбран!")
 
+    @_timed_step("_essence_of_appeal")
     def _essence_of_appeal(self):
         """Процесс, связанный с секцией 'Суть обращения'"""
 
@@ -638,6 +799,7 @@ class RegularServe(BasePage):
             _attempt = 5
             while _attempt > _step:
                 _step += 1
+                self._count_attempt("_essence_of_appeal", _step)
 
                 if _step + 1 == _attempt:
                     handle_browser_error(
@@ -651,7 +813,7 @@ class RegularServe(BasePage):
                     container.locator(f'button:has-text("{WORDS["Кнопка 'Добавить файл'"]}")').click(timeout=2_000)
                 except (TimeoutError, Error):
                     try:
-                        self.page.reload()
+                        self._reload()
                     except (TimeoutError, Error):
                         raise BaseBrowserError
                     continue
@@ -659,8 +821,8 @@ class RegularServe(BasePage):
                 def _upload():
                     """Загрузка файла"""
                     try:
-                        self.page.locator(WORDS["JS для загрузки файла"]).first.set_input_files(str(path_to_statement), timeout=2_000)
-                        sleep(5)
+                        self.pace()
+                        self.waits.upload(self.page.locator(WORDS["JS для загрузки файла"]).first, str(path_to_statement), timeout=2_000)
 
                         try:
                             # Надпись 'Необходимо прикрепить файл'
@@ -669,17 +831,17 @@ class RegularServe(BasePage):
                             # Кнопка 'Отменить'
                             cancel_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Отменить'в popup окне"])
                             cancel_button.first.click(timeout=10_000)
-                            sleep(2)
+                            self.waits.popup_closed(cancel_button.first)
                             return False
 
                         except (TimeoutError, Error):
                             # Если надписи нет 'Необходимо прикрепить файл'
                             try:
-                                sleep(5)
-                                self.page.locator(WORDS["JS для загрузки файла"]).first.set_input_files(str(path_to_statement_sig), timeout=2_000)
+                                self.pace()
+                                self.waits.upload(self.page.locator(WORDS["JS для загрузки файла"]).first, str(path_to_statement_sig), timeout=2_000)
 
                                 try:
-                                    self.page.locator('.form-group span:has-text("Файл подписан УКЭП")').text_content(timeout=2_000).strip()
+                                    self.waits.signed(timeout=2_000, required=True)
                                     # Если удачно прикреплен файл .sig
                                     return True
                                 except (TimeoutError, Error):
@@ -687,7 +849,7 @@ class RegularServe(BasePage):
                                     try:
                                         cancel_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Отменить'в popup окне"])
                                         cancel_button.first.click(timeout=10_000)
-                                        sleep(2)
+                                        self.waits.popup_closed(cancel_button.first)
                                         return False
                                     except (TimeoutError, Error):
                                         return False
@@ -699,28 +861,32 @@ class RegularServe(BasePage):
                         return False
 
                 if _upload():
+                    self.pace()
                     self.page.get_by_role("button", name=WORDS["Кнопка 'Добавить' в popup окне"]).first.click()
                     break
 
                 else:
                     try:
-                        self.page.reload()
+                        self._reload()
                     except (TimeoutError, Error):
                         raise BaseBrowserError
                     continue
         
         self.logger.info("Заявление успешно прикреплено!")
 
+    @_timed_step("_appendices_to_appeal")
     def _appendices_to_appeal(self):
         """Процесс, связанный с секцией 'Приложения к обращению'"""
 
-        tmp_val = 0
         self.logger.info("Прикрепляю приложения...")
 
         # Файлы с в папке "Приложения"
         state_duty = ["Квитанция об уплате госпошлины.pdf", "Квитанция об уплате госпошлины.pdf.sig"]
         amount_of_claims = ["Расчет суммы требований.pdf", "1. Расчет суммы требований.pdf", "Расчет суммы требований.pdf.sig", "1. Расчет суммы требований.pdf.sig"]
 
+        # При продолжении подачи приложения, прикреплённые до ошибки, пропускаются
+        tmp_val = int(any(name in self._attached_appendices for name in amount_of_claims))
+
         path_to_apps_dir = self.path_to_packages_dir / self.client.lawsuit_id / APPS_DIR
         for file in path_to_apps_dir.iterdir():
             file_name = file.name
@@ -742,6 +908,7 @@ class RegularServe(BasePage):
                         __attempt = 10
                         while __attempt > __step:
                             __step += 1
+                            self._count_attempt("_appendices_to_appeal", __step)
 
                             if __step + 1 == __attempt:
                                 handle_browser_error(
@@ -756,7 +923,7 @@ class RegularServe(BasePage):
                                 container.locator(f'button:has-text("{WORDS["Кнопка 'Добавить файл'"]}")').click(timeout=30_000)
                             except (TimeoutError, Error):
                                 try:
-                                    self.page.reload()
+                                    self._reload()
                                 except (TimeoutError, Error):
                                     raise BaseBrowserError
                                 continue
@@ -765,17 +932,18 @@ class RegularServe(BasePage):
                                 """Загрузка"""
                                 try:
                                     # Загружаем "file_1" = Расчет суммы требований.pdf
-                                    self.page.locator(WORDS["JS для загрузки файла"]).first.set_input_files(str(file_1), timeout=30_000)
-                                    sleep(2)
+                                    self.pace()
+                                    self.waits.upload(self.page.locator(WORDS["JS для загрузки файла"]).first, str(file_1), timeout=30_000)
                                     # Загружаем "file_2" = Расчет суммы требований.pdf.sig
-                                    self.page.locator(WORDS["JS для загрузки файла"]).first.set_input_files(str(file_2), timeout=30_000)
-                                    sleep(2)
+                                    self.pace()
+                                    self.waits.upload(self.page.locator(WORDS["JS для загрузки файла"]).first, str(file_2), timeout=30_000)
                                 except (TimeoutError, Error):
                                     return False
 
                                 try:
                                     # Надпись 'Файл подписан УКЭП' при приклеплении *.sig файла
-                                    self.page.locator('.form-group span:has-text("Файл подписан УКЭП")').text_content(timeout=30_000).strip()
+                                    self.waits.signed(timeout=30_000, required=True)
+                                    self.pace()
                                     self.page.get_by_role("button", name=WORDS["Кнопка 'Добавить' в popup окне"]).first.click()
                                     return True
 
@@ -784,18 +952,22 @@ class RegularServe(BasePage):
                                     try:
                                         cancel_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Отменить'в popup окне"])
                                         cancel_button.first.click(timeout=30_000)
-                                        sleep(2)
+                                        self.waits.popup_closed(cancel_button.first)
                                         return False
                                     except (TimeoutError, Error):
                                         raise BaseBrowserError
                             
                             if __upload():
                                 tmp_val += 1
+                                self._attached_appendices.add(file_1.name)
                                 break
                             else:
                                 continue
                 continue
 
+            elif file_name in self._attached_appendices:
+                continue
+
             else:
                 def _upload_data():
                     """Загрузка документа"""
@@ -803,6 +975,7 @@ class RegularServe(BasePage):
                     _attempt = 10
                     while _attempt > _step:
                         _step += 1
+                        self._count_attempt("_appendices_to_appeal", _step)
 
                         if _step + 1 == _attempt:
                             handle_browser_error(
@@ -816,18 +989,21 @@ class RegularServe(BasePage):
                             # Добавить файл
                             container = self.page.locator(f'h2:has-text("Приложения к обращению")').locator('xpath=../..')
                             container.locator(f'button:has-text("{WORDS["Кнопка 'Добавить файл'"]}")').click(timeout=30_000)
-                            sleep(2)
+                            file_input = self.page.locator(WORDS["JS для загрузки файла"]).first
+                            self.waits.popup_opened(file_input, state="attached")
 
                             # Загрузка файла
-                            self.page.locator(WORDS["JS для загрузки файла"]).first.set_input_files(str(file), timeout=30_000)
-                            sleep(5)
+                            self.pace()
+                            self.waits.upload(file_input, str(file), timeout=30_000)
 
                             # Кнопка 'Добавить'
-                            self.page.get_by_role("button", name=WORDS["Кнопка 'Добавить' в popup окне"]).first.click(timeout=30_000)
-                            sleep(1)
+                            add_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Добавить' в popup окне"]).first
+                            self.pace()
+                            add_button.click(timeout=30_000)
+                            self.waits.popup_closed(add_button)
                         except (TimeoutError, Error):
                             try:
-                                self.page.reload(timeout=60_000)
+                                self._reload(timeout=60_000)
                             except (TimeoutError, Error):
                                 continue
                             continue
@@ -839,17 +1015,19 @@ class RegularServe(BasePage):
                             # Кнопка 'Отменить'
                             cancel_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Отменить'в popup окне"])
                             cancel_button.first.click(timeout=30_000)
-                            sleep(2)
+                            self.waits.popup_closed(cancel_button.first)
                             continue
                         except (TimeoutError, Error):
                             return True
 
                 if _upload_data():
+                    self._attached_appendices.add(file_name)
                     continue
         
         self.logger.info("Приложения успешно прикреплены!")
 
 
+    @_timed_step("_state_duty_receipt")
     def _state_duty_receipt(self):
         """Процесс, связанный с секцией 'Уплата госпошлины'"""
 
@@ -875,6 +1053,7 @@ class RegularServe(BasePage):
         __attempt = 10
         while __attempt > __step:
             __step += 1
+            self._count_attempt("_state_duty_receipt", __step)
 
             if __step + 1 == __attempt:
                 handle_browser_error(
@@ -888,17 +1067,18 @@ class RegularServe(BasePage):
                 """Загрузка"""
                 try:
                     # Загружаем "file_1" = Квитанция об уплате госпошлины.pdf
-                    self.page.locator(WORDS["JS для загрузки файла"]).first.set_input_files(str(file_1), timeout=10_000)
-                    sleep(2)
+                    self.pace()
+                    self.waits.upload(self.page.locator(WORDS["JS для загрузки файла"]).first, str(file_1), timeout=10_000)
                     # Загружаем "file_2" = Квитанция об уплате госпошлины.pdf.sig
-                    self.page.locator(WORDS["JS для загрузки файла"]).first.set_input_files(str(file_2), timeout=10_000)
-                    sleep(2)
+                    self.pace()
+                    self.waits.upload(self.page.locator(WORDS["JS для загрузки файла"]).first, str(file_2), timeout=10_000)
                 except (TimeoutError, Error):
                     return False
 
                 try:
                     # Надпись 'Файл подписан УКЭП' при приклеплении *.sig файла
-                    self.page.locator('.form-group span:has-text("Файл подписан УКЭП")').text_content(timeout=2_000).strip()
+                    self.waits.signed(timeout=2_000, required=True)
+                    self.pace()
                     self.page.get_by_role("button", name=WORDS["Кнопка 'Добавить' в popup окне"]).first.click()
                     return True
 
@@ -907,7 +1087,7 @@ class RegularServe(BasePage):
                     try:
                         cancel_button = self.page.get_by_role("button", name=WORDS["Кнопка 'Отменить'в popup окне"])
                         cancel_button.first.click(timeout=10_000)
-                        sleep(2)
+                        self.waits.popup_closed(cancel_button.first)
                         return False
                     except (TimeoutError, Error):
                         raise BaseBrowserError
@@ -927,6 +1107,7 @@ class RegularServe(BasePage):
 
     # XXX: Отправка обращения, в проде быть аккуратнее, т.к. там появляется номер обращения, который нужно сохранить!
     # Отменить отправку нельзя
+    @_timed_step("_create_an_appeal")
     def _create_an_appeal(self):
         """Процесс, связанный с отправкой обращения"""
 
@@ -934,6 +1115,7 @@ class RegularServe(BasePage):
         _attempt = 10
         while _attempt > _step:
             _step += 1
+            self._count_attempt("_create_an_appeal", _step)
 
             if _step + 1 == _attempt:
                 handle_browser_error(
@@ -945,10 +1127,12 @@ class RegularServe(BasePage):
 
             try:
                 try:
+                    self.pace()
                     self.page.locator('button:has-text("Сформировать обращение")').click(timeout=10_000)
                     self.page.locator('button:has-text("Сформировать обращение")').click(timeout=10_000)
                 except (TimeoutError, Error):
                     pass
+                self.pace()
                 self.page.locator('button:has-text("Отправить")').click(timeout=10_000)
 
                 get_number = self.page.locator("label:has-text(\"Номер\") + .col-sm-6 div").text_content().strip()
@@ -956,11 +1140,12 @@ class RegularServe(BasePage):
                 date_and_time_send = self.page.locator("label:has-text(\"Дата и время отправки\") + .col-sm-6 div").text_content().strip()
 
                 logo = self.page.locator("a.nav-logo").first
+                self.pace()
                 logo.click()
                 break
             except (TimeoutError, Error):
                 try:
-                    self.page.reload()
+                    self._reload()
                 except (TimeoutError, Error):
                     raise BaseBrowserError
                 continue
@@ -983,7 +1168,10 @@ class RegularServe(BasePage):
         self.logger.info(f"Найдено клиентов для обработки: \"{clients_total}\"")
 
         for client in clients:
-            self.client = ClientData.from_dict(client)
+            self.client = client
+            self.waits.reset()
+            self.spans.client(self.client.lawsuit_id)
+            self._reset_checkpoint()
             self.logger.info(f"Работаю с клиентом \"{self.client.lawsuit_id}\"")
 
             CourtActions.change_status(
@@ -1000,17 +1188,29 @@ class RegularServe(BasePage):
                     if _step + 1 == _attempt:
                         return False
 
-                    cleared = CleaningDrafts(
-                        page=self.page,
-                        user_name=self.user_name,
-                        logger=self.logger,
-                        logger_path=self.logger_path
-                    ).start_cleaning_drafts()
+                    if _step > 0 and self._draft_alive():
+                        # Черновик на месте: продолжаем с шага, на котором произошла ошибка
+                        failed_step = SUBMISSION_STEPS[len(self._completed_steps)]
+                        self.logger.info(f"Черновик сохранён, продолжаю подачу с шага \"{failed_step}\"")
+                        metrics_store.inc("gas_submission_restarts_total", mode="resume", step=failed_step)
+                    else:
+                        if _step > 0:
+                            self.logger.info("Черновик потерян, начинаю подачу клиента заново")
+                            metrics_store.inc("gas_submission_restarts_total", mode="full",
+                                              step=SUBMISSION_STEPS[len(self._completed_steps)])
+                        self._reset_checkpoint()
+
+                        cleared = CleaningDrafts(
+                            page=self.page,
+                            user_name=self.user_name,
+                            logger=self.logger,
+                            logger_path=self.logger_path
+                        ).start_cleaning_drafts()
+
+                        if not cleared:
+                            self.logger.warning("Не удалось очистить черновики, пропускаю клиента...")
+                            return False
 
-                    if not cleared:
-                        self.logger.warning("Не удалось очистить черновики, пропускаю клиента...")
-                        return False
-                        
                     success = self._submit_client_documents()
                     
                     if success:
@@ -1018,7 +1218,10 @@ class RegularServe(BasePage):
                     else:
                         _step += 1
                     
-            if _submission_documents():
+            submitted = _submission_documents()
+            self.logger.info(f"Ожидание страницы по клиенту \"{self.client.lawsuit_id}\": {self.waits.summary() or 'нет'}")
+
+            if submitted:
                 continue
             else:
                 CourtActions.change_status(
@@ -1028,37 +1231,82 @@ class RegularServe(BasePage):
                 )
                 # TODO: удаляем пакет документов
                 shutil.rmtree(str(Path(self.path_to_packages_dir / self.client.lawsuit_id)), ignore_errors=True)
-        
+
+        self.spans.store.flush()
         return True
 
     def _submit_client_documents(self) -> bool:
         """
-        Один атомарный проход всех шагов подачи документов.
-        Бросает исключение при любой ошибке — это будет перехвачено в ретраях.
+        Проход шагов подачи документов, начиная с первого непройденного (SUBMISSION_STEPS).
+        Пройденные шаги сохраняются в контрольной точке, ошибка шага перехватывается в ретраях.
 
         True - всё ок, False - всё не ок
         """
         try:
-            self._click_submit_appeal()
-            # Представитель + индекс и адрес
-            self._click_representative_button()
-            # Доверенность
-            self._click_document_confirming_authority_button()
-            # Данные заявителя
-            self._click_applicants_details()
-            # Данные участника
-            self._click_participants_details()
-            # Выбор суда
-            self._court_selection()
-            # Суть обращения
-            self._essence_of_appeal()
-            # Приложения
-            self._appendices_to_appeal()
-            # ГосПошлина
-            self._state_duty_receipt()
-            # Отправка
-            self._create_an_appeal()
+            for step in SUBMISSION_STEPS[len(self._completed_steps):]:
+                getattr(self, step)()
+                self._completed_steps.append(step)
 
             return True
         except BaseBrowserError:
             return False
+
+    def _reset_checkpoint(self) -> None:
+        """Сброс контрольной точки клиента (подача начинается с первого шага)."""
+
+        self._completed_steps = []
+        self._attached_appendices = set()
+
+    def _step_data_saved(self, step: str) -> bool:
+        """Проверка, что данные пройденного шага сохранились в черновике после перезагрузки страницы.
+
+        Args:
+            step (str): Шаг из SUBMISSION_STEPS.
+
+        Returns:
+            bool: True, если значение шага на странице (или шаг не проверяется).
+        """
+
+        if step == "_click_representative_button":
+            # Индекс вводится без сохранения и может пропасть при перезагрузке
+            return bool(self.page.locator('#Address_CourtNotices_Index').input_value(timeout=2_000).strip())
+        if step == "_click_applicants_details":
+            # Строка добавленного заявителя
+            name = self.data_applicant.get("name")
+        elif step == "_click_participants_details":
+            # Строка добавленного участника
+            name = self.client.client_first_name
+        else:
+            return True
+        return bool(name) and self.page.get_by_text(name).first.is_visible()
+
+    def _draft_alive(self) -> bool:
+        """Проверка, что после ошибки черновик обращения не потерян и подачу можно продолжить.
+
+        Шаг, данные которого не сохранились после перезагрузки, и все следующие за ним
+        убираются из контрольной точки: подача продолжится с него.
+
+        Returns:
+            bool: True, если форма обращения открывается после перезагрузки страницы
+                и в контрольной точке остались пройденные шаги.
+        """
+
+        if not self._completed_steps:
+            return False
+        try:
+            self._reload(timeout=60_000)
+            self.waits.page_ready()
+            self.page.locator(DRAFT_FORM_MARKER).first.wait_for(state="visible", timeout=10_000)
+        except (TimeoutError, Error):
+            return False
+
+        for index, step in enumerate(self._completed_steps):
+            try:
+                saved = self._step_data_saved(step)
+            except (TimeoutError, Error):
+                saved = False
+            if not saved:
+                self.logger.info(f"Данные шага \"{step}\" не сохранились в черновике, шаг будет пройден заново")
+                del self._completed_steps[index:]
+                break
+        return bool(self._completed_steps)
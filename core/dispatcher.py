@@ -1,6 +1,7 @@
 import argparse
 import os
 import sys
+from contextlib import AbstractContextManager, nullcontext
 from datetime import datetime
 from pathlib import Path
 
@@ -28,14 +29,25 @@ def parse_arguments():
     return parser.parse_args()
 
 
-def process_manager(user_name: str) -> None:
+def process_manager(
+        user_name: str,
+        browser_slot: AbstractContextManager = nullcontext(),
+        signing_slot: AbstractContextManager = nullcontext(),
+        console_title: bool = True
+        ) -> None:
     """Распределение запуска.
 
     Args:
         user_name (str): Пользователь, например, Солонарь_Анастасия.
+        browser_slot (AbstractContextManager, optional): Ограничение одновременно открытых браузеров,
+            удерживается от запуска браузера до его закрытия. По умолчанию без ограничения.
+        signing_slot (AbstractContextManager, optional): Ограничение одновременных подписей документов.
+            По умолчанию без ограничения.
+        console_title (bool, optional): Переименовать окно консоли по пользователю. По умолчанию True.
     """
 
-    os.system(f'title {user_name}')
+    if console_title:
+        os.system(f'title {user_name}')
 
     # Логгер
     date_now = datetime.now().strftime("%d.%m.%Y___%H-%M-%S")
@@ -87,11 +99,12 @@ def process_manager(user_name: str) -> None:
 
     # Подписание документов
     try:
-        signed_files(
-            path_to_folder=final_path_to_folder,
-            user_name=user_name,
-            logger=main_logger
-            )
+        with signing_slot:
+            signed_files(
+                path_to_folder=final_path_to_folder,
+                user_name=user_name,
+                logger=main_logger
+                )
 
     except Exception as ex:
         handle_critical_error(
@@ -102,46 +115,52 @@ def process_manager(user_name: str) -> None:
             user_name=user_name
         )
 
-    browser = BaseBrowser(user_name)
-    try:
-        regular_serve = RegularServe(
-            page=browser.page,
-            path_to_packages_dir=final_path_to_folder,
-            user_name=user_name,
-            logger=main_logger,
-            logger_path=main_logger_path
-        )
-
-        success = regular_serve.start_serving()
-
-        if success:
-            main_logger.info("Все документы поданы успешно!")
-            # Отправка данных в РМЦ # ADD BLOCKER WHILE PARSING IN PROCCESS AFTER CONTINUE
-            send_data_from_rmc(
+    with browser_slot:
+        browser = BaseBrowser(user_name)
+        try:
+            regular_serve = RegularServe(
+                page=browser.page,
+                path_to_packages_dir=final_path_to_folder,
                 user_name=user_name,
                 logger=main_logger,
                 logger_path=main_logger_path
             )
 
-            # Перенос в архивную БД
-            to_archived = CourtActions._flush_to_archive(user_name)
-            main_logger.info(f"Переместил и удалил клиентов в размере \"{to_archived}\" шт.")
+            success = regular_serve.start_serving()
 
-        else:
-            main_logger.error("Не удалось подать все документы")
+            if success:
+                main_logger.info("Все документы поданы успешно!")
+                # Отправка данных в РМЦ # ADD BLOCKER WHILE PARSING IN PROCCESS AFTER CONTINUE
+                send_data_from_rmc(
+                    user_name=user_name,
+                    logger=main_logger,
+                    logger_path=main_logger_path
+                )
 
-    except Exception as ex:
-        handle_critical_error(
-            logger=main_logger,
-            logger_path=main_logger_path,
-            error_message="Произошла непредвиденная ошибка!",
-            exception=ex,
-            page=browser.page,
-            user_name=user_name
-        )
+                # Перенос в архивную БД
+                to_archived = CourtActions._flush_to_archive(user_name)
+                main_logger.info(f"Переместил и удалил клиентов в размере \"{to_archived}\" шт.")
+
+            else:
+                main_logger.error("Не удалось подать все документы")
+
+        except Exception as ex:
+            handle_critical_error(
+                logger=main_logger,
+                logger_path=main_logger_path,
+                error_message="Произошла непредвиденная ошибка!",
+                exception=ex,
+                page=browser.page,
+                user_name=user_name
+            )
 
-    finally:
-        _logger.close_logger()
+        finally:
+            # В одном процессе с другими сотрудниками браузер закрывается явно, не дожидаясь завершения процесса
+            try:
+                browser.close()
+            except Exception as ex:
+                main_logger.warning(f"Не удалось закрыть браузер: {ex}")
+            _logger.close_logger()
 
 
 def main():
@@ -0,0 +1,158 @@
+"""Подача по нескольким сотрудникам из одного процесса.
+
+Каждый сотрудник обслуживается в отдельном потоке через process_manager: sync API Playwright
+привязан к потоку, поэтому у потока свой sync_playwright() и свой постоянный контекст Chromium
+(профиль сотрудника). Интерпретатор, движки баз и загруженные библиотеки общие для всех потоков.
+
+Число одновременно открытых браузеров и одновременных подписей документов ограничено семафорами.
+Диалоги ГосПлагина (выбор сертификата, пароль) - общие окна рабочего стола, поэтому вход выполняется
+по очереди (DESKTOP_DIALOG_LOCK в check_login.py).
+"""
+import argparse
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_PATH))
+
+from core.dispatcher import process_manager
+
+# Одновременно открытых браузеров
+MAX_BROWSERS = 4
+# Одновременных подписей документов (КриптоПро нагружает процессор)
+MAX_SIGNING = 2
+
+
+class OrchestratorStage:
+    """Этапы подачи сотрудника."""
+    RUNNING = 'running'         # поток подачи запущен
+    FINISHED = 'finished'       # process_manager завершился без ошибки
+    FAILED = 'failed'           # ошибка или критическое завершение (handle_critical_error)
+
+
+@dataclass(slots=True)
+class UserRun:
+    """Подача по сотруднику в потоке оркестратора."""
+    user_name: str
+    stage: str = OrchestratorStage.RUNNING
+    error: str | None = None
+    started_on: datetime = field(default_factory=datetime.now)
+    finished_on: datetime | None = None
+
+
+class Orchestrator:
+    """Запуск подач нескольких сотрудников в потоках одного процесса."""
+
+    def __init__(self, max_browsers: int = MAX_BROWSERS, max_signing: int = MAX_SIGNING) -> None:
+        """Инициализация параметров.
+
+        Args:
+            max_browsers (int, optional): Одновременно открытых браузеров. По умолчанию MAX_BROWSERS.
+            max_signing (int, optional): Одновременных подписей документов. По умолчанию MAX_SIGNING.
+        """
+
+        self.browser_slots = threading.BoundedSemaphore(max_browsers)
+        self.signing_slots = threading.BoundedSemaphore(max_signing)
+        self._runs: dict[str, UserRun] = {}
+        self._threads: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, user_name: str) -> bool:
+        """Запуск подачи по сотруднику.
+
+        Args:
+            user_name (str): Пользователь, например, Солонарь_Анастасия.
+
+        Returns:
+            bool: False, если подача по сотруднику уже выполняется.
+        """
+
+        with self._lock:
+            if (run := self._runs.get(user_name)) and run.stage == OrchestratorStage.RUNNING:
+                return False
+            self._runs[user_name] = UserRun(user_name=user_name)
+            thread = threading.Thread(target=self._run, args=(user_name,), name=f'serve-{user_name}')
+            self._threads[user_name] = thread
+            thread.start()
+            return True
+
+    def _run(self, user_name: str) -> None:
+        """Подача по сотруднику в потоке."""
+
+        stage, error = OrchestratorStage.FINISHED, None
+        try:
+            process_manager(
+                user_name=user_name,
+                browser_slot=self.browser_slots,
+                signing_slot=self.signing_slots,
+                console_title=False
+            )
+        except SystemExit as ex:
+            # handle_critical_error завершает подачу через exit(1): останавливается только этот поток
+            if ex.code not in (None, 0):
+                stage, error = OrchestratorStage.FAILED, f"Критическая ошибка, код {ex.code}"
+        except BaseException as ex:
+            stage, error = OrchestratorStage.FAILED, repr(ex)
+
+        with self._lock:
+            run = self._runs[user_name]
+            run.stage, run.error, run.finished_on = stage, error, datetime.now()
+
+    def runs(self) -> list[UserRun]:
+        """Подачи оркестратора.
+
+        Returns:
+            list[UserRun]: Подачи в порядке запуска.
+        """
+
+        with self._lock:
+            return list(self._runs.values())
+
+    def join(self) -> list[UserRun]:
+        """Ожидание завершения всех подач.
+
+        Returns:
+            list[UserRun]: Подачи в порядке запуска.
+        """
+
+        while True:
+            with self._lock:
+                threads = [thread for thread in self._threads.values() if thread.is_alive()]
+            if not threads:
+                return self.runs()
+            for thread in threads:
+                thread.join()
+
+
+def parse_arguments():
+    """Парсинг аргументов командной строки"""
+    parser = argparse.ArgumentParser(description='Start several owners in one process')
+
+    parser.add_argument('--user_name', type=str, action='append', required=True,
+                        help='Owner name, can be repeated')
+    parser.add_argument('--max_browsers', type=int, default=MAX_BROWSERS, help='Browsers opened at once')
+    parser.add_argument('--max_signing', type=int, default=MAX_SIGNING, help='Packages signed at once')
+
+    return parser.parse_args()
+
+
+def main():
+    """Основная функция для запуска из командной строки"""
+    args = parse_arguments()
+
+    orchestrator = Orchestrator(max_browsers=args.max_browsers, max_signing=args.max_signing)
+    for user_name in dict.fromkeys(args.user_name):
+        orchestrator.submit(user_name)
+
+    runs = orchestrator.join()
+    for run in runs:
+        print(f"{run.user_name}: {run.stage}" + (f" ({run.error})" if run.error else ""))
+
+    sys.exit(0 if all(run.stage == OrchestratorStage.FINISHED for run in runs) else 1)
+
+
+if __name__ == "__main__":
+    main()
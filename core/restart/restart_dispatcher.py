@@ -141,9 +141,10 @@ PROJECT_PATH = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_PATH))
 
 from database.database import CourtActions
+from database.engine import COURT_ACTIONS_DB_PATH, connect_sqlite
 from models.database import db_models
 
-DB_PATH = PROJECT_PATH / "database" / "CourtActions.db"
+DB_PATH = COURT_ACTIONS_DB_PATH
 VENV_PATH = PROJECT_PATH / "venv"
 PYTHON_PATH = VENV_PATH / "Scripts" / "python.exe"
 SCRIPT_PATH = PROJECT_PATH / "core" / "restart" / "restart_module.py"
@@ -151,23 +152,23 @@ SCRIPT_PATH = PROJECT_PATH / "core" / "restart" / "restart_module.py"
 
 def update_owner_status(owner: str) -> None:
     """Меняет статусы пользователя с 'В обработке' на 'Пакет документов полностью сформирован'"""
-    actions = CourtActions.get_actions(owner=owner, completed_processing=False)
-    processing_actions = [
-        action for action in actions
+    actions = CourtActions.get_actions(owner=owner, completed_processing=False) or []
+    processing_ids = [
+        action['lawsuit_id'] for action in actions
         if action.get('status') == db_models.Status.PROCESSING
     ]
 
-    for action in processing_actions:
-        CourtActions.change_status(
-            lawsuit_id=action['lawsuit_id'],
-            status=db_models.Status.DOCS_FORMED
-        )
+    changed = CourtActions.change_status_many(
+        status=db_models.Status.DOCS_FORMED,
+        lawsuit_ids=processing_ids
+    )
+    print(f"Возвращено в очередь пакетов пользователя {owner}: {changed}")
 
 
 def get_all_owners_with_projects() -> Dict[str, str]:
     """Возвращает словарь {owner: project} для всех уникальных пользователей в таблице court_actions."""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with connect_sqlite(DB_PATH, read_only=True) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT DISTINCT owner, project FROM court_actions")
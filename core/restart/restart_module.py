@@ -36,14 +36,13 @@ def restart_process(
     os.system(f'title {owner}')
 
     if one_user:
-        actions = CourtActions.get_actions(owner=owner, completed_processing=False)
-        action_in_processing = [
-            action for action in actions if action.get('status') == db_models.Status.PROCESSING
+        actions = CourtActions.get_actions(owner=owner, completed_processing=False) or []
+        lawsuit_ids_in_processing = [
+            action['lawsuit_id'] for action in actions if action.get('status') == db_models.Status.PROCESSING
             ]
-        for action in action_in_processing:
-            CourtActions.change_status(
-                lawsuit_id=action['lawsuit_id'], status=db_models.Status.DOCS_FORMED
-                )
+        CourtActions.change_status_many(
+            status=db_models.Status.DOCS_FORMED, lawsuit_ids=lawsuit_ids_in_processing
+            )
 
     date_now = datetime.now().strftime("%d.%m.%Y___%H-%M-%S")
     _logger = CustomLogger(custom_name_log_file=f"{owner}_{date_now}")
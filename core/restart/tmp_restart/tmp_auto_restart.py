@@ -1,15 +1,21 @@
-import sqlite3
 import subprocess
+import sys
 import time
 from datetime import datetime
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_PATH))
+
+from database.engine import COURT_ACTIONS_DB_PATH, connect_sqlite
 
 DB_PATH = fr"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\core\restart\tmp_restart\user_restart.db"
-MAIN_DB_PATH = fr"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\database\CourtActions.db"
+MAIN_DB_PATH = COURT_ACTIONS_DB_PATH
 
 
 def create_db():
     """Создаёт БД и таблицу, если они не существуют."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_sqlite(DB_PATH)
     cursor = conn.cursor()
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS user_restart (
@@ -24,7 +30,7 @@ def create_db():
 def monitor_db():
     """Мониторит БД на статус 'error'."""
     while True:
-        conn = sqlite3.connect(DB_PATH)
+        conn = connect_sqlite(DB_PATH)
         cursor = conn.cursor()
         cursor.execute("SELECT user_name, status FROM user_restart WHERE status = 'error'")
         errors = cursor.fetchall()
@@ -54,7 +60,7 @@ def monitor_db():
 
                 time.sleep(10)
 
-                conn_2 = sqlite3.connect(MAIN_DB_PATH)
+                conn_2 = connect_sqlite(MAIN_DB_PATH, read_only=True)
                 cursor_2 = conn_2.cursor()
                 cursor_2.execute(
                     "SELECT project FROM court_actions WHERE owner = ? LIMIT 1;", (user,)
@@ -1,9 +1,14 @@
 import argparse
-import sqlite3
+import sys
+from pathlib import Path
 
+PROJECT_PATH = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_PATH))
+
+from database.engine import COURT_ACTIONS_DB_PATH, connect_sqlite
 
 DB_PATH = fr"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\core\restart\tmp_restart\user_restart.db"
-MAIN_DB_PATH = fr"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\database\CourtActions.db"
+MAIN_DB_PATH = COURT_ACTIONS_DB_PATH
 
 
 def parse_arguments():
@@ -19,7 +24,7 @@ def parse_arguments():
 
 def update_status_in_tmp_db(user_name, status):
     """Записывает или обновляет статус для пользователя во временной БД."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_sqlite(DB_PATH)
     cursor = conn.cursor()
     cursor.execute('''
         INSERT OR REPLACE INTO user_restart (user_name, status)
@@ -31,7 +36,7 @@ def update_status_in_tmp_db(user_name, status):
 
 def update_status_in_main_db(user_name):
     """Обновляет статус для пользователя в основной БД."""
-    conn = sqlite3.connect(MAIN_DB_PATH)
+    conn = connect_sqlite(MAIN_DB_PATH)
     cursor = conn.cursor()
     cursor.execute('''
         UPDATE court_actions
@@ -7,7 +7,7 @@ from typing import Any
 import requests
 
 from config import PATH_TO_PUBLIC_FOLDER, PATH_TO_RMC_CONFIG
-from database import CourtActions
+from database import CourtActions, metrics_store
 from models.database import db_models
 from notification._rocket_chat import RocketChat
 from utils import get_data_from_toml
@@ -15,6 +15,14 @@ from utils._logger import CustomLogger
 
 RMC_CONFIG = get_data_from_toml(path_to_toml_file=PATH_TO_RMC_CONFIG)
 
+# Обязательные поля клиента в реестре РМЦ
+REQUIRED_CLIENT_FIELDS = [
+    "lastName", "firstName", "fatherName", "birthday", "gender",
+    "birthPlace", "registrationIndex", "registrationAddressLine",
+    "actualIndex", "actualAddressLine", "series", "number", "issueOn",
+    "issueBy", "code"
+    ]
+
 INN_ORGANIZATIONS = {
     "5407977286": "Интел",
     "7724889891": "Лайм",
@@ -53,7 +61,8 @@ def get_register_numbers(logger: CustomLogger, logger_path: str) -> list[int]:
     logger.info(f"Получаю все номера реестров из РМЦ по ссылке {url!r}")
 
     try:
-        resp = requests.get(url, headers=RMC_CONFIG["headers"], verify=False)
+        with metrics_store.timer("gas_rmc_request_duration_seconds", operation="get_registers"):
+            resp = requests.get(url, headers=RMC_CONFIG["headers"], verify=False)
         resp.raise_for_status()
         register_numbers = resp.json().get("printRegisterIds", [])
         logger.info(f"Успешно получил все номера реестров в количестве: {len(register_numbers)!r} шт.")
@@ -92,7 +101,8 @@ def start_submission(
     logger.info(f"Перевожу реестр № {register_number!r} в статус 'В процессе подачи', используя ссылку: {url!r}")
 
     try:
-        resp = requests.post(url, headers=RMC_CONFIG["headers"], json={"printRegisterId": register_number}, verify=False)
+        with metrics_store.timer("gas_rmc_request_duration_seconds", operation="start_submission"):
+            resp = requests.post(url, headers=RMC_CONFIG["headers"], json={"printRegisterId": register_number}, verify=False)
         resp.raise_for_status()
         data = resp.json()
         logger.info(f"Получил данные по реестру № {register_number!r} в количестве {len(data["lawsuits"])!r} шт.")
@@ -126,12 +136,13 @@ def download_files(
     """
     logger.info("Начинаю загрузку документов из РМЦ...")
     try:
-        resp = requests.get(url, headers=RMC_CONFIG["headers"], stream=True, verify=False)
-        resp.raise_for_status()
-        with open(out_path, "wb") as file:
-            for chunk in resp.iter_content(8192):
-                if chunk:
-                    file.write(chunk)
+        with metrics_store.timer("gas_rmc_request_duration_seconds", operation="download_files"):
+            resp = requests.get(url, headers=RMC_CONFIG["headers"], stream=True, verify=False)
+            resp.raise_for_status()
+            with open(out_path, "wb") as file:
+                for chunk in resp.iter_content(8192):
+                    if chunk:
+                        file.write(chunk)
         logger.info("Данные успешно скачены!")
     except Exception as ex:
         logger.error(f"Произошла ошибка при скачивании файлов из РМЦ!\nОшибка:\n{ex}")
@@ -173,83 +184,101 @@ def extract_archive(
         exit(1)
 
 
+def _lawsuit_to_row(lawsuit: dict[str: Any], register_number: int) -> dict[str: Any]:
+    """Преобразование подачи из реестра РМЦ в строку для БД с начальным статусом.
+
+    Args:
+        lawsuit (dict[str: Any]): Подача из реестра РМЦ.
+        register_number (int): Номер реестра.
+
+    Raises:
+        ValueError: У подачи нет 'lawsuitId'.
+
+    Returns:
+        dict[str: Any]: Данные подачи (headers_rmc) + status и error_msg.
+    """
+    lawsuit_id = lawsuit.get("lawsuitId")
+    if not lawsuit_id:
+        raise ValueError(f"В реестре № {register_number!r} есть подача без 'lawsuitId'!")
+
+    court = lawsuit.get("court", {})
+    client = lawsuit.get("client", {})
+
+    errors = []
+    missing_required = [field for field in REQUIRED_CLIENT_FIELDS if not client.get(field)]
+    if missing_required:
+        errors.append(f"Нет обязательного поля: {', '.join(missing_required)}")
+
+    if not (client.get("snils") or client.get("inn")):
+        errors.append("Нет обязательного поля: snils or inn")
+
+    return {
+        "register_id": register_number,
+        "lawsuit_id": lawsuit_id,
+        "court_name": court.get("name", ""),
+        "region_name": court.get("regionName", ""),
+        "client_last_name": client.get("lastName", ""),
+        "client_first_name": client.get("firstName", ""),
+        "client_father_name": client.get("fatherName", ""),
+        "client_birthday": client.get("birthday", ""),
+        "client_gender": client.get("gender", ""),
+        "client_birth_place": client.get("birthPlace", ""),
+        "client_series": client.get("series", ""),
+        "client_number": client.get("number", ""),
+        "client_issue_on": client.get("issueOn", ""),
+        "client_issue_by": client.get("issueBy", ""),
+        "client_code": client.get("code", ""),
+        "client_snils": client.get("snils", ""),
+        "client_inn": client.get("inn", ""),
+        "client_registration_index": client.get("registrationIndex", ""),
+        "client_reg_address": client.get("registrationAddressLine", ""),
+        "client_actual_index": client.get("actualIndex", ""),
+        "client_actual_address": client.get("actualAddressLine", ""),
+        "client_phone": client.get("phoneNumber", ""),
+        "status": db_models.Status.ERROR_RMC if errors else db_models.Status.CREATED,
+        "error_msg": "; ".join(errors) if errors else None,
+    }
+
+
 def save_data_in_db(
         data: dict[str: Any],
         register_number: int,
         user_name: str,
         activity_type: str,
-        project_name: str
-        ) -> None:
+        project_name: str,
+        logger: CustomLogger
+        ) -> int:
     """Сохранение данных в БД.
 
+    Весь массив 'lawsuits' проверяется до записи, затем сохраняется одной транзакцией.
+    Повторная загрузка того же реестра не создает дублей (upsert по lawsuit_id).
+    Подача без 'lawsuitId' пропускается с предупреждением в логе: реестр к этому моменту уже взят в работу в РМЦ.
+
     Args:
         data (_type_): Словарь с данными.
         register_number (int): Номер реестра
         user_name (str): Имя пользователя, от кого забрали данные в РМЦ.
         activity_type (str): Тип, например, 'Индексация', 'Обычная подача', 'Парсинг ГАСП'
         project_name (str): Наименование проекта, например, 'Лайм', 'Интел'
-    """
-
-    lawsuits = data["lawsuits"]
-
-    for lawsuit in lawsuits:
-        court = lawsuit.get("court", {})
-        client = lawsuit.get("client", {})
-
-        CourtActions.append(
-                        rmc_register_num=register_number,
-                        owner=user_name,
-                        project=project_name,
-                        activity_type=activity_type,
-                        register_id=register_number,
-                        lawsuit_id=lawsuit.get("lawsuitId", ""),
-                        court_name=court.get("name", ""),
-                        region_name=court.get("regionName", ""),
-                        client_last_name=client.get("lastName", ""),
-                        client_first_name=client.get("firstName", ""),
-                        client_father_name=client.get("fatherName", ""),
-                        client_birthday=client.get("birthday", ""),
-                        client_gender=client.get("gender", ""),
-                        client_birth_place=client.get("birthPlace", ""),
-                        client_series=client.get("series", ""),
-                        client_number=client.get("number", ""),
-                        client_issue_on=client.get("issueOn", ""),
-                        client_issue_by=client.get("issueBy", ""),
-                        client_code=client.get("code", ""),
-                        client_snils=client.get("snils", ""),
-                        client_inn=client.get("inn", ""),
-                        client_registration_index=client.get("registrationIndex", ""),
-                        client_reg_address=client.get("registrationAddressLine", ""),
-                        client_actual_index=client.get("actualIndex", ""),
-                        client_actual_address=client.get("actualAddressLine", ""),
-                        client_phone=client.get("phoneNumber", ""),
-                        )
-
-        # TODO: Проверка на обязательные поля
-        required_filed = [
-            "lastName", "firstName", "fatherName", "birthday", "gender",
-            "birthPlace", "registrationIndex", "registrationAddressLine",
-            "actualIndex", "actualAddressLine", "series", "number", "issueOn",
-            "issueBy", "code"
-            ]
-
-        missing_required = [field for field in required_filed if not client.get(field)]
-
-        snils_or_inn = bool(client.get("snils") or client.get("inn"))
-
-        if missing_required:
-            CourtActions.change_status(
-                lawsuit_id=lawsuit.get("lawsuitId"),
-                status = db_models.Status.ERROR_RMC,
-                error_msg=f"Нет обязательного поля: {', '.join(missing_required)}"
-                )
+        logger (CustomLogger): Объект логгера.
 
-        if not snils_or_inn:
-            CourtActions.change_status(
-                lawsuit_id=lawsuit.get("lawsuitId"),
-                status = db_models.Status.ERROR_RMC,
-                error_msg="Нет обязательного поля: snils or inn"
-                )
+    Returns:
+        int: Количество сохраненных подач.
+    """
+    rows = []
+    for lawsuit in data["lawsuits"]:
+        try:
+            rows.append(_lawsuit_to_row(lawsuit=lawsuit, register_number=register_number))
+        except ValueError as ex:
+            logger.warning(f"{ex} Подача пропущена: {lawsuit.get('client', {}).get('lastName', '')!r}")
+
+    return CourtActions.append_bulk(
+        rmc_register_num=register_number,
+        owner=user_name,
+        project=project_name,
+        activity_type=activity_type,
+        data_list=rows
+        )
 
 
 def get_data_from_RMC(
@@ -295,13 +324,15 @@ def get_data_from_RMC(
 
                 if data.get("lawsuits"):
                     logger.info("Сохраняю данные в локальную БД...")
-                    save_data_in_db(
+                    saved = save_data_in_db(
                         data=data,
                         register_number=register_number,
                         user_name=user_name,
                         activity_type=activity_type,
-                        project_name=folder_name
+                        project_name=folder_name,
+                        logger=logger
                     )
+                    logger.info(f"Сохранил подачи по реестру № {register_number!r} в количестве {saved!r} шт.")
 
                 url_file = data.get("fileToPrintDocumentUrl")
                 if not url_file:
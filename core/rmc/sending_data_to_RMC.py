@@ -3,6 +3,7 @@ from pathlib import Path
 
 import requests
 
+from database import metrics_store
 from database.database import CourtActions
 from models.database.db_models import Status
 from utils._logger import CustomLogger
@@ -18,6 +19,11 @@ HEADERS = {
 }
 SSL_VERIFY = False
 
+# Поля подачи, которые нужны для отправки результата в РМЦ
+RMC_RESULT_COLUMNS = (
+    "lawsuit_id", "rmc_register_num", "status", "result_number", "date_uploaded_docs_on_gas", "error_msg"
+)
+
 
 def register_sent(
         registry_number: int,
@@ -38,7 +44,8 @@ def register_sent(
         json.dump(payload, file, indent=4, ensure_ascii=False)
 
     try:
-        resp = requests.post(url, headers=HEADERS, json=payload, verify=SSL_VERIFY, timeout=120)
+        with metrics_store.timer("gas_rmc_request_duration_seconds", operation="register_sent"):
+            resp = requests.post(url, headers=HEADERS, json=payload, verify=SSL_VERIFY, timeout=120)
         logger.info(f"Ответ РМЦ: {resp.text}")
         logger.info(f"Статус код: {resp.status_code}")
 
@@ -51,47 +58,52 @@ def register_sent(
             user_name=user_name
         )
 
+def lawsuit_result(client: dict) -> dict:
+    """Результат подачи по клиенту в формате РМЦ.
+
+    Args:
+        client (dict): Запись подачи (поля RMC_RESULT_COLUMNS).
+
+    Returns:
+        dict: Результат подачи для 'lawsuits'.
+    """
+    if client.get("status") == Status.COMPLETED:
+        return {
+            "lawsuitId": int(client.get("lawsuit_id")),
+            "successResult": {
+                "sentNumber": client.get("result_number"),
+                "lawsuitSentDate": client.get("date_uploaded_docs_on_gas").isoformat() + '+07:00'
+                }
+        }
+    return {
+        "lawsuitId": int(client.get("lawsuit_id")),
+        "errorResult": {"errors": [client.get("error_msg")]}
+    }
+
+
 def send_data_from_rmc(
         user_name: str,
         logger: CustomLogger,
         logger_path: str | Path
         ) -> bool:
     logger.info(f"Получаю данные реестра для \"{user_name}\"...")
-    registry_data: list[dict] = CourtActions.get_actions(owner=user_name, completed_processing=True)
-
-    # tmp_list = []
-    # for client in registry_data:
-    #     if client.get("rmc_register_num") == "36392":
-    #         tmp_list.append(client)
-
-    logger.info(f"Успешно получил данные в количестве \"{len(registry_data)}\" шт.")
+    registry_data = CourtActions.iter_actions(owner=user_name, completed_processing=True, columns=RMC_RESULT_COLUMNS)
 
     logger.info("Формирую json для отправки в РМЦ...")
+    registry_number = None
     lawsuits = []
     for client in registry_data:
-        if client.get("status") == Status.COMPLETED:
-            lawsuits.append({
-                "lawsuitId": int(client.get("lawsuit_id")),
-                "successResult": {
-                    "sentNumber": client.get("result_number"),
-                    "lawsuitSentDate": client.get("date_uploaded_docs_on_gas").isoformat() + '+07:00'
-                    }
-            })
-        elif client.get("status") == Status.ERROR:
-            lawsuits.append({
-                "lawsuitId": int(client.get("lawsuit_id")),
-                "errorResult": {"errors": [client.get("error_msg")]}
-            })
-        else:
-            lawsuits.append({
-                "lawsuitId": int(client.get("lawsuit_id")),
-                "errorResult": {"errors": [client.get("error_msg")]}
-            })
+        registry_number = registry_number or int(client.get("rmc_register_num"))
+        lawsuits.append(lawsuit_result(client))
+
+    if not lawsuits:
+        logger.info("Нет данных для отправки в РМЦ!")
+        return False
+    logger.info(f"Успешно получил данные в количестве \"{len(lawsuits)}\" шт.")
 
     logger.info("Json сформирован и готов к отправке!")
 
     logger.info("Отправляю данные в РМЦ по реестру")
-    registry_number = int(registry_data[0].get("rmc_register_num"))
     current_day = datetime.utcnow().strftime("%Y-%m-%d")
     logger.info(f"Реестр РМЦ {str(registry_number)}")
     register_sent(
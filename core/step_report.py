@@ -0,0 +1,57 @@
+"""Отчет по спанам шагов подачи (database/spans.py): самые долгие шаги и повторные попытки
+по сотрудникам и дням.
+
+Пример: python core/step_report.py --days 7 --user_name Солонарь_Анастасия
+"""
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_PATH))
+
+from database.spans import retry_hotspots, slowest_steps
+
+
+def parse_arguments():
+    """Парсинг аргументов командной строки"""
+    parser = argparse.ArgumentParser(description='Submission step timing report')
+
+    parser.add_argument('--days', type=int, default=7, help='Last N days')
+    parser.add_argument('--user_name', type=str, default=None, help='Owner name (all by default)')
+    parser.add_argument('--limit', type=int, default=20, help='Rows per table')
+
+    return parser.parse_args()
+
+
+def print_slowest(rows) -> None:
+    """Таблица самых долгих шагов"""
+    print("Самые долгие шаги (суммарное время)")
+    print(f"{'сотрудник':<28} {'день':<10} {'шаг':<45} {'клиентов':>8} {'сред, с':>8} {'макс, с':>8} "
+          f"{'всего, с':>9} {'ошибок':>6}")
+    for row in rows:
+        print(f"{row['owner']:<28} {row['day']:<10} {row['step']:<45} {row['clients']:>8} "
+              f"{row['avg_duration']:>8.1f} {row['max_duration']:>8.1f} {row['total_duration']:>9.1f} {row['errors']:>6}")
+
+
+def print_retries(rows) -> None:
+    """Таблица повторных попыток и перезагрузок"""
+    print("Повторные попытки и перезагрузки")
+    print(f"{'сотрудник':<28} {'день':<10} {'шаг':<45} {'повторов':>8} {'перезагр':>8} {'клиентов':>8} "
+          f"{'потеряно, с':>11}")
+    for row in rows:
+        print(f"{row['owner']:<28} {row['day']:<10} {row['step']:<45} {row['retries']:>8} {row['reloads']:>8} "
+              f"{row['clients']:>8} {row['retry_duration']:>11.1f}")
+
+
+def main():
+    """Основная функция для запуска из командной строки"""
+    args = parse_arguments()
+
+    print_slowest(slowest_steps(days=args.days, owner=args.user_name, limit=args.limit))
+    print()
+    print_retries(retry_hotspots(days=args.days, owner=args.user_name, limit=args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
 from .database import CourtActions, CourtActionsArchive
+from .metrics import metrics_store
 
-__all__ = ["CourtActions", "CourtActionsArchive"]
+__all__ = ["CourtActions", "CourtActionsArchive", "metrics_store"]
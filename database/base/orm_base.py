@@ -1,13 +1,21 @@
 import os
+from typing import Iterator, Sequence
 
 import sqlalchemy
-from sqlalchemy import Column, DateTime, Integer, func
+from sqlalchemy import Column, DateTime, Engine, Integer, func, select
 from sqlalchemy.orm import DeclarativeBase, declared_attr
 
+from ..row_mapping import RowMapper
+
 #определение типов
 type Row = sqlalchemy.orm.state.InstanceState
 
 
+#размер страницы потоковой выборки (_iter_rows) и порции чтения строк из курсора внутри страницы
+ITER_BATCH_SIZE = 1000
+ITER_YIELD_PER = 200
+
+
 DATABASE_DIR = os.getenv('DATABASE_DIRECTORY') if os.getenv('DATABASE_DIRECTORY') \
     else os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, 'database'))
 
@@ -40,6 +48,22 @@ class Base(DeclarativeBase):
         return "".join(characters).lstrip("_")
 
 
+    @classmethod
+    def _attribute_names(cls) -> tuple[tuple[str, str], ...]:
+        """Пары (атрибут модели, имя поля без символа "_" на конце), 
+        вычисляются один раз на класс вместо обхода cls.__dict__ для каждой строки
+
+        Returns:
+            tuple[tuple[str, str], ...]: атрибуты-столбцы модели
+        """
+        if '_attribute_names_cache' not in cls.__dict__:
+            cls._attribute_names_cache = tuple(
+                (key, key.rstrip("_")) for key, val in cls.__dict__.items()
+                if isinstance(val, sqlalchemy.orm.attributes.InstrumentedAttribute)
+            )
+        return cls._attribute_names_cache
+
+
     @classmethod
     def _row_to_dict(cls, row: Row) -> dict:
         """Преобразовывает строку записи бд в словарь с наименованием полей без символа "_" на конце
@@ -50,12 +74,83 @@ class Base(DeclarativeBase):
         Returns:
             dict: словарь с наименованиями полей и значениями
         """
-        return_dict = {}
-        for key, val in cls.__dict__.items():
-            if isinstance(val, sqlalchemy.orm.attributes.InstrumentedAttribute):
-                return_dict[key.rstrip("_")] = getattr(row, key)
+        return {name: getattr(row, key) for key, name in cls._attribute_names()}
+
+
+    @classmethod
+    def _row_mapper(cls) -> RowMapper:
+        """Отображение строк Core-запроса по всем столбцам таблицы в словарь 
+        (ключи как у _row_to_dict), создается один раз на класс
+
+        Returns:
+            RowMapper: отображение
+        """
+        if '_row_mapper_cache' not in cls.__dict__:
+            cls._row_mapper_cache = RowMapper(cls.__table__.columns)
+        return cls._row_mapper_cache
 
-        return return_dict
+
+    @classmethod
+    def _iter_rows(cls, bind: Engine, filt,
+                   columns: Sequence[str] | None = None,
+                   batch_size: int = ITER_BATCH_SIZE,
+                   ) -> Iterator[dict]:
+        """Потоковая выборка записей: постраничная выборка по ключу (id > последний id предыдущей страницы),
+        строки страницы читаются из курсора порциями (yield_per). Каждая страница читается в своем соединении,
+        поэтому долгий обход не держит снимок базы и не мешает checkpoint WAL
+
+        Args:
+            bind (Engine): движок базы
+            filt: условие отбора (выражение SqlAlchemy), None - все записи
+            columns (Sequence[str] | None): выбираемые поля, None - все поля
+            batch_size (int): размер страницы
+
+        Yields:
+            dict: запись, ключ - название поля
+        """
+        table_columns = cls.__table__.c
+        mapper = cls._row_mapper() if columns is None else RowMapper([table_columns[name] for name in columns])
+        stmt = select(table_columns.id.label('_cursor_id'), *mapper.columns).order_by(table_columns.id).limit(batch_size)
+        if filt is not None:
+            stmt = stmt.where(filt)
+        last_id = None
+        while True:
+            page = stmt if last_id is None else stmt.where(table_columns.id > last_id)
+            count = 0
+            with bind.connect() as conn:
+                for row in conn.execution_options(yield_per=ITER_YIELD_PER).execute(page):
+                    count += 1
+                    last_id = row[0]
+                    yield mapper.map_row(row[1:])
+            if count < batch_size:
+                return
+
+
+    @classmethod
+    def _count_by_bucket(cls, bind: Engine, filt, 
+                         bucket_format: str,
+                         utc_offset_hours: int = 0,
+                         ) -> list[tuple[str, str, str, int]]:
+        """Количество записей в разрезе (owner, status, интервал) одним запросом GROUP BY,
+        интервал - strftime(bucket_format) от updated_on, сдвинутого из UTC на utc_offset_hours
+
+        Args:
+            bind (Engine): движок базы
+            filt: условие отбора (выражение SqlAlchemy), None - все записи
+            bucket_format (str): формат strftime SQLite, например '%H' - час, '%d' - день месяца
+            utc_offset_hours (int): смещение местного времени от UTC, часы
+
+        Returns:
+            list[tuple[str, str, str, int]]: строки (owner, status, интервал, количество)
+        """
+        table_columns = cls.__table__.c
+        bucket = func.strftime(bucket_format, table_columns.updated_on, f'{utc_offset_hours:+d} hours').label('bucket')
+        stmt = select(table_columns.owner, table_columns.status, bucket, func.count().label('count')
+                      ).group_by(table_columns.owner, table_columns.status, bucket)
+        if filt is not None:
+            stmt = stmt.where(filt)
+        with bind.connect() as conn:
+            return [tuple(row) for row in conn.execute(stmt)]
 
 
     @classmethod
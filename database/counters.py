@@ -0,0 +1,78 @@
+"""Пересчет и сверка счетчиков register_counters с таблицей court_actions
+
+Счетчики поддерживаются триггерами (миграция 5), пересчет нужен только если данные
+court_actions менялись в обход триггеров (восстановление из копии, ручная правка):
+    python -m database.counters             - сверить счетчики (код возврата 1 при расхождении)
+    python -m database.counters --rebuild   - пересчитать счетчики
+"""
+import argparse
+import sys
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from .database import CourtActions, engine, engine_read, register_counters
+
+#определение типов
+type CounterKey = tuple[str, str, str]
+
+
+def _actual_counts():
+    """Запрос фактических количеств записей court_actions по ключу счетчиков"""
+    key = (func.ifnull(CourtActions.owner, '').label('owner'),
+           func.ifnull(CourtActions.rmc_register_num, '').label('rmc_register_num'),
+           func.ifnull(CourtActions.status, '').label('status'))
+    return select(*key, func.count().label('count')).group_by(*key)
+
+
+def rebuild_counters() -> int:
+    """Пересчитывает register_counters по court_actions в одной транзакции
+
+    Returns:
+        int: количество строк счетчиков
+    """
+    with Session(autoflush=False, bind=engine) as db:
+        db.execute(delete(register_counters))
+        result = db.execute(insert(register_counters).from_select(
+            ['owner', 'rmc_register_num', 'status', 'count'], _actual_counts()))
+        db.commit()
+    return result.rowcount
+
+
+def verify_counters() -> list[tuple[CounterKey, int, int]]:
+    """Сверяет register_counters с фактическими количествами в court_actions
+
+    Returns:
+        list[tuple[CounterKey, int, int]]: расхождения (ключ, значение счетчика, фактическое количество)
+    """
+    with Session(autoflush=False, bind=engine_read) as db:
+        actual = {(row.owner, row.rmc_register_num, row.status): row.count
+                  for row in db.execute(_actual_counts())}
+        stored = {(row.owner, row.rmc_register_num, row.status): row.count
+                  for row in db.execute(select(register_counters).where(register_counters.c.count!=0))}
+    return [(key, stored.get(key, 0), actual.get(key, 0))
+            for key in sorted(actual.keys() | stored.keys())
+            if stored.get(key, 0)!=actual.get(key, 0)]
+
+
+def main(argv:list[str]|None=None) -> int:
+    parser = argparse.ArgumentParser(description='Сверка и пересчет счетчиков register_counters')
+    parser.add_argument('--rebuild', action='store_true', help='пересчитать счетчики по court_actions')
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        print(f"register_counters пересчитаны, строк: {rebuild_counters()}")
+        return 0
+
+    mismatches = verify_counters()
+    for (owner, register_num, status), stored, actual in mismatches:
+        print(f"{owner!r} / реестр {register_num!r} / {status!r}: счетчик {stored}, фактически {actual}")
+    if mismatches:
+        print(f"Расхождений: {len(mismatches)}, для пересчета: python -m database.counters --rebuild")
+        return 1
+    print("register_counters совпадают с court_actions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Справочник регионов и судов ГАСП (значения option списков #currentRegion/#currentCourt) в CourtDirectory.db
+
+Списки читаются со страницы одним evaluate_all на список и хранятся DIRECTORY_TTL_DAYS дней,
+устаревший список или промах поиска по нему перечитывается со страницы.
+Соответствие суда из РМЦ (регион и наименование суда клиента) региону и суду ГАСП сохраняется после
+успешного выбора, повторные суды выбираются по значениям без чтения списков.
+"""
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .base.orm_base import DATABASE_DIR
+from .engine import connect_sqlite
+
+COURT_DIRECTORY_DB_PATH = Path(DATABASE_DIR) / "CourtDirectory.db"
+
+#через сколько дней списки и соответствия перечитываются со страницы
+DIRECTORY_TTL_DAYS = 7
+
+
+@dataclass(frozen=True, slots=True)
+class GasOption:
+    """Вариант списка ГАСП"""
+    value: str                  #атрибут value option
+    name: str                   #текст option
+
+
+@dataclass(frozen=True, slots=True)
+class CourtMapping:
+    """Регион и суд ГАСП для суда из РМЦ"""
+    region_value: str
+    region_name: str
+    court_value: str
+    court_name: str
+    similarity: float           #схожесть наименования суда из РМЦ и суда ГАСП
+
+
+class CourtDirectory:
+    """Справочник регионов, судов и соответствий, общий для потоков процесса
+
+    Args:
+        path (str | Path): путь до файла справочника
+        ttl_days (float): срок актуальности списков и соответствий, дни
+    """
+
+    def __init__(self, path:str|Path=COURT_DIRECTORY_DB_PATH, ttl_days:float=DIRECTORY_TTL_DAYS) -> None:
+        self.path = path
+        self.ttl_days = ttl_days
+        self._conn: sqlite3.Connection|None = None
+        self._lock = threading.Lock()
+
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = connect_sqlite(self.path, check_same_thread=False)
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS gas_regions (
+                    value TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS gas_courts (
+                    region_value TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (region_value, value)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS court_mappings (
+                    rmc_region TEXT NOT NULL,
+                    rmc_court TEXT NOT NULL,
+                    region_value TEXT NOT NULL,
+                    region_name TEXT NOT NULL,
+                    court_value TEXT NOT NULL,
+                    court_name TEXT NOT NULL,
+                    similarity REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (rmc_region, rmc_court)
+                ) WITHOUT ROWID;
+            """)
+            self._conn = conn
+        return self._conn
+
+
+    def _fresh_since(self) -> float:
+        return time.time() - self.ttl_days*86400
+
+
+    def _options(self, sql:str, parameters:tuple) -> list[GasOption]|None:
+        with self._lock:
+            rows = self._connect().execute(sql, parameters).fetchall()
+        #список пуст или устарел хотя бы частично - перечитывается со страницы
+        if not rows or min(row[2] for row in rows) < self._fresh_since():
+            return None
+        return [GasOption(value=value, name=name) for value, name, _ in rows]
+
+
+    def regions(self) -> list[GasOption]|None:
+        """
+        Returns:
+            list[GasOption] | None: регионы ГАСП, None - списка нет или он устарел
+        """
+        return self._options("SELECT value, name, updated_at FROM gas_regions", ())
+
+
+    def courts(self, region_value:str) -> list[GasOption]|None:
+        """
+        Args:
+            region_value (str): значение региона ГАСП
+
+        Returns:
+            list[GasOption] | None: суды региона, None - списка нет или он устарел
+        """
+        return self._options("SELECT value, name, updated_at FROM gas_courts WHERE region_value = ?",
+                             (region_value,))
+
+
+    def save_regions(self, options:list[GasOption]) -> None:
+        """Заменяет список регионов
+
+        Args:
+            options (list[GasOption]): регионы, прочитанные со страницы
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM gas_regions")
+                conn.executemany("INSERT OR REPLACE INTO gas_regions (value, name, updated_at) VALUES (?, ?, ?)",
+                                 [(option.value, option.name, now) for option in options])
+
+
+    def save_courts(self, region_value:str, options:list[GasOption]) -> None:
+        """Заменяет список судов региона
+
+        Args:
+            region_value (str): значение региона ГАСП
+            options (list[GasOption]): суды, прочитанные со страницы
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM gas_courts WHERE region_value = ?", (region_value,))
+                conn.executemany("""
+                    INSERT OR REPLACE INTO gas_courts (region_value, value, name, updated_at) VALUES (?, ?, ?, ?)
+                """, [(region_value, option.value, option.name, now) for option in options])
+
+
+    def mapping(self, rmc_region:str, rmc_court:str) -> CourtMapping|None:
+        """Сохраненное соответствие суда из РМЦ
+
+        Args:
+            rmc_region (str): регион клиента из РМЦ
+            rmc_court (str): наименование суда клиента из РМЦ
+
+        Returns:
+            CourtMapping | None: регион и суд ГАСП, None - соответствия нет или оно устарело
+        """
+        with self._lock:
+            row = self._connect().execute("""
+                SELECT region_value, region_name, court_value, court_name, similarity
+                FROM court_mappings
+                WHERE rmc_region = ? AND rmc_court = ? AND updated_at >= ?
+            """, (rmc_region, rmc_court, self._fresh_since())).fetchone()
+        return CourtMapping(*row) if row else None
+
+
+    def save_mapping(self, rmc_region:str, rmc_court:str, mapping:CourtMapping) -> None:
+        """Сохраняет соответствие после успешного выбора суда
+
+        Args:
+            rmc_region (str): регион клиента из РМЦ
+            rmc_court (str): наименование суда клиента из РМЦ
+            mapping (CourtMapping): регион и суд ГАСП
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO court_mappings
+                        (rmc_region, rmc_court, region_value, region_name, court_value, court_name, similarity, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (rmc_region, rmc_court, mapping.region_value, mapping.region_name,
+                      mapping.court_value, mapping.court_name, mapping.similarity, time.time()))
+
+
+    def forget(self, rmc_region:str, rmc_court:str, region_value:str|None=None) -> None:
+        """Удаляет соответствие и помечает списки устаревшими (значения на странице изменились)
+
+        Args:
+            rmc_region (str): регион клиента из РМЦ
+            rmc_court (str): наименование суда клиента из РМЦ
+            region_value (str | None, optional): регион ГАСП, суды которого перечитать. Defaults to None.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM court_mappings WHERE rmc_region = ? AND rmc_court = ?",
+                             (rmc_region, rmc_court))
+                conn.execute("UPDATE gas_regions SET updated_at = 0")
+                if region_value is not None:
+                    conn.execute("UPDATE gas_courts SET updated_at = 0 WHERE region_value = ?", (region_value,))
+
+
+#общий для потоков процесса справочник
+court_directory = CourtDirectory()
@@ -1,21 +1,29 @@
 import datetime
 from collections import defaultdict
+from typing import Iterator, Sequence
 
 import pandas as pd
 import sqlalchemy
-from sqlalchemy import (DDL, JSON, Boolean, Column, DateTime, Integer, String,
-                        and_, create_engine, event, func)
+from sqlalchemy import (Boolean, Column, DateTime, Integer, String, Table,
+                        and_, bindparam, case, func, select, text, update)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from models import db_models
+from models import ClientData, db_models
 
-from .base.orm_base import DATABASE_DIR, Base
+from .base.orm_base import ITER_BATCH_SIZE, Base
+from .engine import ARCHIVE_DB_PATH, COURT_ACTIONS_DB_PATH, create_sqlite_engine
+from .row_mapping import RowMapper, str_converters
 
 
 #определение типов
 type Row = sqlalchemy.orm.state.InstanceState
 
 
+#максимальное количество параметров в одном запросе SQLite
+SQLITE_MAX_PARAMS = 500
+
+
 #заголовки из реестра РМЦ
 headers_rmc = [
     'register_id',
@@ -48,10 +56,30 @@ class CourtActions(Base):
     """Судебные подачи
     """
     court_action_id = Column(String, index=True)        #id подачи локальный
-    lawsuit_id = Column(Integer)                        #id подачи РМЦ
+    lawsuit_id = Column(Integer, index=True, unique=True)   #id подачи РМЦ
     status = Column(String)                             #статус подачи
     rmc_register_num = Column(String)                   #номер реестра РМЦ
-    rmc_register_vars = Column(JSON)                    #параметры из реестра
+    register_id = Column(Integer)                       #id реестра РМЦ
+    court_name = Column(String)                         #наименование суда
+    region_name = Column(String)                        #регион суда
+    client_last_name = Column(String)                   #фамилия
+    client_first_name = Column(String)                  #имя
+    client_father_name = Column(String)                 #отчество
+    client_birthday = Column(String)                    #дата рождения
+    client_gender = Column(String)                      #пол
+    client_birth_place = Column(String)                 #место рождения
+    client_series = Column(String)                      #серия паспорта
+    client_number = Column(String)                      #номер паспорта
+    client_issue_on = Column(String)                    #дата выдачи паспорта
+    client_issue_by = Column(String)                    #кем выдан паспорт
+    client_code = Column(String)                        #код подразделения
+    client_snils = Column(String)                       #СНИЛС
+    client_inn = Column(String)                         #ИНН
+    client_registration_index = Column(String)          #индекс адреса регистрации
+    client_reg_address = Column(String)                 #адрес регистрации
+    client_actual_index = Column(String)                #индекс фактического адреса
+    client_actual_address = Column(String)              #фактический адрес
+    client_phone = Column(String)                       #телефон
     owner = Column(String)                              #пользователь, от кого подаём
     project = Column(String)                            #проект
     activity_type = Column(String)                      #тип активности (Индексация/Обычная подача/Парсинг ГАС)
@@ -62,6 +90,24 @@ class CourtActions(Base):
     error_msg = Column(String)                          #текст ошибки
 
 
+    @staticmethod
+    def _rmc_vars(data:dict) -> dict:
+        """Собирает значения полей реестра РМЦ (headers_rmc)
+
+        Args:
+            data (dict): данные из реестра РМЦ
+
+        Returns:
+            dict: ключ - название поля, даты приведены к строке
+        """
+        rmc_vars = {}
+        for var in headers_rmc:
+            val = data.get(var).strftime("%d.%m.%Y %H:%M:%S") if isinstance(
+                data.get(var), (pd.Timestamp, datetime.datetime)) else data.get(var)
+            rmc_vars[var] = val
+        return rmc_vars
+
+
     @classmethod
     def append(cls, rmc_register_num:str, owner:db_models.User, 
                project:str, activity_type:db_models.ActivityType, **data) -> str:
@@ -73,7 +119,7 @@ class CourtActions(Base):
             project (str): проект
             activity_type (db_models.ActivityType): тип активности
             
-            **data: данные из реестра РМЦ (headers_rmc), хранятся в поле с форматом json
+            **data: данные из реестра РМЦ (headers_rmc)
 
         Returns:
             str: возвращает id созданной записи (court_action_id)
@@ -82,19 +128,13 @@ class CourtActions(Base):
         #cls._flush_to_archive()
         with Session(autoflush=False, bind=engine) as db:
             #создается новая запись
-            rmc_vars = {}
-            for var in headers_rmc:
-                val = data.get(var).strftime("%d.%m.%Y %H:%M:%S") if isinstance(
-                    data.get(var), (pd.Timestamp, datetime.datetime)) else data.get(var)
-                rmc_vars[var] = val
             row = cls(
-                lawsuit_id = data.get('lawsuit_id'),
                 status = db_models.Status.CREATED,
                 rmc_register_num=rmc_register_num,
-                rmc_register_vars = rmc_vars,
                 owner = owner,
                 project = project,
-                activity_type = activity_type
+                activity_type = activity_type,
+                **cls._rmc_vars(data)
                     )
             db.add(row)
             db.commit()
@@ -109,7 +149,11 @@ class CourtActions(Base):
                     activity_type:str,
                     data_list:list[dict],
                     ) -> int:
-        """Массовое добавление данных 
+        """Массовое добавление данных одной транзакцией (один executemany)
+        court_action_id формируется в приложении, поэтому триггер set_court_actions_id_after_insert 
+        для этих записей не срабатывает.
+        При совпадении lawsuit_id у подачи в статусе CREATED обновляются поля реестра РМЦ (headers_rmc),
+        остальные подачи не меняются - повторная загрузка реестра не создает дублей и не сбрасывает статус
         
         Args:
             
@@ -118,35 +162,69 @@ class CourtActions(Base):
             project (str): проект
             activity_type (db_models.ActivityType): тип активности
                 
-            data_list(list): данные упакованные в list, ожидается массив с даннымии из реестра РМЦ
+            data_list(list): данные упакованные в list, ожидается массив с даннымии из реестра РМЦ,
+                            дополнительно в каждом элементе могут быть переданы начальные status и error_msg
 
         Returns:
-            int: количество созданных записей
+            int: количество переданных записей
         """
-        #сброс данных в архив
-        #cls._flush_to_archive()
+        if not data_list:
+            return 0
+        created_at = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
+        rows = []
+        for data in data_list:
+            rows.append(
+                {
+                    'court_action_id': f"CA-{created_at}-{data.get('lawsuit_id')}",
+                    'status': data.get('status') or db_models.Status.CREATED,
+                    'error_msg': data.get('error_msg'),
+                    'rmc_register_num': rmc_register_num,
+                    'owner': owner,
+                    'project': project,
+                    'activity_type': activity_type,
+                    **cls._rmc_vars(data),
+                }
+            )
+        stmt = sqlite_insert(cls.__table__)
+        #при повторной загрузке обновляются только данные реестра РМЦ и только у подач, которые еще не
+        #начали обрабатываться: статус, владелец и реестр существующей подачи не меняются,
+        #поданная или завершенная с ошибкой подача не возвращается в "Создано" (иначе ее подадут повторно)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.lawsuit_id],
+            set_={
+                **{key: stmt.excluded[key] for key in headers_rmc if key!='lawsuit_id'},
+                'updated_on': func.now(),
+            },
+            where=cls.status==db_models.Status.CREATED
+        )
         with Session(autoflush=False, bind=engine) as db:
-            rows = []
-            for data in data_list:
-                rmc_vars = {}
-                for var in headers_rmc:
-                    val = data.get(var).strftime("%d.%m.%Y %H:%M:%S") if isinstance(
-                        data.get(var), (pd.Timestamp, datetime.datetime)) else data.get(var)
-                    rmc_vars[var] = val
-                rows.append(
-                    cls(
-                    lawsuit_id = data.get('lawsuit_id'),
-                    status = db_models.Status.CREATED,
-                    rmc_register_num=rmc_register_num,
-                    rmc_register_vars = rmc_vars,
-                    owner = owner,
-                    project = project,
-                    activity_type = activity_type
-                        )
-                )
-            db.bulk_save_objects(rows)
+            db.execute(stmt, rows)
             db.commit()
-            return len(rows)
+        return len(rows)
+
+
+    @classmethod
+    def _actions_filter(cls, owner:db_models.User|None=None,
+                        status: db_models.Status|None=None,
+                        rmc_register_num:str|None=None,
+                        project:str|None=None,
+                        completed_processing=False):
+        """Условие отбора записей для get_actions/iter_actions (правила описаны в get_actions)
+
+        Returns:
+            условие отбора (выражение SqlAlchemy) или None, если не заполнены ни owner ни rmc_register_num
+        """
+        if owner:
+            if status:
+                return and_(cls.status==status, cls.owner==owner)
+            active_reg=cls.get_active_register(owner=owner,  project=project)
+            if completed_processing:
+                return and_(cls.rmc_register_num!=active_reg, cls.owner==owner) if active_reg \
+                    else cls.owner==owner
+            return cls.rmc_register_num==active_reg
+        elif rmc_register_num:
+            return cls.rmc_register_num==rmc_register_num
+        return None
 
 
     @classmethod
@@ -168,34 +246,59 @@ class CourtActions(Base):
         Returns:
             list[dict]|None: список словарей где ключ - название поля
         """
+        filt = cls._actions_filter(owner=owner, status=status, rmc_register_num=rmc_register_num,
+                                   project=project, completed_processing=completed_processing)
+        if filt is None:
+            return None
+        with Session(autoflush=False, bind=engine_read) as db:
+            mapper = cls._row_mapper()
+            if rows:=db.execute(mapper.statement().where(filt)).all():
+                return mapper.map(rows)
+
+
+    @classmethod
+    def iter_actions(cls, owner:db_models.User|None=None,
+                     status: db_models.Status|None=None,
+                     rmc_register_num:str|None=None,
+                     project:str|None=None,
+                     completed_processing=False,
+                     columns:Sequence[str]|None=None,
+                     batch_size:int=ITER_BATCH_SIZE,
+                     ) -> Iterator[dict]:
+        """Потоковый вариант get_actions (те же правила отбора), записи читаются страницами без загрузки 
+        всей выборки в память
+
+        Args:
+            columns (Sequence[str] | None, optional): выбираемые поля. Defaults to None - все поля.
+            batch_size (int): размер страницы
+
+        Yields:
+            dict: запись, ключ - название поля
+        """
+        filt = cls._actions_filter(owner=owner, status=status, rmc_register_num=rmc_register_num,
+                                   project=project, completed_processing=completed_processing)
+        if filt is None:
+            return
+        yield from cls._iter_rows(engine_read, filt, columns=columns, batch_size=batch_size)
+
+
+    @classmethod
+    def get_clients(cls, owner:db_models.User, status:db_models.Status) -> list[ClientData]:
+        """Возвращает клиентов сотрудника в указанном статусе сразу в виде ClientData
+        (без ORM объектов и промежуточных словарей, значения приводятся к строке как в ClientData.from_dict)
+
+        Args:
+            owner (db_models.User): сотрудник владелец подачи
+            status (db_models.Status): статус записей
+
+        Returns:
+            list[ClientData]: клиенты
+        """
+        with Session(autoflush=False, bind=engine_read) as db:
+            return client_data_mapper.map(db.execute(
+                client_data_mapper.statement().where(and_(cls.status==status, cls.owner==owner))))
 
-        with Session(autoflush=False, bind=engine) as db:
-            if owner:
-                if status:
-                    filt = and_(cls.status==status, cls.owner==owner)
-                else:
-                    active_reg=cls.get_active_register(owner=owner,  project=project)
-                    if completed_processing:
-                        filt = and_(cls.rmc_register_num!=active_reg, cls.owner==owner) if active_reg \
-                            else cls.owner==owner
-
-                    else:
-                        filt = cls.rmc_register_num==active_reg
-
-            elif rmc_register_num:
-                filt = cls.rmc_register_num==rmc_register_num
-            else:
-                return None
-            result = []
-            if rows:=db.query(cls).filter(filt).all():
-                for row in rows:
-                    data = cls._row_to_dict(row)
-                    data.update(row.rmc_register_vars)
-                    data.pop('rmc_register_vars')
-                    result.append(data)
-                return result
 
-        
     @classmethod
     def get_action(cls, lawsuit_id:int|None=None, court_action_id:str|None=None) -> dict|None:
         """Возвращает записи из таблицы в формате словаря
@@ -209,14 +312,12 @@ class CourtActions(Base):
         """
         if not any([lawsuit_id, court_action_id]):
             return None
-        with Session(autoflush=False, bind=engine) as db:
-            if row:=db.query(cls).filter(
+        with Session(autoflush=False, bind=engine_read) as db:
+            mapper = cls._row_mapper()
+            if row:=db.execute(mapper.statement().where(
                         cls.lawsuit_id==lawsuit_id if lawsuit_id else \
-                                        cls.court_action_id==court_action_id ).first():
-                data = cls._row_to_dict(row)
-                data.update(row.rmc_register_vars)
-                data.pop('rmc_register_vars')
-                return data
+                                        cls.court_action_id==court_action_id ).limit(1)).first():
+                return mapper.map_row(row)
 
 
     @classmethod
@@ -229,15 +330,9 @@ class CourtActions(Base):
         Returns:
             list[dict]|None: список словарей где ключ - название поля
         """
-        with Session(autoflush=False, bind=engine) as db:
-            result = []
-            if rows:=db.query(cls).filter(cls.created_on>=date).all():
-                for row in rows:
-                    data = cls._row_to_dict(row)
-                    data.update(row.rmc_register_vars)
-                    data.pop('rmc_register_vars')
-                    result.append(data)
-            return result
+        with Session(autoflush=False, bind=engine_read) as db:
+            mapper = cls._row_mapper()
+            return mapper.map(db.execute(mapper.statement().where(cls.created_on>=date)))
     
 
     @classmethod
@@ -250,15 +345,166 @@ class CourtActions(Base):
         Returns:
             list[dict]|None: список словарей где ключ - название поля
         """
-        with Session(autoflush=False, bind=engine) as db:
-            result = []
-            if rows:=db.query(cls).filter(cls.updated_on>=date).all():
-                for row in rows:
-                    data = cls._row_to_dict(row)
-                    data.update(row.rmc_register_vars)
-                    data.pop('rmc_register_vars')
-                    result.append(data)
-            return result
+        with Session(autoflush=False, bind=engine_read) as db:
+            mapper = cls._row_mapper()
+            return mapper.map(db.execute(mapper.statement().where(cls.updated_on>=date)))
+
+
+    @classmethod
+    def iter_actions_from(cls, date:datetime.datetime,
+                          columns:Sequence[str]|None=None,
+                          batch_size:int=ITER_BATCH_SIZE) -> Iterator[dict]:
+        """Потоковый вариант get_actions_from
+
+        Args:
+            date (datetime.datetime): период с которого будут возвращены данные
+            columns (Sequence[str] | None, optional): выбираемые поля. Defaults to None - все поля.
+            batch_size (int): размер страницы
+
+        Yields:
+            dict: запись, ключ - название поля
+        """
+        yield from cls._iter_rows(engine_read, cls.created_on>=date, columns=columns, batch_size=batch_size)
+
+
+    @classmethod
+    def iter_actions_updated_after(cls, date:datetime.datetime,
+                                   columns:Sequence[str]|None=None,
+                                   batch_size:int=ITER_BATCH_SIZE) -> Iterator[dict]:
+        """Потоковый вариант get_actions_updated_after
+
+        Args:
+            date (datetime.datetime): период с которого будут возвращены данные
+            columns (Sequence[str] | None, optional): выбираемые поля. Defaults to None - все поля.
+            batch_size (int): размер страницы
+
+        Yields:
+            dict: запись, ключ - название поля
+        """
+        yield from cls._iter_rows(engine_read, cls.updated_on>=date, columns=columns, batch_size=batch_size)
+
+
+    @classmethod
+    def count_updated_after(cls, date:datetime.datetime, 
+                            bucket_format:str,
+                            utc_offset_hours:int=0) -> list[tuple[str, str, str, int]]:
+        """Количество записей, обновленных после даты date, в разрезе (owner, status, интервал)
+
+        Args:
+            date (datetime.datetime): период с которого считаются записи (UTC)
+            bucket_format (str): формат интервала strftime SQLite ('%H' - час, '%w' - день недели, '%d' - день месяца)
+            utc_offset_hours (int, optional): смещение местного времени от UTC. Defaults to 0.
+
+        Returns:
+            list[tuple[str, str, str, int]]: строки (owner, status, интервал, количество)
+        """
+        return cls._count_by_bucket(engine_read, cls.updated_on>=date, bucket_format=bucket_format,
+                                    utc_offset_hours=utc_offset_hours)
+
+    @classmethod
+    def count_rollup_after(cls, date:datetime.datetime, 
+                           bucket_format:str,
+                           utc_offset_hours:int=0) -> list[tuple[str, str, str, int]]:
+        """Количество записей (активных и архивных), обновленных после даты date, в разрезе (owner, status, интервал)
+        по почасовым количествам status_rollup_hourly, без чтения самих записей
+
+        Args:
+            date (datetime.datetime): период с которого считаются записи (UTC), округляется вниз до часа
+            bucket_format (str): формат интервала strftime SQLite ('%H' - час, '%w' - день недели, '%d' - день месяца)
+            utc_offset_hours (int, optional): смещение местного времени от UTC. Defaults to 0.
+
+        Returns:
+            list[tuple[str, str, str, int]]: строки (owner, status, интервал, количество)
+        """
+        c = status_rollup_hourly.c
+        bucket = func.strftime(bucket_format, c.hour_bucket, f'{utc_offset_hours:+d} hours').label('bucket')
+        query = select(c.owner, c.status, bucket, func.sum(c.count).label('count')
+                       ).where(c.hour_bucket>=date.strftime('%Y-%m-%d %H:00:00'), c.count!=0
+                               ).group_by(c.owner, c.status, bucket)
+        with Session(autoflush=False, bind=engine_read) as db:
+            return [tuple(row) for row in db.execute(query)]
+
+    
+    @classmethod
+    def changes_since(cls, cursor:int=0, 
+                      limit:int=ITER_BATCH_SIZE,
+                      owner:db_models.User|None=None,
+                      ) -> tuple[list[dict], int]:
+        """Смены статусов, записанные после курсора (журнал status_events)
+
+        Потребитель хранит возвращенный курсор и передает его в следующий вызов,
+        так он получает только новые события вместо повторного чтения таблиц.
+
+        Args:
+            cursor (int, optional): event_id последнего обработанного события. Defaults to 0 - с начала журнала.
+            limit (int, optional): максимальное количество событий за вызов. Defaults to ITER_BATCH_SIZE.
+            owner (db_models.User | None, optional): только события пользователя. Defaults to None - все.
+
+        Returns:
+            tuple[list[dict], int]: события (ключ - название поля) по возрастанию event_id и новый курсор
+        """
+        filt = status_events.c.event_id>cursor
+        if owner:
+            filt = and_(filt, status_events.c.owner==owner)
+        with Session(autoflush=False, bind=engine_read) as db:
+            rows = db.execute(select(status_events).where(filt)
+                              .order_by(status_events.c.event_id).limit(limit)).mappings().all()
+        events = [dict(row) for row in rows]
+        return events, events[-1]['event_id'] if events else cursor
+
+
+    @classmethod
+    def last_event_id(cls) -> int:
+        """Курсор последнего события журнала status_events (0 - журнал пуст)
+
+        Returns:
+            int: event_id последнего события
+        """
+        with Session(autoflush=False, bind=engine_read) as db:
+            return db.execute(select(func.max(status_events.c.event_id))).scalar() or 0
+
+
+    @classmethod
+    def count_events_since(cls, cursor:int=0) -> tuple[list[tuple[str, str, int]], int]:
+        """Количество смен статусов после курсора по сотруднику и новому статусу (журнал status_events),
+        события, добавленные миграцией 6 для существующих записей, не учитываются
+
+        Args:
+            cursor (int, optional): event_id последнего учтенного события. Defaults to 0 - с начала журнала.
+
+        Returns:
+            tuple[list[tuple[str, str, int]], int]: (сотрудник, новый статус, количество) и новый курсор
+        """
+        se = status_events.c
+        with Session(autoflush=False, bind=engine_read) as db:
+            #курсор сдвигается и за события миграции, чтобы не перечитывать их при следующем вызове
+            rows = db.execute(select(se.owner, se.new_status,
+                                     func.sum(case((se.seeded.is_(True), 0), else_=1)), func.max(se.event_id))
+                              .where(se.event_id>cursor).group_by(se.owner, se.new_status)).all()
+        return ([(owner, new_status, count) for owner, new_status, count, _ in rows if count],
+                max((last_id for *_, last_id in rows), default=cursor))
+
+
+    @classmethod
+    def iter_changes_since(cls, cursor:int=0,
+                           owner:db_models.User|None=None,
+                           batch_size:int=ITER_BATCH_SIZE) -> Iterator[dict]:
+        """Потоковый вариант changes_since: все события после курсора страницами по batch_size
+
+        Args:
+            cursor (int, optional): event_id последнего обработанного события. Defaults to 0.
+            owner (db_models.User | None, optional): только события пользователя. Defaults to None - все.
+            batch_size (int): размер страницы
+
+        Yields:
+            dict: событие, ключ - название поля
+        """
+        while True:
+            events, cursor = cls.changes_since(cursor=cursor, limit=batch_size, owner=owner)
+            yield from events
+            if len(events)<batch_size:
+                return
+
     
     @classmethod
     def get_active_register(cls, owner:db_models.User,
@@ -273,12 +519,20 @@ class CourtActions(Base):
         Returns:
             str|None: номер реестра РМЦ при наличии активной подачи, иначе None
         """
-        with Session(autoflush=False, bind=engine) as db:
-            filt = and_(cls.owner==owner, cls.project==project, 
-                            cls.status.not_in([db_models.Status.COMPLETED, db_models.Status.ERROR])) if project else \
-                    and_(cls.owner==owner, cls.status.not_in([db_models.Status.COMPLETED, db_models.Status.ERROR, db_models.Status.ERROR_RMC]))
-
-            if row:=db.query(cls).filter(filt).first():
+        with Session(autoflush=False, bind=engine_read) as db:
+            if project:
+                filt = and_(cls.owner==owner, cls.project==project, 
+                            cls.status.not_in([db_models.Status.COMPLETED, db_models.Status.ERROR]))
+                query = select(cls.rmc_register_num).where(filt).limit(1)
+            else:
+                #без проекта достаточно счетчиков register_counters
+                query = select(register_counters.c.rmc_register_num).where(
+                    register_counters.c.owner==owner,
+                    register_counters.c.status.not_in([db_models.Status.COMPLETED, db_models.Status.ERROR, 
+                                                       db_models.Status.ERROR_RMC]),
+                    register_counters.c.count>0).limit(1)
+
+            if row:=db.execute(query).first():
                 return str(row.rmc_register_num)
         return None
 
@@ -319,21 +573,108 @@ class CourtActions(Base):
                     'Итого':int,
             }
         """
-        with Session(autoflush=False, bind=engine) as db:
-            register_num = cls.get_active_register(owner=owner, project=project)
-            if not register_num:
-                return None
-            all_count = db.query(cls).filter(cls.rmc_register_num==register_num).count()
-            progress_struct=db.query(cls.status, func.count(cls.status).label('count')
-                                         ).filter(cls.rmc_register_num==register_num
-                                                  ).group_by(cls.status).all()
-            progress_structure = {row.status:row.count for row in progress_struct}
-            progress_structure_extend = {str(i):0 for i in db_models.Status}
-            progress_structure_extend.update(progress_structure)
-            progress_structure_extend.update({'Итого':all_count})
-            return progress_structure_extend
+        register_num = cls.get_active_register(owner=owner, project=project)
+        if not register_num:
+            return None
+        with Session(autoflush=False, bind=engine_read) as db:
+            progress_struct=db.execute(
+                select(register_counters.c.status, func.sum(register_counters.c.count).label('count')
+                       ).where(register_counters.c.rmc_register_num==register_num
+                               ).group_by(register_counters.c.status)).all()
+        progress_structure = {row.status:row.count for row in progress_struct if row.count}
+        progress_structure_extend = {str(i):0 for i in db_models.Status}
+        progress_structure_extend.update(progress_structure)
+        progress_structure_extend.update({'Итого':sum(progress_structure.values())})
+        return progress_structure_extend
+
+
+    @classmethod
+    def get_registers_state(cls, owners:Sequence[db_models.User],
+                            last_completed:int=51) -> dict[str, dict]:
+        """Состояние активных реестров сразу по списку сотрудников (карточки /getstate):
+        количества берутся из счетчиков register_counters, время завершения последних подач - 
+        одним запросом с оконной функцией по всем реестрам
+
+        Args:
+            owners (Sequence[db_models.User]): сотрудники
+            last_completed (int, optional): сколько последних времен завершения вернуть по реестру. Defaults to 51.
+
+        Returns:
+            dict[str, dict]: ключ - сотрудник с активным реестром, значение - {
+                    'rmc_register_num':str,
+                    'project':str|None,
+                    'in_queue':int,                 #подачи не в конечном статусе
+                    'completed':int,                #подачи в статусе "Завершено"
+                    'completed_times':list[datetime.datetime],  #последние времена завершения по возрастанию
+            }
+        """
+        final_statuses = [db_models.Status.COMPLETED, db_models.Status.ERROR, db_models.Status.ERROR_RMC]
+        rc = register_counters.c
+        #активный реестр сотрудника - как в get_active_register (первый по ключу счетчиков)
+        active = select(rc.owner, func.min(rc.rmc_register_num).label('rmc_register_num')
+                        ).where(rc.owner.in_(owners), rc.status.not_in(final_statuses), rc.count>0
+                                ).group_by(rc.owner).subquery()
+        project = select(cls.project).where(cls.rmc_register_num==active.c.rmc_register_num
+                                             ).limit(1).scalar_subquery()
+        registers_query = select(
+            active.c.owner, active.c.rmc_register_num, project.label('project'),
+            func.sum(case((rc.status.not_in(final_statuses), rc.count), else_=0)).label('in_queue'),
+            func.sum(case((rc.status==db_models.Status.COMPLETED, rc.count), else_=0)).label('completed'),
+            ).join(register_counters, rc.rmc_register_num==active.c.rmc_register_num
+                   ).group_by(active.c.owner, active.c.rmc_register_num)
+
+        with Session(autoflush=False, bind=engine_read) as db:
+            registers = {row.owner: {'rmc_register_num': row.rmc_register_num,
+                                     'project': row.project,
+                                     'in_queue': row.in_queue,
+                                     'completed': row.completed,
+                                     'completed_times': []} for row in db.execute(registers_query)}
+            if not registers:
+                return registers
+            by_register = defaultdict(list)
+            for owner, state in registers.items():
+                by_register[state['rmc_register_num']].append(state)
+            ranked = select(cls.rmc_register_num, cls.date_uploaded_docs_on_gas,
+                            func.row_number().over(partition_by=cls.rmc_register_num,
+                                                   order_by=cls.date_uploaded_docs_on_gas.desc()).label('rn'),
+                            ).where(cls.rmc_register_num.in_(list(by_register)),
+                                    cls.status==db_models.Status.COMPLETED,
+                                    cls.date_uploaded_docs_on_gas.is_not(None)).subquery()
+            for row in db.execute(select(ranked.c.rmc_register_num, ranked.c.date_uploaded_docs_on_gas
+                                         ).where(ranked.c.rn<=last_completed
+                                                 ).order_by(ranked.c.rmc_register_num, ranked.c.date_uploaded_docs_on_gas)):
+                for state in by_register[row.rmc_register_num]:
+                    state['completed_times'].append(row.date_uploaded_docs_on_gas)
+        return registers
         
     
+    @staticmethod
+    def _status_values(status:db_models.Status,
+                       result_number:str|None=None,
+                       error_msg:str|None=None,
+                       date_and_time_gus:str|None=None,
+                       ) -> dict:
+        """Значения полей, которые меняются вместе со статусом 
+        (правила описаны в change_status)
+
+        Returns:
+            dict: ключ - название поля, значение - новое значение поля
+        """
+        values = {'status': status}
+        if status==db_models.Status.COMPLETED:
+            values['date_uploaded_docs_on_gas']=datetime.datetime.strptime(date_and_time_gus, "%d.%m.%Y %H:%M:%S")
+            if result_number:
+                values['result_number']=result_number
+        elif status==db_models.Status.DOCS_FORMED:
+            values['package_of_docs_checked']=True
+        elif status==db_models.Status.DOCS_ADDED:
+            values['missing_docs_added']=True
+        elif status==db_models.Status.ERROR or status==db_models.Status.ERROR_RMC:
+            if error_msg:
+                values['error_msg']=error_msg
+        return values
+
+
     @classmethod
     def change_status(cls, status:db_models.Status, 
                       court_action_id:int|None=None, 
@@ -365,63 +706,219 @@ class CourtActions(Base):
             filt = cls.court_action_id==court_action_id if court_action_id else \
                                                         cls.lawsuit_id==lawsuit_id
             if row:=db.query(cls).filter(filt).first():
-                row.status = status
-                if status==db_models.Status.COMPLETED:
-                    row.date_uploaded_docs_on_gas=datetime.datetime.strptime(date_and_time_gus, "%d.%m.%Y %H:%M:%S")
-                    row.result_number=result_number if result_number else row.result_number
-                elif status==db_models.Status.DOCS_FORMED:
-                    row.package_of_docs_checked=True
-                elif status==db_models.Status.DOCS_ADDED:
-                    row.missing_docs_added=True
-                elif status==db_models.Status.ERROR or status==db_models.Status.ERROR_RMC:
-                    row.error_msg=error_msg if error_msg else row.error_msg
+                for key, val in cls._status_values(status=status, result_number=result_number, 
+                                                   error_msg=error_msg, date_and_time_gus=date_and_time_gus).items():
+                    setattr(row, key, val)
                 db.commit()
                 return True
             return False
+
+
+    @classmethod
+    def change_status_many(cls, status:db_models.Status,
+                           lawsuit_ids:list[int|str],
+                           result_number:str|None=None,
+                           error_msg:str|None=None,
+                           date_and_time_gus:str|None=None,
+                           ) -> int:
+        """Меняет статус группы записей по lawsuit_id одним UPDATE в одной транзакции,
+        поля меняются по тем же правилам что и в change_status
+
+        Args:
+            status (db_models.Status): статус на который будет смена
+            lawsuit_ids (list[int|str]): id записей из РМЦ
+            result_number (str): номер полученный с ГАС
+            error_msg (str): текст ошибки
+
+        Returns:
+            int: количество измененных записей
+        """
+        if not lawsuit_ids:
+            return 0
+        values = cls._status_values(status=status, result_number=result_number,
+                                    error_msg=error_msg, date_and_time_gus=date_and_time_gus)
+        lawsuit_ids = list(lawsuit_ids)
+        changed = 0
+        with Session(autoflush=False, bind=engine) as db:
+            #разбиваем список, чтобы не упереться в лимит параметров SQLite
+            for i in range(0, len(lawsuit_ids), SQLITE_MAX_PARAMS):
+                result = db.execute(
+                    update(cls).where(cls.lawsuit_id.in_(lawsuit_ids[i:i+SQLITE_MAX_PARAMS])).values(**values),
+                    execution_options={'synchronize_session': False}
+                )
+                changed += result.rowcount
+            db.commit()
+        return changed
     
     
+    @classmethod
+    def _move_to_archive(cls, filt, chunk_size:int=SQLITE_MAX_PARAMS) -> int:
+        """Переносит записи, попадающие под фильтр, в архивную базу пачками по chunk_size
+        без загрузки строк в python: архивная база подключается через ATTACH DATABASE,
+        перенос делается INSERT ... SELECT, удаление - DELETE по id пачки.
+
+        В режиме WAL SQLite не гарантирует атомарность транзакции сразу по двум файлам базы,
+        поэтому каждая пачка проходит две короткие транзакции: сначала запись в архив, затем удаление
+        из основной базы только тех строк, которые уже есть в архиве. При сбое между ними строки
+        останутся в обеих базах, повторный запуск не создаст дублей в архиве (NOT EXISTS по court_action_id)
+        и довершит удаление, потерять строку при этом нельзя.
+
+        Args:
+            filt: условие отбора записей (выражение SqlAlchemy по полям CourtActions)
+            chunk_size (int): размер пачки
+
+        Returns:
+            int: количество перенесенных записей
+        """
+        columns = ', '.join(col.name for col in CourtActionsArchive.__table__.columns
+                            if col.name!='id' and col.name in cls.__table__.columns)
+        insert_chunk = text(f"""
+            INSERT INTO archive.court_actions_archive ({columns})
+            SELECT {columns} FROM main.court_actions AS ca
+            WHERE ca.id IN :ids AND NOT EXISTS (
+                SELECT 1 FROM archive.court_actions_archive AS arc WHERE arc.court_action_id IS ca.court_action_id)
+        """).bindparams(bindparam('ids', expanding=True))
+        delete_chunk = text("""
+            DELETE FROM main.court_actions
+            WHERE id IN :ids AND EXISTS (
+                SELECT 1 FROM archive.court_actions_archive AS arc
+                WHERE arc.court_action_id IS main.court_actions.court_action_id)
+        """).bindparams(bindparam('ids', expanding=True))
+
+        moved = 0
+        with engine.connect() as conn:
+            conn.execute(text("ATTACH DATABASE :path AS archive"), {'path': str(ARCHIVE_DB_PATH)})
+            try:
+                last_id = 0
+                while ids:=conn.execute(
+                        select(cls.id).where(and_(filt, cls.id>last_id)).order_by(cls.id).limit(chunk_size)
+                        ).scalars().all():
+                    last_id = ids[-1]
+                    conn.execute(insert_chunk, {'ids': ids})
+                    conn.commit()
+                    moved += conn.execute(delete_chunk, {'ids': ids}).rowcount
+                    conn.commit()
+            finally:
+                conn.rollback()
+                conn.execute(text("DETACH DATABASE archive"))
+        return moved
+
+
+    @classmethod
+    def _active_registers(cls):
+        """Подзапрос: номера реестров, по которым еще идет подача (есть записи не в конечном статусе)"""
+        return select(cls.rmc_register_num).where(
+            cls.rmc_register_num.is_not(None),
+            cls.status.not_in([db_models.Status.COMPLETED, db_models.Status.ERROR, db_models.Status.ERROR_RMC])
+            ).distinct()
+
+
     @classmethod
     def _flush_to_archive(cls, owner:db_models.User) -> int|None:
-        """Перемещает данные по сотруднику в архивную таблицу 
+        """Перемещает данные по сотруднику в архивную таблицу (кроме активного реестра)
 
         Args:
-            rows (_type_): строки которые будут перемещены
+            owner (db_models.User): сотрудник владелец подачи
 
         Returns:
-            int: количество пперемещенных строк
+            int: количество перемещенных строк
         """
         active_register = cls.get_active_register(owner=owner)
-        with Session(autoflush=False, bind=engine) as db:
-            filt = and_(cls.owner==owner, cls.rmc_register_num!=active_register) if active_register else (cls.owner==owner)
-            if rows:=db.query(cls).filter(filt).all():
-                cnt_del = CourtActionsArchive.bulk_input(rows)
-                for row in rows:
-                    db.delete(row)
-                db.commit()
-                return cnt_del
+        filt = and_(cls.owner==owner, cls.rmc_register_num!=active_register) if active_register else (cls.owner==owner)
+        return cls._move_to_archive(filt) or None
 
 
-                
+    @classmethod
+    def archive_register(cls, rmc_register_num:str, chunk_size:int=SQLITE_MAX_PARAMS) -> int:
+        """Перемещает в архив весь реестр, если по нему не идет подача
+
+        Args:
+            rmc_register_num (str): номер реестра РМЦ
+            chunk_size (int): размер пачки
 
-#триггер для создания id подачи
-trigger_court_actions = DDL("""
-    CREATE TRIGGER set_court_actions_id_after_insert 
-    AFTER INSERT ON court_actions
-    FOR EACH ROW
-    WHEN NEW.court_action_id IS NULL
-    BEGIN
-        UPDATE court_actions SET court_action_id = 'CA-' || unixepoch(created_on) ||'-'|| NEW.id  WHERE id = NEW.id;
-    END;
-""")
-event.listen(CourtActions.__table__, 'after_create', trigger_court_actions)
+        Returns:
+            int: количество перемещенных строк
+        """
+        filt = and_(cls.rmc_register_num==rmc_register_num, cls.rmc_register_num.not_in(cls._active_registers()))
+        return cls._move_to_archive(filt, chunk_size=chunk_size)
 
 
+    @classmethod
+    def archive_period(cls, date_from:datetime.datetime|None=None, 
+                       date_to:datetime.datetime|None=None,
+                       chunk_size:int=SQLITE_MAX_PARAMS) -> int:
+        """Перемещает в архив записи, созданные в периоде [date_from, date_to),
+        реестры, по которым еще идет подача, не затрагиваются
+
+        Args:
+            date_from (datetime.datetime | None, optional): начало периода. Defaults to None - без ограничения.
+            date_to (datetime.datetime | None, optional): конец периода. Defaults to None - без ограничения.
+            chunk_size (int): размер пачки
+
+        Returns:
+            int: количество перемещенных строк
+        """
+        filt = cls.rmc_register_num.not_in(cls._active_registers())
+        if date_from:
+            filt = and_(filt, cls.created_on>=date_from)
+        if date_to:
+            filt = and_(filt, cls.created_on<date_to)
+        return cls._move_to_archive(filt, chunk_size=chunk_size)
+
+
+                
+#счетчики записей court_actions по (сотрудник, реестр, статус), 
+#таблица и поддерживающие ее триггеры создаются миграцией 5, пересчет - python -m database.counters
+register_counters = Table(
+    'register_counters', Base.metadata,
+    Column('owner', String, primary_key=True),                 #пользователь, от кого подаём
+    Column('rmc_register_num', String, primary_key=True),      #номер реестра РМЦ
+    Column('status', String, primary_key=True),                #статус подачи
+    Column('count', Integer),                                  #количество записей
+)
+
+#журнал смены статусов court_actions (только добавление), заполняется триггерами миграции 6,
+#event_id монотонно растет и служит курсором для CourtActions.changes_since
+status_events = Table(
+    'status_events', Base.metadata,
+    Column('event_id', Integer, primary_key=True),             #номер события
+    Column('lawsuit_id', Integer),                             #id подачи РМЦ
+    Column('owner', String),                                   #пользователь, от кого подаём
+    Column('rmc_register_num', String),                        #номер реестра РМЦ
+    Column('old_status', String),                              #прежний статус, None - запись добавлена
+    Column('new_status', String),                              #новый статус
+    Column('ts', DateTime),                                    #время смены статуса (UTC, как updated_on)
+    Column('seeded', Boolean),                                 #событие добавлено миграцией 6 для существующей записи
+)
+
+#количества записей court_actions по (час updated_on, сотрудник, статус) для истории подач,
+#поддерживаются триггерами миграции 7, архив досчитывается python -m database.rollup
+status_rollup_hourly = Table(
+    'status_rollup_hourly', Base.metadata,
+    Column('hour_bucket', String, primary_key=True),           #час в UTC, 'YYYY-MM-DD HH:00:00'
+    Column('owner', String, primary_key=True),                 #пользователь, от кого подаём
+    Column('status', String, primary_key=True),                #статус подачи
+    Column('count', Integer),                                  #количество записей
+)
+
+#служебные отметки заполнения status_rollup_hourly
+rollup_state = Table(
+    'rollup_state', Base.metadata,
+    Column('name', String, primary_key=True),                  #название отметки
+    Column('value', String),                                   #значение
+)
 
 # создаем движок SqlAlchemy
-engine = create_engine(fr"sqlite:///{DATABASE_DIR}/CourtActions.db")
+# таблицы, индексы и триггеры создаются миграциями (python -m database.migrations)
+engine = create_sqlite_engine(COURT_ACTIONS_DB_PATH)
 
-# создаем таблицы
-CourtActions.__table__.create(engine, checkfirst=True)
+# движок только для чтения (методы get_*, веб-интерфейс)
+engine_read = create_sqlite_engine(COURT_ACTIONS_DB_PATH, read_only=True)
+
+# отображение строк court_actions в ClientData (порядок столбцов совпадает с порядком полей ClientData)
+_client_data_columns = [CourtActions.__table__.c[field] for field in ClientData.__dataclass_fields__]
+client_data_mapper = RowMapper(_client_data_columns, record=ClientData,
+                               converters=str_converters(_client_data_columns))
 
 
 class CourtActionsArchive(Base):
@@ -432,7 +929,27 @@ class CourtActionsArchive(Base):
     lawsuit_id = Column(Integer)                        #id подачи РМЦ
     status = Column(String)                             #статус подачи
     rmc_register_num = Column(String)                   #номер реестра РМЦ
-    rmc_register_vars = Column(JSON)                    #параметры из реестра
+    register_id = Column(Integer)                       #id реестра РМЦ
+    court_name = Column(String)                         #наименование суда
+    region_name = Column(String)                        #регион суда
+    client_last_name = Column(String)                   #фамилия
+    client_first_name = Column(String)                  #имя
+    client_father_name = Column(String)                 #отчество
+    client_birthday = Column(String)                    #дата рождения
+    client_gender = Column(String)                      #пол
+    client_birth_place = Column(String)                 #место рождения
+    client_series = Column(String)                      #серия паспорта
+    client_number = Column(String)                      #номер паспорта
+    client_issue_on = Column(String)                    #дата выдачи паспорта
+    client_issue_by = Column(String)                    #кем выдан паспорт
+    client_code = Column(String)                        #код подразделения
+    client_snils = Column(String)                       #СНИЛС
+    client_inn = Column(String)                         #ИНН
+    client_registration_index = Column(String)          #индекс адреса регистрации
+    client_reg_address = Column(String)                 #адрес регистрации
+    client_actual_index = Column(String)                #индекс фактического адреса
+    client_actual_address = Column(String)              #фактический адрес
+    client_phone = Column(String)                       #телефон
     owner = Column(String)                              #пользователь, от кого подаём
     project = Column(String)                            #проект
     activity_type = Column(String)                      #тип активности (Индексация/Обычная подача/Парсинг ГАС)
@@ -455,27 +972,8 @@ class CourtActionsArchive(Base):
             int: количество новых строк
         """
         with Session(autoflush=False, bind=engine_archive) as db:
-            new_rows = []
-            for old_row in data:
-                new_rows.append(
-                    cls(
-                        court_action_id = old_row.court_action_id,
-                        lawsuit_id = old_row.lawsuit_id,
-                        status = old_row.status,
-                        rmc_register_num = old_row.rmc_register_num,
-                        rmc_register_vars = old_row.rmc_register_vars,
-                        owner = old_row.owner,
-                        project = old_row.project,
-                        activity_type = old_row.activity_type,
-                        package_of_docs_checked = old_row.package_of_docs_checked,
-                        missing_docs_added = old_row.missing_docs_added,
-                        date_uploaded_docs_on_gas = old_row.date_uploaded_docs_on_gas,
-                        result_number = old_row.result_number,
-                        error_msg = old_row.error_msg,
-                        created_on = old_row.created_on,
-                        updated_on = old_row.updated_on
-                        )
-                )
+            columns = [col.name for col in cls.__table__.columns if col.name!='id']
+            new_rows = [cls(**{col: getattr(old_row, col) for col in columns}) for old_row in data]
             db.bulk_save_objects(new_rows)
             db.commit()
             return len(data)
@@ -494,14 +992,12 @@ class CourtActionsArchive(Base):
         """
         if not any([lawsuit_id, court_action_id]):
             return None
-        with Session(autoflush=False, bind=engine_archive) as db:
-            if row:=db.query(cls).filter(
+        with Session(autoflush=False, bind=engine_archive_read) as db:
+            mapper = cls._row_mapper()
+            if row:=db.execute(mapper.statement().where(
                         cls.lawsuit_id==lawsuit_id if lawsuit_id else \
-                                        cls.court_action_id==court_action_id ).first():
-                data = cls._row_to_dict(row)
-                data.update(row.rmc_register_vars)
-                data.pop('rmc_register_vars')
-                return data
+                                        cls.court_action_id==court_action_id ).limit(1)).first():
+                return mapper.map_row(row)
 
 
     @classmethod
@@ -514,15 +1010,9 @@ class CourtActionsArchive(Base):
         Returns:
             list[dict]|None: список словарей где ключ - название поля
         """
-        with Session(autoflush=False, bind=engine_archive) as db:
-            result = []
-            if rows:=db.query(cls).filter(cls.created_on>=date).all():
-                for row in rows:
-                    data = cls._row_to_dict(row)
-                    data.update(row.rmc_register_vars)
-                    data.pop('rmc_register_vars')
-                    result.append(data)
-            return result
+        with Session(autoflush=False, bind=engine_archive_read) as db:
+            mapper = cls._row_mapper()
+            return mapper.map(db.execute(mapper.statement().where(cls.created_on>=date)))
 
 
     @classmethod
@@ -535,15 +1025,61 @@ class CourtActionsArchive(Base):
         Returns:
             list[dict]|None: список словарей где ключ - название поля
         """
-        with Session(autoflush=False, bind=engine_archive) as db:
-            result = []
-            if rows:=db.query(cls).filter(cls.updated_on>=date).all():
-                for row in rows:
-                    data = cls._row_to_dict(row)
-                    data.update(row.rmc_register_vars)
-                    data.pop('rmc_register_vars')
-                    result.append(data)
-            return result
+        with Session(autoflush=False, bind=engine_archive_read) as db:
+            mapper = cls._row_mapper()
+            return mapper.map(db.execute(mapper.statement().where(cls.updated_on>=date)))
+
+
+    @classmethod
+    def iter_actions_from(cls, date:datetime.datetime,
+                          columns:Sequence[str]|None=None,
+                          batch_size:int=ITER_BATCH_SIZE) -> Iterator[dict]:
+        """Потоковый вариант get_actions_from
+
+        Args:
+            date (datetime.datetime): период с которого будут возвращены данные
+            columns (Sequence[str] | None, optional): выбираемые поля. Defaults to None - все поля.
+            batch_size (int): размер страницы
+
+        Yields:
+            dict: запись, ключ - название поля
+        """
+        yield from cls._iter_rows(engine_archive_read, cls.created_on>=date, columns=columns, batch_size=batch_size)
+
+
+    @classmethod
+    def iter_actions_updated_after(cls, date:datetime.datetime,
+                                   columns:Sequence[str]|None=None,
+                                   batch_size:int=ITER_BATCH_SIZE) -> Iterator[dict]:
+        """Потоковый вариант get_actions_updated_after
+
+        Args:
+            date (datetime.datetime): период с которого будут возвращены данные
+            columns (Sequence[str] | None, optional): выбираемые поля. Defaults to None - все поля.
+            batch_size (int): размер страницы
+
+        Yields:
+            dict: запись, ключ - название поля
+        """
+        yield from cls._iter_rows(engine_archive_read, cls.updated_on>=date, columns=columns, batch_size=batch_size)
+
+
+    @classmethod
+    def count_updated_after(cls, date:datetime.datetime, 
+                            bucket_format:str,
+                            utc_offset_hours:int=0) -> list[tuple[str, str, str, int]]:
+        """Количество записей, обновленных после даты date, в разрезе (owner, status, интервал)
+
+        Args:
+            date (datetime.datetime): период с которого считаются записи (UTC)
+            bucket_format (str): формат интервала strftime SQLite ('%H' - час, '%w' - день недели, '%d' - день месяца)
+            utc_offset_hours (int, optional): смещение местного времени от UTC. Defaults to 0.
+
+        Returns:
+            list[tuple[str, str, str, int]]: строки (owner, status, интервал, количество)
+        """
+        return cls._count_by_bucket(engine_archive_read, cls.updated_on>=date, bucket_format=bucket_format,
+                                    utc_offset_hours=utc_offset_hours)
 
 
     @classmethod
@@ -557,19 +1093,31 @@ class CourtActionsArchive(Base):
         Returns:
             list[dict]|None: список словарей где ключ - название поля
         """
-        with Session(autoflush=False, bind=engine_archive) as db:
+        with Session(autoflush=False, bind=engine_archive_read) as db:
             filt = cls.rmc_register_num==rmc_register_num
-            result = []
-            if rows:=db.query(cls).filter(filt).all():
-                for row in rows:
-                    data = cls._row_to_dict(row)
-                    data.update(row.rmc_register_vars)
-                    data.pop('rmc_register_vars')
-                    result.append(data)
-                return result
+            mapper = cls._row_mapper()
+            if rows:=db.execute(mapper.statement().where(filt)).all():
+                return mapper.map(rows)
 
-# создаем движок SqlAlchemy
-engine_archive = create_engine(fr"sqlite:///{DATABASE_DIR}/ArchiveCourtActions.db")
 
-# создаем таблицы
-CourtActionsArchive.__table__.create(engine_archive, checkfirst=True)
\ No newline at end of file
+    @classmethod
+    def iter_actions_from_register(cls, rmc_register_num:str,
+                                   columns:Sequence[str]|None=None,
+                                   batch_size:int=ITER_BATCH_SIZE) -> Iterator[dict]:
+        """Потоковый вариант get_actions_from_register
+
+        Args:
+            rmc_register_num (str): номер реестра РМЦ
+            columns (Sequence[str] | None, optional): выбираемые поля. Defaults to None - все поля.
+            batch_size (int): размер страницы
+
+        Yields:
+            dict: запись, ключ - название поля
+        """
+        yield from cls._iter_rows(engine_archive_read, cls.rmc_register_num==rmc_register_num,
+                                  columns=columns, batch_size=batch_size)
+
+# создаем движок SqlAlchemy
+# таблицы и индексы создаются миграциями (python -m database.migrations)
+engine_archive = create_sqlite_engine(ARCHIVE_DB_PATH)
+engine_archive_read = create_sqlite_engine(ARCHIVE_DB_PATH, read_only=True)
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""Общая фабрика подключений к базам SQLite проекта
+
+Все пути доступа к CourtActions.db/ArchiveCourtActions.db (движки SqlAlchemy и "сырые" sqlite3 соединения
+скриптов перезапуска) должны создаваться здесь, чтобы у каждого соединения были одинаковые настройки:
+WAL (чтение не блокирует запись), synchronous=NORMAL, ожидание блокировки вместо ошибки "database is locked",
+mmap и увеличенный кэш страниц.
+"""
+import os
+import sqlite3
+from pathlib import Path
+
+from sqlalchemy import Engine, create_engine, event
+
+from .base.orm_base import DATABASE_DIR
+
+COURT_ACTIONS_DB_PATH = Path(DATABASE_DIR) / "CourtActions.db"
+ARCHIVE_DB_PATH = Path(DATABASE_DIR) / "ArchiveCourtActions.db"
+
+#время ожидания снятия блокировки другим процессом, секунды
+BUSY_TIMEOUT = 30
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',                  #читатели не блокируют писателя и наоборот
+    'synchronous': 'NORMAL',                #в режиме WAL безопасно, fsync только на checkpoint
+    'busy_timeout': BUSY_TIMEOUT * 1000,    #мс
+    'mmap_size': 256 * 1024 * 1024,         #байт
+    'cache_size': -64 * 1024,               #отрицательное значение - размер в КиБ
+}
+
+
+def apply_pragmas(conn:sqlite3.Connection, read_only:bool=False) -> None:
+    """Применяет настройки SQLITE_PRAGMAS к соединению
+
+    Args:
+        conn (sqlite3.Connection): соединение
+        read_only (bool): соединение только для чтения (PRAGMA query_only),
+                          режим журнала такое соединение не меняет
+    """
+    cursor = conn.cursor()
+    for pragma, value in SQLITE_PRAGMAS.items():
+        if read_only and pragma=='journal_mode':
+            continue
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def connect_sqlite(path:str|os.PathLike, read_only:bool=False,
+                   check_same_thread:bool=True) -> sqlite3.Connection:
+    """Открывает "сырое" sqlite3 соединение с настройками проекта
+
+    Args:
+        path (str | os.PathLike): путь до файла базы
+        read_only (bool): соединение только для чтения
+        check_same_thread (bool): False - соединение используется несколькими потоками
+                                  (доступ к нему нужно синхронизировать самостоятельно)
+
+    Returns:
+        sqlite3.Connection: соединение
+    """
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=check_same_thread)
+    apply_pragmas(conn, read_only=read_only)
+    return conn
+
+
+def create_sqlite_engine(path:str|os.PathLike, read_only:bool=False) -> Engine:
+    """Создает движок SqlAlchemy с настройками проекта
+
+    Args:
+        path (str | os.PathLike): путь до файла базы
+        read_only (bool): движок только для чтения (для веб-интерфейса и отчетов)
+
+    Returns:
+        Engine: движок
+    """
+    engine = create_engine(fr"sqlite:///{path}", connect_args={'timeout': BUSY_TIMEOUT})
+
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, read_only=read_only)
+
+    return engine
@@ -0,0 +1,163 @@
+"""Поиск подач по lawsuit_id сразу в CourtActions.db и ArchiveCourtActions.db
+
+Соединения движка engine_lookup подключают архивную базу через ATTACH DATABASE и создают
+временное представление lawsuit_states (UNION ALL court_actions и court_actions_archive),
+поэтому поиск - один запрос по индексам lawsuit_id обеих таблиц.
+
+Подачи в конечных статусах (TERMINAL_STATUSES) кэшируются в LRU. Запись удаляется из кэша,
+если по подаче в журнале status_events появилось новое событие (например перезапуск подачи с ошибкой),
+журнал читается по курсору перед каждым поиском.
+"""
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+from sqlalchemy import bindparam, event, text
+
+from models import db_models
+
+from .database import SQLITE_MAX_PARAMS, CourtActions
+from .engine import ARCHIVE_DB_PATH, COURT_ACTIONS_DB_PATH, create_sqlite_engine
+
+#статусы, которые не меняются без события в status_events
+TERMINAL_STATUSES = frozenset({db_models.Status.COMPLETED, db_models.Status.ERROR, db_models.Status.ERROR_RMC})
+
+#поля подачи, возвращаемые поиском
+LOOKUP_COLUMNS = (
+    'lawsuit_id',
+    'status',
+    'error_msg',
+    'result_number',
+    'client_last_name',
+    'client_first_name',
+    'client_father_name',
+)
+
+#размер LRU кэша подач в конечных статусах
+LOOKUP_CACHE_SIZE = 50_000
+
+
+def _on_connect(dbapi_connection, connection_record) -> None:
+    """Подключает архивную базу и создает представление lawsuit_states,
+    после чего соединение переводится в режим только для чтения
+    """
+    columns = ', '.join(LOOKUP_COLUMNS)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("ATTACH DATABASE ? AS archive", (str(ARCHIVE_DB_PATH),))
+    #source: 0 - активная база, 1 - архив (во время переноса строка может быть в обеих базах)
+    cursor.execute(f"""
+        CREATE TEMP VIEW IF NOT EXISTS lawsuit_states AS
+        SELECT 0 AS source, {columns} FROM main.court_actions
+        UNION ALL
+        SELECT 1 AS source, {columns} FROM archive.court_actions_archive
+    """)
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+# движок поиска: настройки проекта + ATTACH архива и представление lawsuit_states
+# (PRAGMA query_only запрещает и временные объекты, поэтому включается после создания представления)
+engine_lookup = create_sqlite_engine(COURT_ACTIONS_DB_PATH)
+event.listen(engine_lookup, 'connect', _on_connect)
+
+_select_states = text(f"""
+    SELECT {', '.join(LOOKUP_COLUMNS)} FROM lawsuit_states
+    WHERE lawsuit_id IN :ids
+    ORDER BY source DESC
+""").bindparams(bindparam('ids', expanding=True))
+
+
+class LawsuitLookup:
+    """Поиск подач по lawsuit_id в активной и архивной базе с LRU кэшем конечных статусов
+
+    Args:
+        maxsize (int): максимальное количество подач в кэше
+    """
+
+    def __init__(self, maxsize:int=LOOKUP_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._cache: OrderedDict[int, dict] = OrderedDict()
+        self._cursor: int|None = None
+        self._lock = threading.Lock()
+
+
+    def _invalidate(self) -> None:
+        """Удаляет из кэша подачи, по которым после курсора были смены статуса"""
+        if self._cursor is None:
+            #кэш пуст, читать журнал с начала не нужно
+            self._cursor = CourtActions.last_event_id()
+            return
+        for change in CourtActions.iter_changes_since(cursor=self._cursor):
+            self._cache.pop(change['lawsuit_id'], None)
+            self._cursor = change['event_id']
+
+
+    def _fetch(self, lawsuit_ids:list[int]) -> dict[int, dict]:
+        """Читает подачи из представления lawsuit_states пачками по SQLITE_MAX_PARAMS
+
+        Returns:
+            dict[int, dict]: ключ - lawsuit_id, значение - поля LOOKUP_COLUMNS
+        """
+        found = {}
+        with engine_lookup.connect() as conn:
+            for idx in range(0, len(lawsuit_ids), SQLITE_MAX_PARAMS):
+                #строки архива идут первыми, чтобы при дубле осталась строка активной базы
+                for row in conn.execute(_select_states, {'ids': lawsuit_ids[idx:idx+SQLITE_MAX_PARAMS]}):
+                    found[row.lawsuit_id] = dict(row._mapping)
+        return found
+
+
+    def get_many(self, lawsuit_ids:Iterable[int]) -> dict[int, dict|None]:
+        """Поиск подач по списку lawsuit_id
+
+        Args:
+            lawsuit_ids (Iterable[int]): id подач РМЦ
+
+        Returns:
+            dict[int, dict|None]: ключ - lawsuit_id, значение - поля LOOKUP_COLUMNS или None, если подача не найдена
+        """
+        lawsuit_ids = list(dict.fromkeys(lawsuit_ids))
+        with self._lock:
+            self._invalidate()
+            result = {}
+            for lawsuit_id in lawsuit_ids:
+                if (cached:=self._cache.get(lawsuit_id)) is not None:
+                    self._cache.move_to_end(lawsuit_id)
+                result[lawsuit_id] = cached
+            cursor = self._cursor
+
+        missing = [lawsuit_id for lawsuit_id, cached in result.items() if cached is None]
+        if not missing:
+            return result
+        found = self._fetch(missing)
+        result.update((lawsuit_id, found.get(lawsuit_id)) for lawsuit_id in missing)
+
+        with self._lock:
+            #за время чтения курсор мог сдвинуться, тогда прочитанное значение могло устареть
+            if cursor==self._cursor:
+                for lawsuit_id, lawsuit in found.items():
+                    if lawsuit['status'] in TERMINAL_STATUSES:
+                        self._cache[lawsuit_id] = lawsuit
+                        self._cache.move_to_end(lawsuit_id)
+                while len(self._cache)>self.maxsize:
+                    self._cache.popitem(last=False)
+        return result
+
+
+    def get(self, lawsuit_id:int) -> dict|None:
+        """Поиск подачи по lawsuit_id
+
+        Args:
+            lawsuit_id (int): id подачи РМЦ
+
+        Returns:
+            dict|None: поля LOOKUP_COLUMNS или None, если подача не найдена
+        """
+        return self.get_many([lawsuit_id])[lawsuit_id]
+
+
+    def clear(self) -> None:
+        """Очищает кэш"""
+        with self._lock:
+            self._cache.clear()
+            self._cursor = None
@@ -0,0 +1,286 @@
+"""Метрики процессов подачи в общем локальном хранилище Metrics.db (экспорт в формате Prometheus - /metrics)
+
+Каждый процесс (dispatcher, подача, веб-сервер) копит приращения в памяти, фоновый поток раз в FLUSH_INTERVAL
+секунд (и процесс при завершении) добавляет их в metric_values одной транзакцией:
+UPSERT value = value + приращение. Так процессы не обмениваются данными напрямую, не пишут в базу
+на каждое измерение и не конкурируют с записью в CourtActions.db.
+
+Гистограммы хранятся сразу в виде строк Prometheus: <name>_bucket{le=...} (накопительно), <name>_sum, <name>_count.
+Длительность запросов к базам измеряется только для движков, переданных в instrument_engines
+(веб-сервер, события before/after_cursor_execute), процессы подачи на запросах к базам метрики не копят.
+"""
+import atexit
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import Engine, event
+
+from .base.orm_base import DATABASE_DIR
+from .engine import connect_sqlite
+
+METRICS_DB_PATH = Path(DATABASE_DIR) / "Metrics.db"
+
+#период записи накопленных приращений в Metrics.db, секунды
+FLUSH_INTERVAL = 5
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+
+#границы корзин гистограмм, секунды
+STEP_BUCKETS = (1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+REQUEST_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+DB_QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+#операции запросов к базе, остальные учитываются как OTHER
+DB_OPERATIONS = frozenset({'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'PRAGMA', 'CREATE', 'DROP',
+                           'ATTACH', 'DETACH', 'BEGIN', 'COMMIT', 'ROLLBACK', 'ALTER'})
+
+
+@dataclass(frozen=True, slots=True)
+class Metric:
+    """Описание метрики"""
+    kind: str                               #COUNTER | HISTOGRAM
+    help: str                               #описание (# HELP)
+    buckets: tuple[float, ...] = ()         #границы корзин гистограммы
+
+
+METRICS = {
+    'gas_submissions_total': Metric(COUNTER, 'Смены статуса подач по сотруднику и новому статусу (status_events)'),
+    'gas_step_duration_seconds': Metric(HISTOGRAM, 'Длительность шагов подачи RegularServe', STEP_BUCKETS),
+    'gas_step_retries_total': Metric(COUNTER, 'Повторные попытки шагов подачи RegularServe'),
+    'gas_login_duration_seconds': Metric(HISTOGRAM, 'Длительность входа на ГАСП (CheckLogin.start_check)',
+                                         STEP_BUCKETS),
+    'gas_signing_duration_seconds': Metric(HISTOGRAM, 'Длительность подписи пакета документов', REQUEST_BUCKETS),
+    'gas_rmc_request_duration_seconds': Metric(HISTOGRAM, 'Длительность запросов к API РМЦ', REQUEST_BUCKETS),
+    'gas_wait_duration_seconds': Metric(HISTOGRAM, 'Фактическое время ожидания условий на странице (WaitEngine)',
+                                        REQUEST_BUCKETS),
+    'gas_submission_restarts_total': Metric(COUNTER, 'Повторы подачи клиента после ошибки шага: '
+                                                     'продолжение с контрольной точки (resume) или заново (full)'),
+    'gas_pacing_delay_seconds_total': Metric(COUNTER, 'Суммарная пауза действий браузера из-за ограничения темпа по хосту'),
+    'gas_db_query_duration_seconds': Metric(HISTOGRAM, 'Длительность запросов к базам SQLite', DB_QUERY_BUCKETS),
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def format_labels(labels:dict) -> str:
+    """Метки в формате Prometheus (без фигурных скобок), ключи по алфавиту"""
+    return ','.join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items()))
+
+
+def _format_le(bound:float) -> str:
+    return '+Inf' if bound==float('inf') else repr(float(bound))
+
+
+class MetricsStore:
+    """Накопление метрик процесса и запись их в общее хранилище
+
+    Args:
+        path (str | Path): путь до файла хранилища
+        flush_interval (float): период записи накопленных приращений, секунды
+    """
+
+    def __init__(self, path:str|Path=METRICS_DB_PATH, flush_interval:float=FLUSH_INTERVAL) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self._pending: defaultdict[tuple[str, str], float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._conn: sqlite3.Connection|None = None
+        self._flusher: threading.Thread|None = None
+        atexit.register(self.flush)
+
+
+    def _start_flusher(self) -> None:
+        #вызывается под self._lock: поток записи запускается при первом измерении процесса
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_periodically, name='metrics-flush', daemon=True)
+            self._flusher.start()
+
+
+    def _flush_periodically(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+
+    def inc(self, name:str, value:float=1, **labels) -> None:
+        """Увеличивает счетчик
+
+        Args:
+            name (str): метрика из METRICS
+            value (float, optional): приращение. Defaults to 1.
+            **labels: метки
+        """
+        with self._lock:
+            self._pending[(name, format_labels(labels))] += value
+            self._start_flusher()
+
+
+    def observe(self, name:str, value:float, **labels) -> None:
+        """Добавляет значение в гистограмму
+
+        Args:
+            name (str): метрика из METRICS
+            value (float): значение (секунды)
+            **labels: метки
+        """
+        series = format_labels(labels)
+        with self._lock:
+            for bound in (*METRICS[name].buckets, float('inf')):
+                if value <= bound:
+                    self._pending[(f'{name}_bucket', format_labels({**labels, 'le': _format_le(bound)}))] += 1
+            self._pending[(f'{name}_sum', series)] += value
+            self._pending[(f'{name}_count', series)] += 1
+            self._start_flusher()
+
+
+    @contextmanager
+    def timer(self, name:str, **labels) -> Iterator[None]:
+        """Измеряет длительность блока, к меткам добавляется outcome: ok | error (исключение в блоке)
+
+        Args:
+            name (str): гистограмма из METRICS
+            **labels: метки
+        """
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            yield
+            outcome = 'ok'
+        finally:
+            self.observe(name, time.perf_counter()-started, outcome=outcome, **labels)
+
+
+    def timed(self, name:str, **labels):
+        """Декоратор: длительность вызова функции в гистограмме name (см. timer)"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = connect_sqlite(self.path, check_same_thread=False)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS metric_values (
+                    name TEXT NOT NULL,
+                    labels TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (name, labels)
+                ) WITHOUT ROWID
+            """)
+            self._conn = conn
+        return self._conn
+
+
+    def flush(self, wait:bool=True) -> None:
+        """Записывает накопленные приращения в хранилище одной транзакцией
+
+        Args:
+            wait (bool, optional): ждать, если запись выполняет другой поток. Defaults to True.
+        """
+        if not self._flush_lock.acquire(blocking=wait):
+            return
+        try:
+            with self._lock:
+                pending, self._pending = self._pending, defaultdict(float)
+            if not pending:
+                return
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany("""
+                        INSERT INTO metric_values (name, labels, value) VALUES (?, ?, ?)
+                        ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value
+                    """, [(name, labels, value) for (name, labels), value in pending.items()])
+            except sqlite3.Error:
+                #хранилище недоступно: приращения будут записаны при следующей попытке
+                with self._lock:
+                    for key, value in pending.items():
+                        self._pending[key] += value
+        finally:
+            self._flush_lock.release()
+
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        """Все значения хранилища
+
+        Returns:
+            list[tuple[str, str, float]]: (имя строки, метки, значение)
+        """
+        with self._flush_lock:
+            return self._connect().execute("SELECT name, labels, value FROM metric_values").fetchall()
+
+
+#метрики текущего процесса
+metrics_store = MetricsStore()
+
+
+def _base_name(sample_name:str) -> str:
+    for suffix in ('_bucket', '_sum', '_count'):
+        if sample_name.endswith(suffix) and (base:=sample_name[:-len(suffix)]) in METRICS:
+            return base
+    return sample_name
+
+
+def render_prometheus(samples:list[tuple[str, str, float]]) -> str:
+    """Текст в формате Prometheus (text/plain; version=0.0.4)
+
+    Args:
+        samples (list[tuple[str, str, float]]): (имя строки, метки, значение)
+
+    Returns:
+        str: текст экспорта
+    """
+    by_metric = defaultdict(list)
+    for name, labels, value in samples:
+        by_metric[_base_name(name)].append((name, labels, value))
+    lines = []
+    for base in sorted(by_metric):
+        if metric:=METRICS.get(base):
+            lines.append(f'# HELP {base} {metric.help}')
+            lines.append(f'# TYPE {base} {metric.kind}')
+        for name, labels, value in by_metric[base]:
+            series = f'{name}{{{labels}}}' if labels else name
+            lines.append(f'{series} {int(value) if value==int(value) else repr(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _query_started(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _query_finished(conn, cursor, statement, parameters, context, executemany) -> None:
+    if (started:=getattr(context, '_metrics_started', None)) is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'OTHER'
+    metrics_store.observe('gas_db_query_duration_seconds', time.perf_counter()-started,
+                          db=Path(conn.engine.url.database or '').stem,
+                          operation=operation if operation in DB_OPERATIONS else 'OTHER')
+
+
+def instrument_engines(*engines:Engine) -> None:
+    """Измерение длительности запросов движков в gas_db_query_duration_seconds
+
+    Args:
+        *engines (Engine): движки баз процесса веб-сервера
+    """
+    for engine in engines:
+        if not event.contains(engine, 'before_cursor_execute', _query_started):
+            event.listen(engine, 'before_cursor_execute', _query_started)
+            event.listen(engine, 'after_cursor_execute', _query_finished)
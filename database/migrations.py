@@ -0,0 +1,561 @@
+"""Версионированные миграции схемы CourtActions.db и ArchiveCourtActions.db
+
+Миграции запускаются один раз при развертывании (см. start_web.bat, restart_packages.bat, test_start.bat), а не при импорте модулей:
+    python -m database.migrations           - применить новые миграции к обеим базам
+    python -m database.migrations --check   - проверить планы горячих запросов (код возврата 1 при SCAN)
+
+Номер примененной версии хранится в таблице schema_version каждой базы.
+Шаги миграций пишутся идемпотентными (IF NOT EXISTS), т.к. DDL в SQLite
+через pysqlite не всегда попадает в одну транзакцию с записью версии.
+"""
+import argparse
+import datetime
+import sys
+from typing import Callable
+
+from sqlalchemy import Engine, and_, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+from models import db_models
+
+from .database import (CourtActions, CourtActionsArchive, engine, engine_archive,
+                       register_counters, status_events, status_rollup_hourly)
+
+#определение типов
+type Step = tuple[int, str, Callable[[Connection], None]]
+
+
+def _create_schema_version(conn:Connection) -> None:
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER NOT NULL PRIMARY KEY,
+            description VARCHAR,
+            applied_on DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+
+
+def get_version(engine:Engine) -> int:
+    """Текущая версия схемы базы
+
+    Args:
+        engine (Engine): движок базы
+
+    Returns:
+        int: номер последней примененной миграции, 0 если миграции не применялись
+    """
+    with engine.begin() as conn:
+        _create_schema_version(conn)
+        return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_version")).scalar()
+
+
+#-------------------------------------------- CourtActions.db --------------------------------------------
+
+#поля реестра РМЦ, перенесенные из json поля rmc_register_vars в отдельные столбцы
+_RMC_COLUMNS = {
+    'register_id': 'INTEGER',
+    'court_name': 'VARCHAR',
+    'region_name': 'VARCHAR',
+    'client_last_name': 'VARCHAR',
+    'client_first_name': 'VARCHAR',
+    'client_father_name': 'VARCHAR',
+    'client_birthday': 'VARCHAR',
+    'client_gender': 'VARCHAR',
+    'client_birth_place': 'VARCHAR',
+    'client_series': 'VARCHAR',
+    'client_number': 'VARCHAR',
+    'client_issue_on': 'VARCHAR',
+    'client_issue_by': 'VARCHAR',
+    'client_code': 'VARCHAR',
+    'client_snils': 'VARCHAR',
+    'client_inn': 'VARCHAR',
+    'client_registration_index': 'VARCHAR',
+    'client_reg_address': 'VARCHAR',
+    'client_actual_index': 'VARCHAR',
+    'client_actual_address': 'VARCHAR',
+    'client_phone': 'VARCHAR',
+}
+
+
+def _promote_rmc_register_vars(conn:Connection, table:str) -> None:
+    """Добавляет столбцы _RMC_COLUMNS, заполняет их из json поля rmc_register_vars
+    и удаляет json поле (данные больше не хранятся в json с экранированной кириллицей)
+    """
+    existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+    for column, column_type in _RMC_COLUMNS.items():
+        if column not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"))
+    if 'rmc_register_vars' not in existing:
+        return
+    assignments = ', '.join(f"{column} = json_extract(rmc_register_vars, '$.{column}')" for column in _RMC_COLUMNS)
+    conn.execute(text(f"UPDATE {table} SET {assignments} WHERE rmc_register_vars IS NOT NULL"))
+    conn.execute(text(f"ALTER TABLE {table} DROP COLUMN rmc_register_vars"))
+
+
+def _court_actions_v1(conn:Connection) -> None:
+    """Исходная схема таблицы court_actions и триггер формирования court_action_id"""
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS court_actions (
+            court_action_id VARCHAR,
+            lawsuit_id INTEGER,
+            status VARCHAR,
+            rmc_register_num VARCHAR,
+            rmc_register_vars JSON,
+            owner VARCHAR,
+            project VARCHAR,
+            activity_type VARCHAR,
+            package_of_docs_checked BOOLEAN,
+            missing_docs_added BOOLEAN,
+            date_uploaded_docs_on_gas DATETIME,
+            result_number VARCHAR,
+            error_msg VARCHAR,
+            id INTEGER NOT NULL,
+            created_on DATETIME,
+            updated_on DATETIME,
+            PRIMARY KEY (id)
+        )
+    """))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_court_actions_id ON court_actions (id)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_court_actions_court_action_id ON court_actions (court_action_id)"))
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS set_court_actions_id_after_insert
+        AFTER INSERT ON court_actions
+        FOR EACH ROW
+        WHEN NEW.court_action_id IS NULL
+        BEGIN
+            UPDATE court_actions SET court_action_id = 'CA-' || unixepoch(created_on) ||'-'|| NEW.id  WHERE id = NEW.id;
+        END;
+    """))
+
+
+def _court_actions_v2(conn:Connection) -> None:
+    """Уникальный ключ по lawsuit_id (нужен для upsert в append_bulk).
+    Перед созданием индекса из дублей подачи остается запись, продвинувшаяся дальше всех
+    (Завершено > Ошибка > прочие статусы > Создано, затем последняя по updated_on),
+    остальные дубли переносятся в court_actions_duplicates, а не удаляются
+    """
+    if conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND name='ix_court_actions_lawsuit_id'")).first():
+        return
+    conn.execute(text("CREATE TABLE IF NOT EXISTS court_actions_duplicates AS SELECT * FROM court_actions WHERE 0"))
+    conn.execute(text("""
+        CREATE TEMP TABLE court_actions_losers AS
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY lawsuit_id
+                ORDER BY CASE status WHEN :completed THEN 3 WHEN :error THEN 2 WHEN :created THEN 0 ELSE 1 END DESC,
+                         updated_on DESC, id DESC
+            ) AS place
+            FROM court_actions WHERE lawsuit_id IS NOT NULL
+        ) WHERE place > 1
+    """), {'completed': db_models.Status.COMPLETED, 'error': db_models.Status.ERROR,
+           'created': db_models.Status.CREATED})
+    conn.execute(text(
+        "INSERT INTO court_actions_duplicates SELECT * FROM court_actions WHERE id IN (SELECT id FROM court_actions_losers)"))
+    conn.execute(text("DELETE FROM court_actions WHERE id IN (SELECT id FROM court_actions_losers)"))
+    conn.execute(text("DROP TABLE court_actions_losers"))
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_court_actions_lawsuit_id ON court_actions (lawsuit_id)"))
+
+
+def _court_actions_v3(conn:Connection) -> None:
+    """Индексы под горячие запросы:
+    owner+status - get_active_register/is_active/get_actions по сотруднику,
+    rmc_register_num+status - get_actions/get_progress по реестру (группировка по статусу из индекса),
+    updated_on/created_on - опрос дашборда и история
+    """
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_court_actions_owner_status ON court_actions (owner, status)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_court_actions_register_status ON court_actions (rmc_register_num, status)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_court_actions_updated_on ON court_actions (updated_on)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_court_actions_created_on ON court_actions (created_on)"))
+
+
+def _court_actions_v4(conn:Connection) -> None:
+    """Поля реестра РМЦ в отдельных столбцах вместо json поля rmc_register_vars"""
+    _promote_rmc_register_vars(conn, 'court_actions')
+
+
+def _court_actions_v5(conn:Connection) -> None:
+    """Счетчики записей по (сотрудник, реестр, статус) для get_progress/get_active_register,
+    поддерживаются триггерами в той же транзакции, что и изменение court_actions.
+    NULL в ключе заменяется на пустую строку
+    """
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS register_counters (
+            owner VARCHAR NOT NULL,
+            rmc_register_num VARCHAR NOT NULL,
+            status VARCHAR NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (owner, rmc_register_num, status)
+        ) WITHOUT ROWID
+    """))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_register_counters_register ON register_counters (rmc_register_num, status)"))
+    increment = """
+            INSERT INTO register_counters (owner, rmc_register_num, status, count)
+            VALUES (IFNULL(NEW.owner, ''), IFNULL(NEW.rmc_register_num, ''), IFNULL(NEW.status, ''), 1)
+            ON CONFLICT (owner, rmc_register_num, status) DO UPDATE SET count = count + 1;
+    """
+    decrement = """
+            UPDATE register_counters SET count = count - 1
+            WHERE owner = IFNULL(OLD.owner, '') AND rmc_register_num = IFNULL(OLD.rmc_register_num, '')
+                AND status = IFNULL(OLD.status, '');
+    """
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS register_counters_after_insert
+        AFTER INSERT ON court_actions
+        FOR EACH ROW
+        BEGIN {increment}
+        END;
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS register_counters_after_delete
+        AFTER DELETE ON court_actions
+        FOR EACH ROW
+        BEGIN {decrement}
+        END;
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS register_counters_after_update
+        AFTER UPDATE OF owner, rmc_register_num, status ON court_actions
+        FOR EACH ROW
+        WHEN OLD.owner IS NOT NEW.owner OR OLD.rmc_register_num IS NOT NEW.rmc_register_num
+            OR OLD.status IS NOT NEW.status
+        BEGIN {decrement} {increment}
+        END;
+    """))
+    conn.execute(text("DELETE FROM register_counters"))
+    conn.execute(text("""
+        INSERT INTO register_counters (owner, rmc_register_num, status, count)
+        SELECT IFNULL(owner, ''), IFNULL(rmc_register_num, ''), IFNULL(status, ''), COUNT(*)
+        FROM court_actions GROUP BY 1, 2, 3
+    """))
+
+
+def _court_actions_v6(conn:Connection) -> None:
+    """Журнал смен статусов status_events, заполняется триггерами в той же транзакции,
+    что и изменение court_actions. Для существующих записей добавляется по одному событию
+    с текущим статусом (old_status NULL, время - updated_on, seeded 1): это не смены статусов,
+    поэтому они не учитываются в gas_submissions_total
+    """
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS status_events (
+            event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            lawsuit_id INTEGER,
+            owner VARCHAR,
+            rmc_register_num VARCHAR,
+            old_status VARCHAR,
+            new_status VARCHAR,
+            ts DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            seeded BOOLEAN NOT NULL DEFAULT 0
+        )
+    """))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_status_events_ts ON status_events (ts)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_status_events_lawsuit_id ON status_events (lawsuit_id)"))
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS status_events_after_insert
+        AFTER INSERT ON court_actions
+        FOR EACH ROW
+        BEGIN
+            INSERT INTO status_events (lawsuit_id, owner, rmc_register_num, old_status, new_status)
+            VALUES (NEW.lawsuit_id, NEW.owner, NEW.rmc_register_num, NULL, NEW.status);
+        END;
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS status_events_after_update
+        AFTER UPDATE OF status ON court_actions
+        FOR EACH ROW
+        WHEN OLD.status IS NOT NEW.status
+        BEGIN
+            INSERT INTO status_events (lawsuit_id, owner, rmc_register_num, old_status, new_status)
+            VALUES (NEW.lawsuit_id, NEW.owner, NEW.rmc_register_num, OLD.status, NEW.status);
+        END;
+    """))
+    if conn.execute(text("SELECT 1 FROM status_events LIMIT 1")).first() is None:
+        conn.execute(text("""
+            INSERT INTO status_events (lawsuit_id, owner, rmc_register_num, old_status, new_status, ts, seeded)
+            SELECT lawsuit_id, owner, rmc_register_num, NULL, status, IFNULL(updated_on, CURRENT_TIMESTAMP), 1
+            FROM court_actions ORDER BY updated_on, id
+        """))
+
+
+def _court_actions_v7(conn:Connection) -> None:
+    """Почасовые количества записей status_rollup_hourly по (час updated_on в UTC, сотрудник, статус)
+    для истории подач, первичный ключ начинается с часа для выборки по периоду.
+    Поддерживаются триггерами на вставку и изменение court_actions, удаление (перенос в архив)
+    количества не уменьшает. Заполняется по court_actions, архив досчитывается
+    python -m database.rollup (отметка в rollup_state)
+    """
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS status_rollup_hourly (
+            owner VARCHAR NOT NULL,
+            hour_bucket DATETIME NOT NULL,
+            status VARCHAR NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (hour_bucket, owner, status)
+        ) WITHOUT ROWID
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            name VARCHAR NOT NULL PRIMARY KEY,
+            value VARCHAR
+        )
+    """))
+    increment = """
+            INSERT INTO status_rollup_hourly (owner, hour_bucket, status, count)
+            SELECT IFNULL(NEW.owner, ''), strftime('%Y-%m-%d %H:00:00', NEW.updated_on), IFNULL(NEW.status, ''), 1
+            WHERE NEW.updated_on IS NOT NULL
+            ON CONFLICT (hour_bucket, owner, status) DO UPDATE SET count = count + 1;
+    """
+    decrement = """
+            UPDATE status_rollup_hourly SET count = count - 1
+            WHERE owner = IFNULL(OLD.owner, '') AND hour_bucket = strftime('%Y-%m-%d %H:00:00', OLD.updated_on)
+                AND status = IFNULL(OLD.status, '');
+    """
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS status_rollup_hourly_after_insert
+        AFTER INSERT ON court_actions
+        FOR EACH ROW
+        BEGIN {increment}
+        END;
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS status_rollup_hourly_after_update
+        AFTER UPDATE OF owner, status, updated_on ON court_actions
+        FOR EACH ROW
+        WHEN OLD.owner IS NOT NEW.owner OR OLD.status IS NOT NEW.status
+            OR strftime('%Y-%m-%d %H', OLD.updated_on) IS NOT strftime('%Y-%m-%d %H', NEW.updated_on)
+        BEGIN {decrement} {increment}
+        END;
+    """))
+    conn.execute(text("DELETE FROM status_rollup_hourly"))
+    conn.execute(text("""
+        INSERT INTO status_rollup_hourly (owner, hour_bucket, status, count)
+        SELECT IFNULL(owner, ''), strftime('%Y-%m-%d %H:00:00', updated_on), IFNULL(status, ''), COUNT(*)
+        FROM court_actions WHERE updated_on IS NOT NULL GROUP BY 1, 2, 3
+    """))
+
+
+COURT_ACTIONS_MIGRATIONS: list[Step] = [
+    (1, 'Таблица court_actions и триггер court_action_id', _court_actions_v1),
+    (2, 'Уникальный индекс по lawsuit_id, дубли в court_actions_duplicates', _court_actions_v2),
+    (3, 'Индексы owner+status, rmc_register_num+status, updated_on, created_on', _court_actions_v3),
+    (4, 'Поля реестра РМЦ из rmc_register_vars в отдельные столбцы', _court_actions_v4),
+    (5, 'Счетчики register_counters и триггеры', _court_actions_v5),
+    (6, 'Журнал смен статусов status_events и триггеры', _court_actions_v6),
+    (7, 'Почасовые количества status_rollup_hourly и триггеры', _court_actions_v7),
+]
+
+
+#------------------------------------------ ArchiveCourtActions.db ------------------------------------------
+
+def _archive_v1(conn:Connection) -> None:
+    """Исходная схема таблицы court_actions_archive"""
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS court_actions_archive (
+            court_action_id VARCHAR,
+            lawsuit_id INTEGER,
+            status VARCHAR,
+            rmc_register_num VARCHAR,
+            rmc_register_vars JSON,
+            owner VARCHAR,
+            project VARCHAR,
+            activity_type VARCHAR,
+            package_of_docs_checked BOOLEAN,
+            missing_docs_added BOOLEAN,
+            date_uploaded_docs_on_gas DATETIME,
+            result_number VARCHAR,
+            error_msg VARCHAR,
+            created_on DATETIME,
+            updated_on DATETIME,
+            id INTEGER NOT NULL,
+            PRIMARY KEY (id)
+        )
+    """))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_court_actions_archive_id ON court_actions_archive (id)"))
+
+
+def _archive_v2(conn:Connection) -> None:
+    """Индексы под запросы к архиву: поиск подачи (lawsuit_id, court_action_id),
+    выгрузка реестра (rmc_register_num), история и опрос дашборда (updated_on, created_on)
+    """
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_court_actions_archive_lawsuit_id ON court_actions_archive (lawsuit_id)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_court_actions_archive_court_action_id "
+        "ON court_actions_archive (court_action_id)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_court_actions_archive_register "
+        "ON court_actions_archive (rmc_register_num)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_court_actions_archive_updated_on ON court_actions_archive (updated_on)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_court_actions_archive_created_on ON court_actions_archive (created_on)"))
+
+
+def _archive_v3(conn:Connection) -> None:
+    """Поля реестра РМЦ в отдельных столбцах вместо json поля rmc_register_vars"""
+    _promote_rmc_register_vars(conn, 'court_actions_archive')
+
+
+ARCHIVE_MIGRATIONS: list[Step] = [
+    (1, 'Таблица court_actions_archive', _archive_v1),
+    (2, 'Индексы lawsuit_id, court_action_id, rmc_register_num, updated_on, created_on', _archive_v2),
+    (3, 'Поля реестра РМЦ из rmc_register_vars в отдельные столбцы', _archive_v3),
+]
+
+
+DATABASES: dict[str, tuple[Engine, list[Step]]] = {
+    'CourtActions.db': (engine, COURT_ACTIONS_MIGRATIONS),
+    'ArchiveCourtActions.db': (engine_archive, ARCHIVE_MIGRATIONS),
+}
+
+
+def migrate(engine:Engine, steps:list[Step]) -> list[int]:
+    """Применяет к базе миграции, версия которых больше текущей.
+    Каждый шаг выполняется в своей транзакции вместе с записью версии в schema_version
+
+    Args:
+        engine (Engine): движок базы
+        steps (list[Step]): упорядоченный список миграций (версия, описание, функция)
+
+    Returns:
+        list[int]: номера примененных миграций
+    """
+    current = get_version(engine)
+    applied = []
+    for version, description, step in sorted(steps, key=lambda item: item[0]):
+        if version <= current:
+            continue
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(text("INSERT INTO schema_version (version, description) VALUES (:version, :description)"),
+                         {'version': version, 'description': description})
+        applied.append(version)
+    return applied
+
+
+def migrate_all() -> dict[str, list[int]]:
+    """Применяет миграции ко всем базам проекта
+
+    Returns:
+        dict[str, list[int]]: ключ - имя базы, значение - номера примененных миграций
+    """
+    return {name: migrate(db_engine, steps) for name, (db_engine, steps) in DATABASES.items()}
+
+
+#--------------------------------------------- Проверка планов ---------------------------------------------
+
+def hot_queries() -> list[tuple[str, Engine, Select]]:
+    """Горячие запросы моделей в том виде, в котором их строят методы CourtActions/CourtActionsArchive
+
+    Returns:
+        list[tuple[str, Engine, Select]]: название, движок базы, запрос
+    """
+    date = datetime.datetime.now()
+    final_statuses = [db_models.Status.COMPLETED, db_models.Status.ERROR, db_models.Status.ERROR_RMC]
+    ca, arc, rc, rh = CourtActions, CourtActionsArchive, register_counters, status_rollup_hourly
+    return [
+        ('CourtActions.get_action(lawsuit_id)', engine,
+         select(ca).where(ca.lawsuit_id==1)),
+        ('CourtActions.get_action(court_action_id)', engine,
+         select(ca).where(ca.court_action_id=='CA-1-1')),
+        ('CourtActions.change_status_many', engine,
+         select(ca.id).where(ca.lawsuit_id.in_([1, 2, 3]))),
+        ('CourtActions.get_active_register', engine,
+         select(rc.c.rmc_register_num).where(and_(rc.c.owner=='owner', rc.c.status.not_in(final_statuses),
+                                                  rc.c.count>0)).limit(1)),
+        ('CourtActions.get_active_register(project)', engine,
+         select(ca).where(and_(ca.owner=='owner', ca.project=='project',
+                               ca.status.not_in(final_statuses[:2]))).limit(1)),
+        ('CourtActions.get_actions(owner, status)', engine,
+         select(ca).where(and_(ca.status==db_models.Status.PROCESSING, ca.owner=='owner'))),
+        ('CourtActions.get_actions(completed_processing)', engine,
+         select(ca).where(and_(ca.rmc_register_num!='1', ca.owner=='owner'))),
+        ('CourtActions.get_actions(rmc_register_num)', engine,
+         select(ca).where(ca.rmc_register_num=='1')),
+        ('CourtActions.get_progress', engine,
+         select(rc.c.status, func.sum(rc.c.count)).where(rc.c.rmc_register_num=='1').group_by(rc.c.status)),
+        ('CourtActions.changes_since', engine,
+         select(status_events).where(status_events.c.event_id>1).order_by(status_events.c.event_id).limit(10)),
+        ('CourtActions.count_rollup_after', engine,
+         select(rh.c.owner, rh.c.status, func.sum(rh.c.count)).where(rh.c.hour_bucket>=date.strftime('%Y-%m-%d %H:00:00')
+                                                                    ).group_by(rh.c.owner, rh.c.status)),
+        ('CourtActions.get_actions_from', engine,
+         select(ca).where(ca.created_on>=date)),
+        ('CourtActions.get_actions_updated_after', engine,
+         select(ca).where(ca.updated_on>=date)),
+        ('CourtActionsArchive.get_action(lawsuit_id)', engine_archive,
+         select(arc).where(arc.lawsuit_id==1)),
+        ('CourtActionsArchive.get_action(court_action_id)', engine_archive,
+         select(arc).where(arc.court_action_id=='CA-1-1')),
+        ('CourtActionsArchive.get_actions_from_register', engine_archive,
+         select(arc).where(arc.rmc_register_num=='1')),
+        ('CourtActionsArchive.get_actions_from', engine_archive,
+         select(arc).where(arc.created_on>=date)),
+        ('CourtActionsArchive.get_actions_updated_after', engine_archive,
+         select(arc).where(arc.updated_on>=date)),
+    ]
+
+
+def explain(engine:Engine, query:Select) -> list[str]:
+    """План выполнения запроса (EXPLAIN QUERY PLAN)
+
+    Args:
+        engine (Engine): движок базы
+        query (Select): запрос
+
+    Returns:
+        list[str]: строки плана (поле detail)
+    """
+    sql = query.compile(dialect=engine.dialect, compile_kwargs={'literal_binds': True})
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def check_query_plans() -> list[tuple[str, list[str]]]:
+    """Проверяет, что горячие запросы используют индексы, а не полный просмотр таблицы
+
+    Returns:
+        list[tuple[str, list[str]]]: запросы с полным просмотром таблицы и их планы, пустой список если все хорошо
+    """
+    failed = []
+    for name, db_engine, query in hot_queries():
+        plan = explain(db_engine, query)
+        if any(detail.startswith('SCAN ') for detail in plan):
+            failed.append((name, plan))
+    return failed
+
+
+def main(argv:list[str]|None=None) -> int:
+    parser = argparse.ArgumentParser(description='Миграции схемы CourtActions.db и ArchiveCourtActions.db')
+    parser.add_argument('--check', action='store_true',
+                        help='проверить планы горячих запросов, код возврата 1 при полном просмотре таблицы')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        for name, (db_engine, steps) in DATABASES.items():
+            version, last = get_version(db_engine), max(step[0] for step in steps)
+            if version < last:
+                print(f"{name}: версия схемы {version}, ожидается {last}. Сначала примените миграции")
+                return 1
+        if failed:=check_query_plans():
+            for name, plan in failed:
+                print(f"Полный просмотр таблицы: {name}\n    " + "\n    ".join(plan))
+            return 1
+        print("Все горячие запросы используют индексы")
+        return 0
+
+    for name, applied in migrate_all().items():
+        print(f"{name}: применены миграции {applied}" if applied else f"{name}: схема актуальна")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
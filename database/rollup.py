@@ -0,0 +1,115 @@
+"""Заполнение и сверка почасовых количеств status_rollup_hourly (история подач /gethistory)
+
+Новые изменения court_actions попадают в status_rollup_hourly триггерами (миграция 7) в той же транзакции.
+Записи, которые уже были в архиве на момент миграции, досчитываются один раз:
+    python -m database.rollup             - досчитать архив, если еще не досчитан (запускается в start_web.bat)
+    python -m database.rollup --rebuild   - пересчитать по активной и архивной базе заново
+    python -m database.rollup --verify    - сверить с записями баз (код возврата 1 при расхождении)
+"""
+import argparse
+import datetime
+import sys
+
+from sqlalchemy import select, text
+
+from .database import engine, rollup_state, status_rollup_hourly
+from .engine import ARCHIVE_DB_PATH
+from .lookup import engine_lookup
+
+#отметка в rollup_state о том, что архив учтен в status_rollup_hourly
+ARCHIVE_BACKFILLED = 'archive_backfilled_on'
+
+#количества по записям активной базы и архива (строка, которая при переносе осталась в обеих базах, считается один раз)
+_ACTUAL_COUNTS = """
+    SELECT owner, hour_bucket, status, COUNT(*) AS count FROM (
+        SELECT IFNULL(owner, '') AS owner, strftime('%Y-%m-%d %H:00:00', updated_on) AS hour_bucket,
+            IFNULL(status, '') AS status
+        FROM main.court_actions WHERE updated_on IS NOT NULL
+        UNION ALL
+        SELECT IFNULL(owner, ''), strftime('%Y-%m-%d %H:00:00', updated_on), IFNULL(status, '')
+        FROM archive.court_actions_archive AS arc
+        WHERE updated_on IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM main.court_actions AS ca WHERE ca.court_action_id IS arc.court_action_id)
+    ) GROUP BY owner, hour_bucket, status
+"""
+
+
+def rebuild_rollup() -> int:
+    """Пересчитывает status_rollup_hourly по активной и архивной базе в одной транзакции
+
+    Returns:
+        int: количество строк status_rollup_hourly
+    """
+    with engine.connect() as conn:
+        conn.execute(text("ATTACH DATABASE :path AS archive"), {'path': str(ARCHIVE_DB_PATH)})
+        try:
+            conn.execute(text("DELETE FROM main.status_rollup_hourly"))
+            inserted = conn.execute(text(
+                f"INSERT INTO main.status_rollup_hourly (owner, hour_bucket, status, count) {_ACTUAL_COUNTS}")).rowcount
+            conn.execute(text("""
+                INSERT INTO main.rollup_state (name, value) VALUES (:name, :value)
+                ON CONFLICT (name) DO UPDATE SET value = excluded.value
+            """), {'name': ARCHIVE_BACKFILLED, 'value': datetime.datetime.now().isoformat(sep=' ')})
+            conn.commit()
+        finally:
+            conn.rollback()
+            conn.execute(text("DETACH DATABASE archive"))
+    return inserted
+
+
+def catch_up() -> int|None:
+    """Досчитывает архив в status_rollup_hourly, если это еще не сделано
+
+    Returns:
+        int|None: количество строк после пересчета, None - архив уже учтен
+    """
+    with engine.connect() as conn:
+        if conn.execute(select(rollup_state.c.value).where(rollup_state.c.name==ARCHIVE_BACKFILLED)).first():
+            return None
+    return rebuild_rollup()
+
+
+def verify_rollup() -> list[tuple[tuple[str, str, str], int, int]]:
+    """Сверяет status_rollup_hourly с записями активной и архивной базы
+
+    Returns:
+        list[tuple[tuple[str, str, str], int, int]]: расхождения ((сотрудник, час, статус), значение в таблице, фактическое)
+    """
+    with engine_lookup.connect() as conn:
+        actual = {(row.owner, row.hour_bucket, row.status): row.count for row in conn.execute(text(_ACTUAL_COUNTS))}
+        stored = {(row.owner, row.hour_bucket, row.status): row.count
+                  for row in conn.execute(select(status_rollup_hourly).where(status_rollup_hourly.c.count!=0))}
+    return [(key, stored.get(key, 0), actual.get(key, 0))
+            for key in sorted(actual.keys() | stored.keys())
+            if stored.get(key, 0)!=actual.get(key, 0)]
+
+
+def main(argv:list[str]|None=None) -> int:
+    parser = argparse.ArgumentParser(description='Почасовые количества status_rollup_hourly')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--rebuild', action='store_true', help='пересчитать по активной и архивной базе')
+    group.add_argument('--verify', action='store_true', help='сверить с записями баз')
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        print(f"status_rollup_hourly пересчитана, строк: {rebuild_rollup()}")
+        return 0
+    if args.verify:
+        mismatches = verify_rollup()
+        for (owner, hour_bucket, status), stored, actual in mismatches:
+            print(f"{owner!r} / {hour_bucket} / {status!r}: в таблице {stored}, фактически {actual}")
+        if mismatches:
+            print(f"Расхождений: {len(mismatches)}, для пересчета: python -m database.rollup --rebuild")
+            return 1
+        print("status_rollup_hourly совпадает с записями баз")
+        return 0
+
+    if (rows:=catch_up()) is None:
+        print("Архив уже учтен в status_rollup_hourly")
+    else:
+        print(f"Архив учтен в status_rollup_hourly, строк: {rows}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Отображение строк Core-запросов в словари и record-типы без ORM
+
+Методы чтения выбирают явный список столбцов через select(*columns) и получают обычные строки
+(без identity map и построения ORM-объектов). Порядок ключей и конвертеры значений вычисляются
+один раз при создании RowMapper, а не для каждой строки.
+"""
+import datetime
+from typing import Any, Callable, Iterable, Sequence
+
+from sqlalchemy import Column, Select, select
+
+
+def str_converters(columns:Iterable[Column],
+                   keep:tuple[type, ...]=(str, datetime.datetime)) -> dict[str, Callable[[Any], Any]]:
+    """Конвертеры в строку для столбцов, чей python-тип не входит в keep
+    (повторяет правило ClientData.from_dict: все кроме datetime приводится к str)
+
+    Args:
+        columns (Iterable[Column]): столбцы
+        keep (tuple[type, ...]): типы, которые остаются без изменений
+
+    Returns:
+        dict[str, Callable[[Any], Any]]: ключ - имя столбца, значение - конвертер
+    """
+    return {column.key: str for column in columns if not issubclass(column.type.python_type, keep)}
+
+
+class RowMapper:
+    """Прекомпилированное отображение строк запроса select(*columns)
+
+    Args:
+        columns (Sequence[Column]): столбцы запроса, порядок совпадает с порядком полей record
+        record (Callable | None): тип записи (например slots dataclass), вызывается с позиционными
+                                  аргументами; None - строка отображается в словарь
+        converters (dict[str, Callable] | None): конвертеры значений по имени столбца, к None не применяются
+    """
+    __slots__ = ('columns', 'keys', 'record', 'converters')
+
+    def __init__(self, columns:Sequence[Column],
+                 record:Callable[..., Any]|None=None,
+                 converters:dict[str, Callable[[Any], Any]]|None=None,
+                 ) -> None:
+        self.columns = tuple(columns)
+        self.keys = tuple(column.key for column in self.columns)
+        self.record = record
+        converters = converters or {}
+        self.converters = tuple((idx, converters[key]) for idx, key in enumerate(self.keys) if key in converters)
+
+
+    def statement(self) -> Select:
+        """Запрос по столбцам отображения, условия добавляются через .where()"""
+        return select(*self.columns)
+
+
+    def map_row(self, row:Sequence[Any]) -> Any:
+        """Отображение одной строки
+
+        Args:
+            row (Sequence[Any]): строка результата запроса statement()
+
+        Returns:
+            Any: словарь или экземпляр record
+        """
+        if self.converters:
+            row = list(row)
+            for idx, converter in self.converters:
+                if row[idx] is not None:
+                    row[idx] = converter(row[idx])
+        return self.record(*row) if self.record else dict(zip(self.keys, row))
+
+
+    def map(self, rows:Iterable[Sequence[Any]]) -> list:
+        """Отображение списка строк
+
+        Args:
+            rows (Iterable[Sequence[Any]]): строки результата запроса statement()
+
+        Returns:
+            list: список словарей или экземпляров record
+        """
+        if not self.converters and not self.record:
+            keys = self.keys
+            return [dict(zip(keys, row)) for row in rows]
+        map_row = self.map_row
+        return [map_row(row) for row in rows]
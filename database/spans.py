@@ -0,0 +1,285 @@
+"""Спаны шагов подачи по клиентам в локальном хранилище Spans.db
+
+Для каждого клиента записывается шаг подачи целиком (kind=step), каждая попытка шага (kind=attempt),
+а также перезагрузки страницы и переходы внутри шага (kind=reload | goto):
+(owner, lawsuit_id, step, kind, attempt, started_at, duration, outcome).
+
+Спаны копятся в памяти процесса подачи и записываются одной транзакцией после каждого клиента
+(и при завершении процесса), поэтому не конкурируют с записью в CourtActions.db.
+Отчеты по самым долгим шагам и повторным попыткам - core/step_report.py.
+"""
+import atexit
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from typing import Iterator
+
+from config import LOCAL_UTC_OFFSET_HOURS
+
+from .base.orm_base import DATABASE_DIR
+from .engine import connect_sqlite
+
+SPANS_DB_PATH = Path(DATABASE_DIR) / "Spans.db"
+
+#сколько дней хранить спаны
+SPANS_RETENTION_DAYS = 90
+
+
+class SpanKind:
+    """Виды спанов"""
+    STEP = 'step'               #шаг подачи целиком
+    ATTEMPT = 'attempt'         #попытка шага
+    RELOAD = 'reload'           #перезагрузка страницы
+    GOTO = 'goto'               #переход по адресу
+
+
+class SpanOutcome:
+    """Результат спана"""
+    OK = 'ok'                   #завершился без исключения
+    ERROR = 'error'             #исключение
+    RETRY = 'retry'             #попытка прервана следующей попыткой шага
+
+
+@dataclass(slots=True)
+class Span:
+    """Спан шага подачи"""
+    owner: str
+    lawsuit_id: str
+    step: str
+    kind: str
+    attempt: int
+    started_at: float           #unix время начала, секунды
+    duration: float             #секунды
+    outcome: str
+
+
+class SpanStore:
+    """Запись спанов в хранилище и запросы отчетов
+
+    Args:
+        path (str | Path): путь до файла хранилища
+    """
+
+    def __init__(self, path:str|Path=SPANS_DB_PATH) -> None:
+        self.path = path
+        self._pending: list[Span] = []
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection|None = None
+        atexit.register(self.flush)
+
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = connect_sqlite(self.path, check_same_thread=False)
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS step_spans (
+                    id INTEGER PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    lawsuit_id TEXT NOT NULL,
+                    step TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    attempt INTEGER NOT NULL,
+                    started_at REAL NOT NULL,
+                    duration REAL NOT NULL,
+                    outcome TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_step_spans_started_at ON step_spans (started_at);
+                CREATE INDEX IF NOT EXISTS ix_step_spans_lawsuit_id ON step_spans (lawsuit_id);
+            """)
+            self._conn = conn
+        return self._conn
+
+
+    def add(self, span:Span) -> None:
+        with self._lock:
+            self._pending.append(span)
+
+
+    def flush(self) -> None:
+        """Записывает накопленные спаны одной транзакцией, удаляет спаны старше SPANS_RETENTION_DAYS"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany("""
+                        INSERT INTO step_spans (owner, lawsuit_id, step, kind, attempt, started_at, duration, outcome)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, [astuple(span) for span in pending])
+                    conn.execute("DELETE FROM step_spans WHERE started_at < ?",
+                                 (time.time()-SPANS_RETENTION_DAYS*86400,))
+            except sqlite3.Error:
+                #хранилище недоступно: спаны будут записаны при следующей попытке
+                self._pending[:0] = pending
+
+
+    def query(self, sql:str, parameters:dict) -> list[sqlite3.Row]:
+        """Запрос к step_spans для отчетов
+
+        Args:
+            sql (str): запрос, день по местному времени - выражение {day}
+            parameters (dict): именованные параметры запроса
+
+        Returns:
+            list[sqlite3.Row]: строки
+        """
+        day = f"date(started_at + {LOCAL_UTC_OFFSET_HOURS*3600}, 'unixepoch')"
+        with self._lock:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            try:
+                return conn.execute(sql.format(day=day), parameters).fetchall()
+            finally:
+                conn.row_factory = None
+
+
+#спаны текущего процесса
+span_store = SpanStore()
+
+
+class SpanRecorder:
+    """Спаны подачи одного сотрудника: текущий клиент, шаг и попытка
+
+    Args:
+        owner (str): сотрудник
+        store (SpanStore): хранилище
+    """
+
+    def __init__(self, owner:str, store:SpanStore=span_store) -> None:
+        self.owner = owner
+        self.store = store
+        self.lawsuit_id = ''
+        self._step: str|None = None
+        self._attempt = 0
+        self._attempt_started: float|None = None
+
+
+    def _add(self, step:str, kind:str, attempt:int, started:float, outcome:str) -> None:
+        #started - time.time() начала спана
+        self.store.add(Span(owner=self.owner, lawsuit_id=self.lawsuit_id, step=step, kind=kind, attempt=attempt,
+                            started_at=started, duration=max(0.0, time.time()-started), outcome=outcome))
+
+
+    def client(self, lawsuit_id:str) -> None:
+        """Начало подачи клиента, спаны предыдущего клиента записываются в хранилище
+
+        Args:
+            lawsuit_id (str): клиент
+        """
+        self.store.flush()
+        self.lawsuit_id = lawsuit_id
+
+
+    def _close_attempt(self, outcome:str) -> None:
+        if self._attempt_started is not None:
+            self._add(self._step, SpanKind.ATTEMPT, self._attempt, self._attempt_started, outcome)
+            self._attempt_started = None
+
+
+    @contextmanager
+    def step(self, name:str) -> Iterator[None]:
+        """Шаг подачи: спан шага и последней попытки
+
+        Args:
+            name (str): шаг (метод RegularServe)
+        """
+        outer = self._step, self._attempt, self._attempt_started
+        self._step, self._attempt, self._attempt_started = name, 0, None
+        started = time.time()
+        outcome = SpanOutcome.ERROR
+        try:
+            yield
+            outcome = SpanOutcome.OK
+        finally:
+            self._close_attempt(outcome)
+            self._add(name, SpanKind.STEP, self._attempt, started, outcome)
+            self._step, self._attempt, self._attempt_started = outer
+
+
+    def attempt(self, attempt:int) -> None:
+        """Начало попытки текущего шага, предыдущая попытка закрывается: outcome=retry, если это повтор,
+        иначе ok (первая попытка следующего цикла внутри шага, например следующий файл приложений)
+
+        Args:
+            attempt (int): номер попытки, начиная с 1
+        """
+        if self._step is None:
+            return
+        self._close_attempt(SpanOutcome.RETRY if attempt > 1 else SpanOutcome.OK)
+        self._attempt = attempt
+        self._attempt_started = time.time()
+
+
+    @contextmanager
+    def action(self, kind:str) -> Iterator[None]:
+        """Перезагрузка страницы или переход внутри текущего шага
+
+        Args:
+            kind (str): SpanKind.RELOAD | SpanKind.GOTO
+        """
+        started = time.time()
+        outcome = SpanOutcome.ERROR
+        try:
+            yield
+            outcome = SpanOutcome.OK
+        finally:
+            self._add(self._step or '', kind, self._attempt, started, outcome)
+
+
+def slowest_steps(days:int=7, owner:str|None=None, limit:int=20, store:SpanStore=span_store) -> list[sqlite3.Row]:
+    """Шаги с наибольшим суммарным временем по сотрудникам и дням
+
+    Args:
+        days (int, optional): за сколько последних дней. Defaults to 7.
+        owner (str | None, optional): сотрудник (None - все). Defaults to None.
+        limit (int, optional): количество строк. Defaults to 20.
+        store (SpanStore, optional): хранилище. Defaults to span_store.
+
+    Returns:
+        list[sqlite3.Row]: owner, day, step, clients, avg_duration, max_duration, total_duration, errors
+    """
+    return store.query("""
+        SELECT owner, {day} AS day, step,
+               COUNT(DISTINCT lawsuit_id) AS clients,
+               AVG(duration) AS avg_duration,
+               MAX(duration) AS max_duration,
+               SUM(duration) AS total_duration,
+               SUM(outcome = 'error') AS errors
+        FROM step_spans
+        WHERE kind = 'step' AND started_at >= :since AND (:owner IS NULL OR owner = :owner)
+        GROUP BY owner, day, step
+        ORDER BY total_duration DESC
+        LIMIT :limit
+    """, {'since': time.time()-days*86400, 'owner': owner, 'limit': limit})
+
+
+def retry_hotspots(days:int=7, owner:str|None=None, limit:int=20, store:SpanStore=span_store) -> list[sqlite3.Row]:
+    """Шаги с наибольшим количеством повторных попыток и перезагрузок по сотрудникам и дням
+
+    Args:
+        days (int, optional): за сколько последних дней. Defaults to 7.
+        owner (str | None, optional): сотрудник (None - все). Defaults to None.
+        limit (int, optional): количество строк. Defaults to 20.
+        store (SpanStore, optional): хранилище. Defaults to span_store.
+
+    Returns:
+        list[sqlite3.Row]: owner, day, step, retries, reloads, clients, retry_duration
+    """
+    return store.query("""
+        SELECT owner, {day} AS day, step,
+               SUM(kind = 'attempt' AND outcome = 'retry') AS retries,
+               SUM(kind IN ('reload', 'goto')) AS reloads,
+               COUNT(DISTINCT CASE WHEN outcome = 'retry' OR kind IN ('reload', 'goto') THEN lawsuit_id END) AS clients,
+               SUM(CASE WHEN kind = 'attempt' AND outcome = 'retry' THEN duration ELSE 0 END) AS retry_duration
+        FROM step_spans
+        WHERE kind != 'step' AND started_at >= :since AND (:owner IS NULL OR owner = :owner)
+        GROUP BY owner, day, step
+        HAVING retries > 0 OR reloads > 0
+        ORDER BY retries DESC, reloads DESC
+        LIMIT :limit
+    """, {'since': time.time()-days*86400, 'owner': owner, 'limit': limit})
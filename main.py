@@ -4,7 +4,8 @@ from web.app import app
 
 
 def main():
-    serve(app, host='192.168.111.108', port=5555, threads=5)
+    #5 потоков на запросы + до 10 потоков SSE (utils.change_feed.MAX_SUBSCRIBERS)
+    serve(app, host='192.168.111.108', port=5555, threads=15)
 
 
 if __name__ == "__main__":
@@ -38,6 +38,22 @@ class Base(DeclarativeBase):
         return "".join(characters).lstrip("_")
 
 
+    @classmethod
+    def _attribute_names(cls) -> tuple[tuple[str, str], ...]:
+        """Пары (атрибут модели, имя поля без символа "_" на конце), 
+        вычисляются один раз на класс вместо обхода cls.__dict__ для каждой строки
+
+        Returns:
+            tuple[tuple[str, str], ...]: атрибуты-столбцы модели
+        """
+        if '_attribute_names_cache' not in cls.__dict__:
+            cls._attribute_names_cache = tuple(
+                (key, key.rstrip("_")) for key, val in cls.__dict__.items()
+                if isinstance(val, sqlalchemy.orm.attributes.InstrumentedAttribute)
+            )
+        return cls._attribute_names_cache
+
+
     @classmethod
     def _row_to_dict(cls, row: Row) -> dict:
         """Преобразовывает строку записи бд в словарь с наименованием полей без символа "_" на конце
@@ -48,12 +64,7 @@ class Base(DeclarativeBase):
         Returns:
             dict: словарь с наименованиями полей и значениями
         """
-        return_dict = {}
-        for key, val in cls.__dict__.items():
-            if isinstance(val, sqlalchemy.orm.attributes.InstrumentedAttribute):
-                return_dict[key.rstrip("_")] = getattr(row, key)
-
-        return return_dict
+        return {name: getattr(row, key) for key, name in cls._attribute_names()}
 
 
     @classmethod
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class ClientData:
     """Модель для клиентов с 'обычной подачей'"""
     activity_type: str
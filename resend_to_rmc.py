@@ -18,7 +18,7 @@ from pathlib import Path
 import requests
 
 from database.database import CourtActions, CourtActionsArchive
-from models.database.db_models import Status
+from core.rmc.sending_data_to_RMC import RMC_RESULT_COLUMNS, lawsuit_result
 from utils._logger import CustomLogger
 
 
@@ -69,41 +69,17 @@ def send_data_to_rmc(
         logger_path= main_logger_path,
         ) -> bool:
     logger.info(f"Получаю данные реестра для \"{registry}\"...")
-    registry_data: list[dict] = CourtActionsArchive.get_actions_from_register(rmc_register_num=registry)
-
-    # tmp_list = []
-    # for client in registry_data:
-    #     if client.get("rmc_register_num") == "36392":
-    #         tmp_list.append(client)
-
-    logger.info(f"Успешно получил данные в количестве \"{len(registry_data)}\" шт.")
+    registry_data = CourtActionsArchive.iter_actions_from_register(rmc_register_num=registry,
+                                                                   columns=RMC_RESULT_COLUMNS)
 
     logger.info("Формирую json для отправки в РМЦ...")
-    lawsuits = []
-    for client in registry_data:
-        if client.get("status") == Status.COMPLETED:
-            lawsuits.append({
-                "lawsuitId": int(client.get("lawsuit_id")),
-                "successResult": {
-                    "sentNumber": client.get("result_number"),
-                    "lawsuitSentDate": client.get("date_uploaded_docs_on_gas").isoformat() + '+07:00'
-                    }
-            })
-        elif client.get("status") == Status.ERROR:
-            lawsuits.append({
-                "lawsuitId": int(client.get("lawsuit_id")),
-                "errorResult": {"errors": [client.get("error_msg")]}
-            })
-        else:
-            lawsuits.append({
-                "lawsuitId": int(client.get("lawsuit_id")),
-                "errorResult": {"errors": [client.get("error_msg")]}
-            })
+    lawsuits = [lawsuit_result(client) for client in registry_data]
+    logger.info(f"Успешно получил данные в количестве \"{len(lawsuits)}\" шт.")
 
     logger.info("Json сформирован и готов к отправке!")
 
     logger.info("Отправляю данные в РМЦ...")
-    registry_number = int(registry_data[0].get("rmc_register_num"))
+    registry_number = int(registry)
     logger.info(registry_number)
     current_day = datetime.utcnow().strftime("%Y-%m-%d")
     register_sent(
@@ -3,6 +3,20 @@ title WEB - E:\Robots\Indexing\main.py
 
 cd /d "C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice"
 
+"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\venv\Scripts\python.exe" -m database.migrations
+
+if %errorlevel% neq 0 (
+    pause
+    exit /b %errorlevel%
+)
+
+"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\venv\Scripts\python.exe" -m database.rollup
+
+if %errorlevel% neq 0 (
+    pause
+    exit /b %errorlevel%
+)
+
 "C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\venv\Scripts\python.exe" "C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\main.py"
 
 if %errorlevel% equ 0 (
@@ -2,13 +2,14 @@ from .toml.read_toml import get_data_from_toml
 from .document_completion import complete_package_documents
 from .signing_documents import signed_files
 from .retry_func import retry_with_notification
-from .http_handler_helper import get_lawsuit_state, get_users_submits_state, get_history_state, user_is_active
+from .http_handler_helper import (get_lawsuit_state, get_lawsuit_states, get_users_submits_state, get_history_state,
+                                  get_metrics, user_is_active, MAX_LAWSUITS_PER_REQUEST)
 from .users import get_users
 from .other import is_similar
 from .decorators_utils import retry_func
 
 __all__ = [
     "get_data_from_toml", "complete_package_documents", "signed_files",
-    "retry_with_notification", "get_lawsuit_state", "get_users_submits_state", "get_history_state",
-    "get_users", "is_similar", "retry_func", "user_is_active"
+    "retry_with_notification", "get_lawsuit_state", "get_lawsuit_states", "get_users_submits_state", "get_history_state",
+    "get_metrics", "get_users", "is_similar", "retry_func", "user_is_active", "MAX_LAWSUITS_PER_REQUEST"
     ]
@@ -0,0 +1,233 @@
+"""Рассылка изменений дашборду (Server-Sent Events, /events)
+
+Один фоновый поток на процесс веб-сервера раз в CHANGE_POLL_INTERVAL секунд проверяет
+PRAGMA data_version своего соединения с CourtActions.db (меняется, только если другое соединение
+записало в базу). Карточки и прирост графика пересчитываются только при новых событиях status_events,
+если подача уходит из учитываемого графиком статуса - графики перечитываются клиентом целиком, поэтому простаивающий дашборд почти ничего не стоит серверу. Пока подписчиков нет, поток не обращается к базе.
+"""
+import datetime
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Iterator
+
+from config import LOCAL_UTC_OFFSET_HOURS
+from database import CourtActions
+from database.engine import COURT_ACTIONS_DB_PATH, connect_sqlite
+
+from .http_handler_helper import HISTORY_PERIODS, HISTORY_STATUS_KEYS, get_users_submits_state, history_period
+
+#период проверки изменений, секунды
+CHANGE_POLL_INTERVAL = 1.0
+
+#максимальное количество одновременных подписчиков: каждый поток SSE занимает поток waitress,
+#остальные клиенты получают 503 и обновляются опросом
+MAX_SUBSCRIBERS = 10
+
+#максимальное количество неотправленных сообщений подписчику, при переполнении подписчик отключается
+SUBSCRIBER_QUEUE_SIZE = 100
+
+#период отправки комментария-пульса (waitress закрывает неактивные соединения через 120 секунд), секунды
+SSE_HEARTBEAT_SECONDS = 15
+
+#длительность одного потока SSE, после нее клиент переподключается и освобождает поток waitress, секунды
+SSE_STREAM_SECONDS = 300
+
+#пауза перед переподключением клиента, мс
+SSE_RETRY_MS = 3000
+
+log = logging.getLogger(__name__)
+
+
+def history_increments(events:list[dict], now:datetime.datetime|None=None) -> list[dict]:
+    """Прирост графиков истории по событиям смены статуса
+
+    Args:
+        events (list[dict]): события status_events
+        now (datetime.datetime | None, optional): текущее местное время. Defaults to None.
+
+    Returns:
+        list[dict]: {'user':str, 'key':'succes'|'failure'|'failure_rmc', 'positions':{период: индекс интервала}},
+                    период отсутствует в positions, если событие не попадает в текущий период
+    """
+    periods = {period: history_period(period, now) for period in HISTORY_PERIODS}
+    utc_offset = datetime.timedelta(hours=LOCAL_UTC_OFFSET_HOURS)
+    increments = []
+    for event in events:
+        if not (key:=HISTORY_STATUS_KEYS.get(event['new_status'])) or not event['ts']:
+            continue
+        positions = {}
+        for period, (intervals, _, bucket_format, interval_of, start_date) in periods.items():
+            if event['ts'] < start_date:
+                continue
+            interval = interval_of((event['ts'] + utc_offset).strftime(bucket_format))
+            if interval in intervals:
+                positions[period] = intervals.index(interval)
+        increments.append({'user': event['owner'], 'key': key, 'positions': positions})
+    return increments
+
+
+def history_refetch_needed(events:list[dict]) -> bool:
+    """Нужно ли перечитать графики истории целиком: подача ушла из учитываемого статуса,
+    прирост по таким событиям не посчитать (уменьшается интервал прежнего статуса)
+
+    Args:
+        events (list[dict]): события status_events
+
+    Returns:
+        bool: есть событие с old_status из HISTORY_STATUS_KEYS
+    """
+    return any(event['old_status'] in HISTORY_STATUS_KEYS for event in events)
+
+
+class ChangeFeed:
+    """Фоновая проверка изменений и рассылка подписчикам сообщений ('cards', изменившиеся карточки),
+    ('history', прирост графиков), ('history_refetch', графики нужно перечитать)
+    и ('resync', после ошибки проверки все данные нужно перечитать)
+
+    Args:
+        poll_interval (float): период проверки изменений, секунды
+        max_subscribers (int): максимальное количество подписчиков
+    """
+
+    def __init__(self, poll_interval:float=CHANGE_POLL_INTERVAL,
+                 max_subscribers:int=MAX_SUBSCRIBERS) -> None:
+        self.poll_interval = poll_interval
+        self.max_subscribers = max_subscribers
+        self._subscribers: set[queue.Queue] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread|None = None
+        self._cards: dict[str, dict] = {}
+
+
+    def subscribe(self) -> queue.Queue|None:
+        """Новый подписчик
+
+        Returns:
+            queue.Queue|None: очередь сообщений (event, data), None - превышено количество подписчиков
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+            self._subscribers.add(subscriber)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='change-feed', daemon=True)
+                self._thread.start()
+            return subscriber
+
+
+    def unsubscribe(self, subscriber:queue.Queue) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+
+    def is_subscribed(self, subscriber:queue.Queue) -> bool:
+        with self._lock:
+            return subscriber in self._subscribers
+
+
+    def _publish(self, event:str, data) -> None:
+        with self._lock:
+            for subscriber in list(self._subscribers):
+                try:
+                    subscriber.put_nowait((event, data))
+                except queue.Full:
+                    #подписчик не успевает читать: отключаем, клиент переподключится и получит данные заново
+                    self._subscribers.discard(subscriber)
+
+
+    def _changed_cards(self) -> list[dict]:
+        """Карточки пользователей, изменившиеся с прошлой проверки"""
+        cards = {card['nameUser']: card for card in get_users_submits_state()}
+        changed = [card for user, card in cards.items() if self._cards.get(user)!=card]
+        self._cards = cards
+        return changed
+
+
+    def _check_changes(self, conn, data_version:int|None, cursor:int|None) -> tuple[int|None, int|None]:
+        """Проверка изменений и рассылка сообщений подписчикам
+
+        Args:
+            conn (sqlite3.Connection): соединение с CourtActions.db для PRAGMA data_version
+            data_version (int | None): data_version прошлой проверки
+            cursor (int | None): event_id последнего разосланного события, None - курсор еще не взят
+
+        Returns:
+            tuple[int | None, int | None]: новые data_version и курсор
+        """
+        current_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if current_version==data_version:
+            return data_version, cursor
+        if cursor is None:
+            cursor = CourtActions.last_event_id()
+            self._cards = {card['nameUser']: card for card in get_users_submits_state()}
+            return current_version, cursor
+        events = list(CourtActions.iter_changes_since(cursor=cursor))
+        if not events:
+            return current_version, cursor
+        if changed:=self._changed_cards():
+            self._publish('cards', changed)
+        if history_refetch_needed(events):
+            self._publish('history_refetch', None)
+        elif increments:=history_increments(events):
+            self._publish('history', increments)
+        return current_version, events[-1]['event_id']
+
+
+    def _run(self) -> None:
+        conn = connect_sqlite(COURT_ACTIONS_DB_PATH, read_only=True)
+        data_version, cursor = None, None
+        #была ошибка проверки: события могли пропасть, подписчики перечитают данные после восстановления
+        resync = False
+        try:
+            while True:
+                time.sleep(self.poll_interval)
+                with self._lock:
+                    if not self._subscribers:
+                        #без подписчиков база не опрашивается, при следующей подписке курсор берется заново
+                        data_version, cursor = None, None
+                        continue
+                try:
+                    data_version, cursor = self._check_changes(conn, data_version, cursor)
+                except Exception:
+                    #временная ошибка базы или файла пользователей не останавливает поток, курсор берется заново
+                    if not resync:
+                        log.exception('Не удалось проверить изменения для дашборда')
+                    data_version, cursor, resync = None, None, True
+                    continue
+                if resync and cursor is not None:
+                    self._publish('resync', None)
+                    resync = False
+        finally:
+            conn.close()
+
+
+#общий для потоков веб-сервера детектор изменений
+change_feed = ChangeFeed()
+
+
+def sse_stream(subscriber:queue.Queue, feed:ChangeFeed=change_feed) -> Iterator[str]:
+    """Поток сообщений подписчика в формате text/event-stream
+
+    Args:
+        subscriber (queue.Queue): очередь, полученная от feed.subscribe()
+        feed (ChangeFeed, optional): детектор изменений. Defaults to change_feed.
+
+    Yields:
+        str: сообщение SSE
+    """
+    try:
+        yield f'retry: {SSE_RETRY_MS}\n\n'
+        stop_at = time.monotonic() + SSE_STREAM_SECONDS
+        while time.monotonic() < stop_at and feed.is_subscribed(subscriber):
+            try:
+                event, data = subscriber.get(timeout=SSE_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ': heartbeat\n\n'
+                continue
+            yield f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+    finally:
+        feed.unsubscribe(subscriber)
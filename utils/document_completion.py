@@ -5,6 +5,7 @@ from typing import Iterable
 
 from config import PATH_TO_PUBLIC_FOLDER
 from database import CourtActions
+from database.engine import COURT_ACTIONS_DB_PATH, connect_sqlite
 from models.database import db_models
 from notification._rocket_chat import RocketChat
 
@@ -71,6 +72,29 @@ def _copy_foundation_docs(
             shutil.copy2(item, dst_path)
 
 
+def _save_completion_results(
+        completed: list[str],
+        incomplete: list[str],
+        logger: CustomLogger
+        ) -> None:
+    """Сохранение результатов комплектации в БД одним пакетом.
+
+    Args:
+        completed (list[str]): ID укомплектованных пакетов.
+        incomplete (list[str]): ID удалённых неполных пакетов.
+        logger (CustomLogger): Объект логгера.
+    """
+    CourtActions.change_status_many(
+        status=db_models.Status.ERROR,
+        lawsuit_ids=incomplete,
+        error_msg="Не полный пакет документов! (Пакет удалён)"
+        )
+    CourtActions.change_status_many(status=db_models.Status.DOCS_ADDED, lawsuit_ids=completed)
+    logger.info(
+        f"Комплектация завершена: укомплектовано {len(completed)!r} шт., удалено неполных {len(incomplete)!r} шт."
+        )
+
+
 def _handle_lime(
         packages_dir: Path,
         project_dir: Path,
@@ -103,6 +127,7 @@ def _handle_lime(
         )
         exit(1)
 
+    completed, incomplete = [], []
     for package_dir in _get_list_folders(packages_dir):
         pkg_name = package_dir.name
         statement_src = statements_dir / f"{pkg_name}.pdf"
@@ -115,11 +140,7 @@ def _handle_lime(
 
         if not statement_src.exists() or not calc_src.exists():
             logger.warning(f"Удаление неполной папки: {pkg_name!r}, т.к. нет обязательных файлов (расчет и заявления)!")
-            CourtActions.change_status(
-                lawsuit_id=pkg_name,
-                status = db_models.Status.ERROR,
-                error_msg="Не полный пакет документов! (Пакет удалён)"
-                )
+            incomplete.append(pkg_name)
             shutil.rmtree(package_dir, ignore_errors=True)
             continue
 
@@ -134,7 +155,9 @@ def _handle_lime(
         #     logger=logger,
         #     logger_path=logger_path
         #     )
-        CourtActions.change_status(lawsuit_id=pkg_name, status = db_models.Status.DOCS_ADDED)
+        completed.append(pkg_name)
+
+    _save_completion_results(completed=completed, incomplete=incomplete, logger=logger)
 
 
 def _handle_intel(
@@ -158,16 +181,13 @@ def _handle_intel(
     statements_dir = project_dir / FOLDER_STATEMENTS_NAME
     calculations_dir = project_dir / FOLDER_CALCULATIONS_NAME
 
+    completed, incomplete = [], []
     for package_dir in _get_list_folders(packages_dir):
 
         attachments_dir = package_dir / FOLDER_ATTACHMENTS_NAME
         if not attachments_dir.exists():
             logger.warning(f"Удаление неполной папки: {package_dir!r}, т.к. нет обязательной папки \"Приложения\"!")
-            CourtActions.change_status(
-                lawsuit_id=package_dir.name,
-                status = db_models.Status.ERROR,
-                error_msg="Не полный пакет документов! (Пакет удалён)"
-                )
+            incomplete.append(package_dir.name)
             shutil.rmtree(package_dir, ignore_errors=True)
             continue
 
@@ -195,14 +215,16 @@ def _handle_intel(
         #     logger,
         #     logger_path
         #     )
-        CourtActions.change_status(lawsuit_id=package_dir.name, status = db_models.Status.DOCS_ADDED)
+        completed.append(package_dir.name)
+
+    _save_completion_results(completed=completed, incomplete=incomplete, logger=logger)
 
 
 def get_lawsuit_id_with_error(owner: str):
     lawsuit_id = []
     
     try:
-        with sqlite3.connect(r"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\database\CourtActions.db") as conn:
+        with connect_sqlite(COURT_ACTIONS_DB_PATH, read_only=True) as conn:
             cursor = conn.cursor()
             
             query = """
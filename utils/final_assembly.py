@@ -70,6 +70,7 @@ def process_main_folder(path_to_folder: str | Path, logger: CustomLogger) -> Non
     logger.info("Начинаю процесс переноса всех файлов из каждой подпапки в подкаталог \"Приложения\"...")
     packages_dir = Path(path_to_folder)
 
+    lawsuit_ids = []
     for child_folders in (_folder for _folder in packages_dir.iterdir() if _folder.is_dir()):
         lawsuit_id = child_folders.name
         apps_dir = get_path_to_application_folder(child_folders)
@@ -88,7 +89,11 @@ def process_main_folder(path_to_folder: str | Path, logger: CustomLogger) -> Non
                 dst = unique_path(apps_dir / folder.name)
                 shutil.move(str(folder), str(dst))
                 moved += 1
-            
-        CourtActions.change_status(lawsuit_id=lawsuit_id, status=db_models.Status.DOCS_FORMED)
 
-    logger.info("Завершил процесс переноса всех файлов из каждой подпапки в подкаталог \"Приложения\"!")
+        lawsuit_ids.append(lawsuit_id)
+
+    CourtActions.change_status_many(status=db_models.Status.DOCS_FORMED, lawsuit_ids=lawsuit_ids)
+    logger.info(
+        "Завершил процесс переноса всех файлов из каждой подпапки в подкаталог \"Приложения\"! "
+        f"Сформировано пакетов: {len(lawsuit_ids)!r} шт."
+        )
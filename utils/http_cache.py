@@ -0,0 +1,163 @@
+"""Условные ответы (ETag, 304 Not Modified) и сжатие JSON опрашиваемых дашбордом /getstate и /gethistory
+
+Версия данных - PRAGMA data_version общего соединения с CourtActions.db (меняется, только если другое
+соединение записало в базу) и время изменения файла сотрудников. Пока версия не изменилась, ответ
+не пересчитывается: сериализованный JSON и его сжатые варианты берутся из памяти. ETag - хэш тела,
+поэтому клиент получает 304 и тогда, когда запись в базу не изменила содержимое ответа.
+"""
+import gzip
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Hashable
+
+from flask import Request, Response, current_app
+
+from config import PATH_TO_JSON_THUMBPRINTS
+from database.engine import COURT_ACTIONS_DB_PATH, connect_sqlite
+
+try:
+    import brotli
+except ImportError:
+    #brotli не обязателен, без него ответы сжимаются gzip
+    brotli = None
+
+#минимальный размер тела для сжатия, байты
+COMPRESS_MIN_SIZE = 512
+
+#уровень сжатия gzip (1-9) и brotli (0-11): ответы небольшие, важнее время сжатия
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class DataVersion:
+    """Версия данных дашборда: PRAGMA data_version одного соединения, общего для потоков веб-сервера
+
+    Args:
+        path (str | os.PathLike): путь до файла базы
+    """
+
+    def __init__(self, path:str|os.PathLike=COURT_ACTIONS_DB_PATH) -> None:
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+
+    def __call__(self) -> tuple[int, int]:
+        """
+        Returns:
+            tuple[int, int]: (data_version соединения, время изменения файла сотрудников в нс)
+        """
+        with self._lock:
+            if self._conn is None:
+                self._conn = connect_sqlite(self.path, read_only=True, check_same_thread=False)
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        try:
+            users_mtime = os.stat(PATH_TO_JSON_THUMBPRINTS).st_mtime_ns
+        except OSError:
+            users_mtime = 0
+        return data_version, users_mtime
+
+
+#общая для потоков веб-сервера версия данных
+data_version = DataVersion()
+
+
+@dataclass(slots=True)
+class _Entry:
+    version: Hashable
+    built_at: float
+    etag: str
+    body: bytes
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+
+def _encode(body:bytes, encoding:str) -> bytes:
+    if encoding=='br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _choose_encoding(request:Request, size:int) -> str|None:
+    if size < COMPRESS_MIN_SIZE:
+        return None
+    if brotli is not None and request.accept_encodings['br']:
+        return 'br'
+    if request.accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+class ConditionalJson:
+    """Последний ответ по ключу (эндпоинт и параметры) и версии данных
+
+    Ответ пересчитывается один раз на версию, остальные потоки с тем же ключом ждут пересчета.
+    Если версия изменилась, но ответ младше max_age секунд, отдается он (ограничивает пересчеты,
+    когда подача пишет в базу непрерывно).
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Hashable, _Entry] = {}
+        self._locks: dict[Hashable, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+
+    def _fresh(self, entry:_Entry|None, version:Hashable, max_age:float) -> bool:
+        return entry is not None and (entry.version==version or time.monotonic()-entry.built_at < max_age)
+
+
+    def _entry(self, key:Hashable, version:Hashable, build:Callable[[], object], max_age:float) -> _Entry:
+        entry = self._entries.get(key)
+        if self._fresh(entry, version, max_age):
+            return entry
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            #ответ мог быть пересчитан другим потоком, пока этот ждал блокировку
+            entry = self._entries.get(key)
+            if self._fresh(entry, version, max_age):
+                return entry
+            body = current_app.json.response(build()).get_data()
+            entry = _Entry(version=version, built_at=time.monotonic(),
+                           etag=hashlib.blake2b(body, digest_size=12).hexdigest(), body=body)
+            self._entries[key] = entry
+            return entry
+
+
+    def response(self, request:Request, key:Hashable, version:Hashable,
+                 build:Callable[[], object], max_age:float=0) -> Response:
+        """JSON ответ с ETag: 304, если If-None-Match клиента совпадает с ETag, иначе сжатое тело
+
+        Args:
+            request (Request): запрос
+            key (Hashable): ключ ответа (эндпоинт и параметры)
+            version (Hashable): версия данных, прочитанная до build
+            build (Callable[[], object]): расчет ответа
+            max_age (float, optional): сколько секунд отдавать ответ после изменения версии. Defaults to 0.
+
+        Returns:
+            Response: ответ
+        """
+        entry = self._entry(key, version, build, max_age)
+        if request.if_none_match.contains_weak(entry.etag):
+            response = Response(status=304)
+        else:
+            body = entry.body
+            if encoding:=_choose_encoding(request, len(body)):
+                if (body:=entry.encoded.get(encoding)) is None:
+                    body = entry.encoded[encoding] = _encode(entry.body, encoding)
+            response = Response(body, mimetype='application/json')
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        #тело зависит от Accept-Encoding, поэтому ETag слабый
+        response.set_etag(entry.etag, weak=True)
+        response.headers['Vary'] = 'Accept-Encoding'
+        #браузер хранит ответ, но перед использованием всегда проверяет его по ETag
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+#общий для потоков веб-сервера кэш ответов дашборда
+conditional_json = ConditionalJson()
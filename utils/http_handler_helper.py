@@ -1,12 +1,17 @@
 import calendar
 import datetime
 import statistics
+import threading
 import time
+from collections import defaultdict
 
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 
-from database import CourtActions, CourtActionsArchive
+from config import LOCAL_UTC_OFFSET_HOURS
+from database import CourtActions, metrics_store
+from database.lookup import LawsuitLookup
+from database.metrics import format_labels, render_prometheus
 from models import db_models
 
 from .users import get_users
@@ -32,12 +37,25 @@ def user_is_active(owner:str, wait_time_out:bool=False):
 
 
 
-def get_lawsuit_state(lawsuit_id:int) -> dict:
-    if lawsuit:= CourtActionsArchive.get_action(lawsuit_id=lawsuit_id):# \ CourtActions.get_action(lawsuit_id=lawsuit_id)
-                        #or CourtActionsArchive.get_action(lawsuit_id=lawsuit_id)
-                        
+#поиск подач в активной и архивной базе с кэшем конечных статусов (общий для потоков waitress)
+lawsuit_lookup = LawsuitLookup()
+
+#максимальное количество id в одном запросе /getresults
+MAX_LAWSUITS_PER_REQUEST = 1000
+
+
+def _lawsuit_state(lawsuit_id:int, lawsuit:dict|None) -> dict:
+    """Ответ по подаче для /getresult и /getresults
 
-        client_name = f'{lawsuit['client_last_name']} {lawsuit['client_first_name']} {lawsuit['client_father_name']}'
+    Args:
+        lawsuit_id (int): id подачи РМЦ
+        lawsuit (dict | None): результат поиска LawsuitLookup
+
+    Returns:
+        dict: состояние подачи
+    """
+    if lawsuit:
+        client_name = f"{lawsuit['client_last_name'] or ''} {lawsuit['client_first_name'] or ''} {lawsuit['client_father_name'] or ''}"
         response = {
             'error': None,
             'clientName': client_name.strip(),
@@ -57,43 +75,68 @@ def get_lawsuit_state(lawsuit_id:int) -> dict:
         return response
 
 
+def get_lawsuit_state(lawsuit_id:int) -> dict:
+    """Состояние подачи по id РМЦ (активная база и архив)
+
+    Args:
+        lawsuit_id (int): id подачи РМЦ
+
+    Returns:
+        dict: состояние подачи
+    """
+    return _lawsuit_state(lawsuit_id, lawsuit_lookup.get(lawsuit_id))
+
+
+def get_lawsuit_states(lawsuit_ids:list[int]) -> list[dict]:
+    """Состояния подач по списку id РМЦ (сверка с РМЦ)
+
+    Args:
+        lawsuit_ids (list[int]): id подач РМЦ, не более MAX_LAWSUITS_PER_REQUEST
+
+    Returns:
+        list[dict]: состояния подач в порядке lawsuit_ids, к каждому добавлен lawsuitId
+    """
+    lawsuits = lawsuit_lookup.get_many(lawsuit_ids)
+    return [{'lawsuitId': lawsuit_id, **_lawsuit_state(lawsuit_id, lawsuits[lawsuit_id])} 
+            for lawsuit_id in lawsuit_ids]
+
+
+#сколько секунд ответ /getstate отдается после изменения данных, секунды (дашборд опрашивает раз в 10 секунд),
+#пока данные не меняются, ответ не пересчитывается (utils.http_cache)
+SUBMITS_STATE_TTL = 5
+
+
 def get_users_submits_state() -> list:
-    """Информация по подачам по каждому пользователю
+    """Информация по подачам по каждому пользователю, 
+    состояние всех активных реестров читается одним обращением к базе (CourtActions.get_registers_state)
 
     Returns:
-        list: _description_
+        list: карточки пользователей
     """
     response = []
     users = get_users()
+    registers = CourtActions.get_registers_state(owners=list(users))
     for user in users:
         
-        if actions:= CourtActions.get_actions(owner=user):
-            register_num = actions[-1].get('rmc_register_num')
-            project = actions[-1].get('project')
-            #пакеты док-в в обработке
-            packets_in_processing = [act for act in actions if act['status'] not in (db_models.Status.COMPLETED, 
-                                                                                     db_models.Status.ERROR,
-                                                                                     db_models.Status.ERROR_RMC,
-                                                                                     )]
-            #время окончания подач по каждому пакету док-в
-            completed_times = [act['date_uploaded_docs_on_gas'] for act in actions if act['status'] in (db_models.Status.COMPLETED)]
-            completed_times.sort()
+        if state:= registers.get(user):
+            #время окончания подач по последним пакетам док-в
+            completed_times = state['completed_times']
             #среднее время подачи по последним 50 пакетам
             avg_secs_between_actions = statistics.mean([(time_-completed_times[enum-1]).seconds
                                         for enum, time_ in enumerate(completed_times)][1:][-50:]) \
                                             if completed_times and len(completed_times)>1 else 0
             #время оставшееся на обработку пакетов
-            remaining_time = relativedelta(seconds=avg_secs_between_actions*len(packets_in_processing))
+            remaining_time = relativedelta(seconds=avg_secs_between_actions*state['in_queue'])
             
             response.append(
                 {
                     'nameUser':user,
-                    'numRegister':register_num,
-                    'project':project,
+                    'numRegister':state['rmc_register_num'],
+                    'project':state['project'],
                     'status':'Активен',
-                    'sentToday':len(completed_times),
-                    'lastSent':max(completed_times).strftime('%d.%m.%Y %H:%M:%S') if completed_times else None,
-                    'packetsInQueue':len(packets_in_processing),
+                    'sentToday':state['completed'],
+                    'lastSent':completed_times[-1].strftime('%d.%m.%Y %H:%M:%S') if completed_times else None,
+                    'packetsInQueue':state['in_queue'],
                     'howLongWait':f'~{remaining_time.days*24+remaining_time.hours}ч {remaining_time.minutes}м'
                     
                 }
@@ -115,89 +158,107 @@ def get_users_submits_state() -> list:
     return sorted(response, key=lambda item: item.get('status'))
 
     
-def get_history_state(period:str) -> dict:
-    results=[]
-    intervals=[]
-    actions=[]
+#периоды истории подач (/gethistory)
+HISTORY_PERIODS = ('Daily', 'Weekly', 'Monthly', 'Quarterly', 'Yearly')
+
+#статусы, которые попадают на график
+HISTORY_STATUS_KEYS = {
+    db_models.Status.COMPLETED: 'succes',
+    db_models.Status.ERROR: 'failure',
+    db_models.Status.ERROR_RMC: 'failure_rmc',
+}
+
+
+def history_period(period:str, now:datetime.datetime|None=None) -> tuple:
+    """Интервалы периода истории подач
+
+    Args:
+        period (str): период из HISTORY_PERIODS
+        now (datetime.datetime | None, optional): текущее местное время. Defaults to None - по LOCAL_UTC_OFFSET_HOURS.
+
+    Returns:
+        tuple: (интервалы, подписи интервалов, формат strftime интервала, 
+                функция интервал по строке strftime, начало периода в UTC)
+    """
+    #местное время по смещению LOCAL_UTC_OFFSET_HOURS (в базе время хранится в UTC)
+    utc_offset = datetime.timedelta(hours=LOCAL_UTC_OFFSET_HOURS)
+    if now is None:
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + utc_offset
     if period == 'Daily':
         intervals = [i for i in range(24)]
-        start_date = datetime.datetime.combine(datetime.datetime.now(), datetime.time.min)
-        #Приведение Новосибирского времен к UTC
-        start_date = start_date-datetime.timedelta(hours=7)
+        intervals_str = [f'{str(i).zfill(2)}:00' for i in intervals]
+        #час
+        bucket_format, interval_of = '%H', int
+        start_date = datetime.datetime.combine(now, datetime.time.min)
         
     elif period == 'Weekly':
         intervals = [i for i in range(1,8)]
-        start_date = datetime.datetime.today()+datetime.timedelta((1-datetime.datetime.now().isoweekday()))
+        intervals_str = [f'{str(i)}' for i in intervals]
+        #день недели SQLite: 0 - воскресенье, приводится к isoweekday
+        bucket_format, interval_of = '%w', lambda bucket: int(bucket) or 7
+        start_date = now+datetime.timedelta((1-now.isoweekday()))
         start_date = datetime.datetime.combine(start_date, datetime.time.min)
-        #Приведение Новосибирского времен к UTC
-        start_date = start_date-datetime.timedelta(hours=7)
         
     elif period == 'Monthly':
-        now = datetime.datetime.now()
         _, monthrange = calendar.monthrange(now.year, now.month)
         intervals = [i for i in range(1,monthrange+1)]
-        start_date = datetime.datetime.today()+datetime.timedelta((1-datetime.datetime.now().day))
-        start_date = datetime.datetime.combine(start_date, datetime.time.min)
-        #Приведение Новосибирского времен к UTC
-        start_date = start_date-datetime.timedelta(hours=7)
-
-    current_actions = CourtActions.get_actions_updated_after(start_date)
-    history_actions = CourtActionsArchive.get_actions_updated_after(start_date)
-    actions.extend(current_actions)
-    actions.extend(history_actions)
-    if actions:
+        intervals_str = [f'{str(i)}' for i in intervals]
+        #день месяца
+        bucket_format, interval_of = '%d', int
+        start_date = datetime.datetime.combine(now.replace(day=1), datetime.time.min)
+
+    elif period == 'Quarterly':
+        quarter_start = datetime.date(now.year, (now.month-1)//3*3+1, 1)
+        quarter_end = quarter_start+relativedelta(months=3)
+        intervals = [i for i in range(1,(quarter_end-quarter_start).days//7+2) 
+                     if quarter_start+datetime.timedelta(weeks=i-1)<quarter_end]
+        intervals_str = [f'{str(i)}' for i in intervals]
+        #неделя квартала (1 - первые 7 дней квартала)
+        bucket_format = '%Y-%m-%d'
+        interval_of = lambda bucket: (datetime.date.fromisoformat(bucket)-quarter_start).days//7+1
+        start_date = datetime.datetime.combine(quarter_start, datetime.time.min)
+
+    elif period == 'Yearly':
+        intervals = [i for i in range(1,13)]
+        intervals_str = [f'{str(i)}' for i in intervals]
+        #месяц
+        bucket_format, interval_of = '%m', int
+        start_date = datetime.datetime.combine(datetime.date(now.year, 1, 1), datetime.time.min)
+
+    else:
+        raise ValueError(f'Неизвестный период истории подач - {period}')
+
+    #Приведение местного времени к UTC
+    return intervals, intervals_str, bucket_format, interval_of, start_date-utc_offset
+
+
+def get_history_state(period:str) -> dict:
+    results=[]
+    intervals, intervals_str, bucket_format, interval_of, start_date = history_period(period)
+    status_keys = HISTORY_STATUS_KEYS
+    #количества берутся из почасовых количеств status_rollup_hourly (активная база и архив),
+    #объем чтения зависит от длины периода и числа сотрудников, а не от количества подач
+    counters = defaultdict(lambda: {key: dict.fromkeys(intervals, 0) for key in status_keys.values()})
+    has_actions = False
+    for owner, status, bucket, count in CourtActions.count_rollup_after(start_date, bucket_format, 
+                                                                         LOCAL_UTC_OFFSET_HOURS):
+        has_actions = True
+        if not (key:=status_keys.get(status)):
+            continue
+        interval = interval_of(bucket)
+        if interval in counters[owner][key]:
+            counters[owner][key][interval] += count
+
+    if has_actions:
         users = get_users()
         for user in users:
-            user_acts = [act for act in actions if act['owner']==user]
-            succes_acts= [act for act in user_acts if act['status']==db_models.Status.COMPLETED]
-            failure_acts = [act for act in user_acts if act['status']==db_models.Status.ERROR]
-            failure_rmc_acts = [act for act in user_acts if act['status']==db_models.Status.ERROR_RMC]
-            
-            succes_acts_in_intervals = {}
-            failure_acts_in_intervals = {}
-            failure_rmc_acts_in_intervals = {}
-            for interval in intervals:
-                if period == 'Daily':
-                    succes_acts_in_intervals[interval] = len(list(filter(
-                                            lambda act: act['updated_on'].replace(tzinfo=datetime.timezone.utc
-                                                                                  ).astimezone(tz=None).hour==interval, succes_acts)))
-                    failure_acts_in_intervals[interval] = len(list(filter(
-                                            lambda act: act['updated_on'].replace(tzinfo=datetime.timezone.utc
-                                                                                  ).astimezone(tz=None).hour==interval, failure_acts)))
-                    failure_rmc_acts_in_intervals[interval] = len(list(filter(
-                                            lambda act: act['updated_on'].replace(tzinfo=datetime.timezone.utc
-                                                                                  ).astimezone(tz=None).hour==interval, failure_rmc_acts)))
-                    intervals_str = [f'{str(i).zfill(2)}:00' for i in intervals]
-                    
-                elif period == 'Weekly':
-                    succes_acts_in_intervals[interval] = len(list(filter(
-                                            lambda act: act['updated_on'].replace(tzinfo=datetime.timezone.utc
-                                                                                  ).astimezone(tz=None).isoweekday()==interval, succes_acts)))
-                    failure_acts_in_intervals[interval] = len(list(filter(
-                                            lambda act: act['updated_on'].replace(tzinfo=datetime.timezone.utc
-                                                                                  ).astimezone(tz=None).isoweekday()==interval, failure_acts)))
-                    failure_rmc_acts_in_intervals[interval] = len(list(filter(
-                                            lambda act: act['updated_on'].replace(tzinfo=datetime.timezone.utc
-                                                                                  ).astimezone(tz=None).isoweekday()==interval, failure_rmc_acts)))
-                    intervals_str = [f'{str(i)}' for i in intervals]
-                    
-                elif period == 'Monthly':
-                    succes_acts_in_intervals[interval] = len(list(filter(
-                                            lambda act: act['updated_on'].replace(tzinfo=datetime.timezone.utc
-                                                                                  ).astimezone(tz=None).day==interval, succes_acts)))
-                    failure_acts_in_intervals[interval] = len(list(filter(
-                                            lambda act: act['updated_on'].replace(tzinfo=datetime.timezone.utc
-                                                                                  ).astimezone(tz=None).day==interval, failure_acts)))
-                    failure_rmc_acts_in_intervals[interval] = len(list(filter(
-                                            lambda act: act['updated_on'].replace(tzinfo=datetime.timezone.utc
-                                                                                  ).astimezone(tz=None).day==interval, failure_rmc_acts)))
-                    intervals_str = [f'{str(i)}' for i in intervals]
+            user_counters = counters[user]
             results.append(
             {'user':user, 
              'countSubmit':{
-                 'succes':list(succes_acts_in_intervals.values()), 
-                 'failure':list(failure_acts_in_intervals.values()),
-                 'failure_rmc':list(failure_rmc_acts_in_intervals.values())
+                 'succes':list(user_counters['succes'].values()), 
+                 'failure':list(user_counters['failure'].values()),
+                 'failure_rmc':list(user_counters['failure_rmc'].values())
                  }
              }
                     )
@@ -231,3 +292,43 @@ def get_history_state(period:str) -> dict:
                                             }
                 }
             }
+
+
+class SubmissionTotals:
+    """Количества смен статусов по сотруднику и новому статусу (gas_submissions_total),
+    журнал status_events читается от курсора, поэтому каждое событие учитывается один раз
+    """
+
+    def __init__(self) -> None:
+        self._totals: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+
+    def samples(self) -> list[tuple[str, str, int]]:
+        """
+        Returns:
+            list[tuple[str, str, int]]: строки gas_submissions_total (имя, метки, значение)
+        """
+        with self._lock:
+            counts, self._cursor = CourtActions.count_events_since(cursor=self._cursor)
+            for owner, status, count in counts:
+                self._totals[(owner or '', status or '')] += count
+            return [('gas_submissions_total', format_labels({'owner': owner, 'status': status}), count)
+                    for (owner, status), count in self._totals.items()]
+
+
+#количества смен статусов для /metrics (общие для потоков waitress)
+submission_totals = SubmissionTotals()
+
+
+def get_metrics() -> str:
+    """Метрики в формате Prometheus: смены статусов по журналу status_events 
+    и значения, записанные процессами в хранилище метрик (database.metrics)
+
+    Returns:
+        str: текст экспорта
+    """
+    #метрики веб-сервера записываются сразу, чтобы попасть в ответ
+    metrics_store.flush()
+    return render_prometheus(submission_totals.samples() + metrics_store.samples())
@@ -0,0 +1,199 @@
+"""Запуск подач core/dispatcher.py без блокировки потоков веб-сервера
+
+/startsubmit (и POST /jobs) только запускает процесс и сразу возвращает id задания.
+Один фоновый поток раз в JOB_POLL_INTERVAL секунд проверяет запущенные процессы
+(код завершения) и наличие активной подачи сотрудника в базе, состояние задания - GET /jobs/<id>.
+"""
+import datetime
+import logging
+import subprocess
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, replace
+
+from database import CourtActions
+
+#интерпретатор и скрипт подачи
+PYTHON_PATH = r"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\venv\Scripts\python.exe"
+DISPATCHER_PATH = r"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\core\dispatcher.py"
+
+#период проверки запущенных процессов, секунды
+JOB_POLL_INTERVAL = 1.0
+
+#время ожидания активной подачи после запуска процесса, секунды
+ACTIVE_TIMEOUT = 60*5
+
+#количество хранимых завершенных заданий
+FINISHED_JOBS_LIMIT = 200
+
+log = logging.getLogger(__name__)
+
+
+class JobStage:
+    """Этапы задания"""
+    STARTED = 'started'         #процесс запущен, реестр еще загружается
+    ACTIVE = 'active'           #в базе появилась активная подача сотрудника
+    TIMEOUT = 'timeout'         #активная подача не появилась за ACTIVE_TIMEOUT, процесс продолжает работу
+    FINISHED = 'finished'       #процесс завершился с кодом 0
+    FAILED = 'failed'           #процесс завершился с ошибкой или не запустился
+
+
+@dataclass(slots=True)
+class Job:
+    """Задание на подачу по сотруднику"""
+    job_id: str
+    user_name: str
+    stage: str = JobStage.STARTED
+    pid: int|None = None
+    exit_code: int|None = None
+    message: str|None = None
+    created_on: datetime.datetime = field(default_factory=datetime.datetime.now)
+    updated_on: datetime.datetime = field(default_factory=datetime.datetime.now)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data['created_on'] = self.created_on.strftime('%d.%m.%Y %H:%M:%S')
+        data['updated_on'] = self.updated_on.strftime('%d.%m.%Y %H:%M:%S')
+        return data
+
+
+class JobManager:
+    """Реестр заданий процесса веб-сервера и фоновый поток отслеживания дочерних процессов
+
+    Args:
+        poll_interval (float): период проверки процессов, секунды
+        active_timeout (float): время ожидания активной подачи после запуска, секунды
+    """
+
+    def __init__(self, poll_interval:float=JOB_POLL_INTERVAL,
+                 active_timeout:float=ACTIVE_TIMEOUT) -> None:
+        self.poll_interval = poll_interval
+        self.active_timeout = active_timeout
+        self._jobs: dict[str, Job] = {}
+        self._processes: dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread|None = None
+
+
+    def _command(self, user_name:str) -> list[str]:
+        return [PYTHON_PATH, DISPATCHER_PATH, "--user_name", user_name]
+
+
+    def _running_job(self, user_name:str) -> Job|None:
+        for job_id in self._processes:
+            if self._jobs[job_id].user_name==user_name:
+                return self._jobs[job_id]
+        return None
+
+
+    def submit(self, user_name:str) -> tuple[Job, bool]:
+        """Запускает подачу по сотруднику, если по нему нет запущенного задания
+
+        Args:
+            user_name (str): сотрудник
+
+        Returns:
+            tuple[Job, bool]: копия задания и признак того, что оно создано этим вызовом
+                              (False - возвращено уже запущенное задание)
+        """
+        with self._lock:
+            if job:=self._running_job(user_name):
+                return replace(job), False
+            job = Job(job_id=uuid.uuid4().hex, user_name=user_name)
+            self._jobs[job.job_id] = job
+            try:
+                process = subprocess.Popen(self._command(user_name),
+                                           creationflags=getattr(subprocess, 'CREATE_NEW_CONSOLE', 0))
+            except OSError as ex:
+                self._set_stage(job, JobStage.FAILED, message=f'Не удалось запустить подачу: {ex}')
+                return replace(job), True
+            job.pid = process.pid
+            self._processes[job.job_id] = process
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='job-manager', daemon=True)
+                self._thread.start()
+            return replace(job), True
+
+
+    #задания меняет фоновый поток под self._lock, поэтому наружу отдаются копии
+    def get(self, job_id:str) -> Job|None:
+        with self._lock:
+            return replace(job) if (job:=self._jobs.get(job_id)) else None
+
+
+    def jobs(self) -> list[Job]:
+        with self._lock:
+            return sorted((replace(job) for job in self._jobs.values()), key=lambda job: job.created_on, reverse=True)
+
+
+    def _set_stage(self, job:Job, stage:str, message:str|None=None) -> None:
+        job.stage = stage
+        job.message = message
+        job.updated_on = datetime.datetime.now()
+
+
+    def _check(self, job_id:str, process:subprocess.Popen) -> bool:
+        """Обновляет этап задания, поля задания меняются под self._lock
+
+        Returns:
+            bool: процесс завершился
+        """
+        exit_code = process.poll()
+        with self._lock:
+            job = self._jobs[job_id]
+            waiting_active = exit_code is None and job.stage==JobStage.STARTED
+        #проверка базы выполняется без блокировки, чтобы не задерживать /jobs
+        active = waiting_active and CourtActions.is_active(owner=job.user_name)
+        with self._lock:
+            if exit_code is not None:
+                job.exit_code = exit_code
+                if exit_code==0:
+                    self._set_stage(job, JobStage.FINISHED)
+                else:
+                    self._set_stage(job, JobStage.FAILED, message=f'Процесс подачи завершился с кодом {exit_code}')
+                return True
+            if job.stage==JobStage.STARTED:
+                if active:
+                    self._set_stage(job, JobStage.ACTIVE)
+                elif (datetime.datetime.now()-job.created_on).total_seconds() > self.active_timeout:
+                    self._set_stage(job, JobStage.TIMEOUT,
+                                    message='Не удалось вернуть результат, попытайтесь снова через 10 минут')
+        return False
+
+
+    def _forget_finished(self) -> None:
+        finished = [job for job_id, job in self._jobs.items() if job_id not in self._processes]
+        finished.sort(key=lambda job: job.updated_on)
+        for job in finished[:max(0, len(finished)-FINISHED_JOBS_LIMIT)]:
+            del self._jobs[job.job_id]
+
+
+    def _run(self) -> None:
+        try:
+            while True:
+                time.sleep(self.poll_interval)
+                with self._lock:
+                    if not self._processes:
+                        return
+                    processes = list(self._processes.items())
+                for job_id, process in processes:
+                    try:
+                        finished = self._check(job_id, process)
+                    except Exception:
+                        #ошибка базы (блокировка, ввод-вывод) не останавливает отслеживание, задание проверится снова
+                        log.exception(f'Не удалось проверить задание {job_id!r}')
+                        continue
+                    if finished:
+                        with self._lock:
+                            del self._processes[job_id]
+                            self._forget_finished()
+        finally:
+            #поток завершается, следующий submit запустит новый
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+
+#общий для потоков веб-сервера реестр заданий
+job_manager = JobManager()
@@ -1,8 +1,10 @@
 import subprocess
+import time
+from collections import defaultdict
 from pathlib import Path
 
 from config import PATH_TO_CRYPTCP
-from database import CourtActions
+from database import CourtActions, metrics_store
 from models import db_models
 from models.database import db_models
 
@@ -35,19 +37,21 @@ def run_cryptcp_sign(
         path_to_folder: str | Path,
         logger: CustomLogger,
         pin: bool = False
-        ) -> None:
+        ) -> tuple[db_models.Status, str | None] | None:
     """Подпись файлов в директории (Подписывает все файлы в директории).
 
     Args:
         thumbprint (str): Код подписи.
         path_to_folder (str | Path): Путь до папки, где лежат файлы для подписи.
         pin (bool): Для сертификатов в реестре.
+
+    Returns:
+        tuple[db_models.Status, str | None] | None: Новый статус пакета и текст ошибки,
+            либо None, если статус менять не нужно.
     """
 
     path_to_save_sig_file = str(Path(path_to_folder).resolve())
 
-    lawsuit_id = Path(path_to_save_sig_file).name
-
     command = [str(PATH_TO_CRYPTCP), "-signf"]
     command += ["-dir", path_to_save_sig_file]
     command += ["-uMy", "-thumbprint", thumbprint]
@@ -59,6 +63,8 @@ def run_cryptcp_sign(
     if pin:
         command += ["-pin", "12345678"]
 
+    outcome = None
+
     try:
         result = subprocess.run(
             command,
@@ -71,19 +77,11 @@ def run_cryptcp_sign(
     except subprocess.TimeoutExpired:
         logger.error(f"Таймаут ожидания cryptcp ({DEFAULT_TIMEOUT} с). Процесс убит.")
         # TODO: Завершение работы + уведомление
-        CourtActions.change_status(
-            lawsuit_id=lawsuit_id,
-            status = db_models.Status.ERROR,
-            error_msg="Не смог подписать файлы, из-за таймаута!"
-            )
+        outcome = db_models.Status.ERROR, "Не смог подписать файлы, из-за таймаута!"
     except Exception as ex:
         logger.error(f"Ошибка запуска cryptcp! Ошибка:\n{ex}")
         # TODO: Завершение работы + уведомление
-        CourtActions.change_status(
-            lawsuit_id=lawsuit_id,
-            status = db_models.Status.ERROR,
-            error_msg="Не смог подписать файлы, из-за непредвиденной ошибки!"
-            )
+        outcome = db_models.Status.ERROR, "Не смог подписать файлы, из-за непредвиденной ошибки!"
 
     try:
         ok = (result.returncode == 0)
@@ -92,31 +90,21 @@ def run_cryptcp_sign(
                 "cryptcp завершился с ошибкой, код=%s\nstdout:\n%s\nstderr:\n%s" %
                 (result.returncode, result.stdout.strip(), result.stderr.strip())
             )
-            CourtActions.change_status(
-                lawsuit_id=lawsuit_id,
-                status = db_models.Status.ERROR,
-                error_msg="Не смог подписать файлы, из-за непредвиденной ошибки!"
-                )
+            outcome = db_models.Status.ERROR, "Не смог подписать файлы, из-за непредвиденной ошибки!"
             # TODO: Завершение работы + уведомление
         else:
             if result.stdout.strip() or result.stderr.strip():
                 # TODO: Удалить принт в проде
                 # logger.info("stdout:\n%s\nstderr:\n%s" % (result.stdout.strip(), result.stderr.strip()))
-                CourtActions.change_status(lawsuit_id=lawsuit_id, status=db_models.Status.DOCS_SIGNED)
+                outcome = db_models.Status.DOCS_SIGNED, None
     except UnboundLocalError:
         logger.error("Не смог запустить подпись файлов, т.к. процесс был запущен не через vSphere!")
-        CourtActions.change_status(
-            lawsuit_id=lawsuit_id,
-            status = db_models.Status.ERROR,
-            error_msg="Не смог подписать файлы, из-за запуска не из под vSphere!"
-            )
+        outcome = db_models.Status.ERROR, "Не смог подписать файлы, из-за запуска не из под vSphere!"
     except Exception as ex:
         logger.error(f"Произошла непредвиденная ошибка при подписи файлов, сам процесс не отработал! Ошибка:\n{ex}")
-        CourtActions.change_status(
-            lawsuit_id=lawsuit_id,
-            status = db_models.Status.ERROR,
-            error_msg="Не смог подписать файлы, из-за непредвиденной ошибки"
-            )
+        outcome = db_models.Status.ERROR, "Не смог подписать файлы, из-за непредвиденной ошибки"
+
+    return outcome
 
 
 # XXX: Подпись работает только через vSphere, иначе будут ошибки!
@@ -132,12 +120,26 @@ def signed_files(path_to_folder: Path | str, user_name: str, logger: CustomLogge
     if user_name in CERT_IN_REGISTRE:
         pin = True
 
+    # Статусы сохраняются пачками: (статус, текст ошибки) -> список ID пакетов
+    outcomes: dict[tuple[db_models.Status, str | None], list[str]] = defaultdict(list)
     for folder in folders:
-        run_cryptcp_sign(
+        started = time.perf_counter()
+        outcome = run_cryptcp_sign(
             thumbprint=thumbprint,
             path_to_folder=folder,
             logger=logger,
             pin=pin
             )
-    
+        metrics_store.observe(
+            "gas_signing_duration_seconds",
+            time.perf_counter() - started,
+            outcome="unchanged" if not outcome else "ok" if outcome[0] == db_models.Status.DOCS_SIGNED else "error"
+            )
+        if outcome:
+            outcomes[outcome].append(Path(folder).name)
+
+    for (status, error_msg), lawsuit_ids in outcomes.items():
+        CourtActions.change_status_many(status=status, lawsuit_ids=lawsuit_ids, error_msg=error_msg)
+        logger.info(f"Подпись файлов: статус {status!r} у {len(lawsuit_ids)!r} шт. Ошибка: {error_msg!r}")
+
     process_main_folder(path_to_folder=path_to_folder, logger=logger)
@@ -1,12 +1,21 @@
-import subprocess
-
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, jsonify, render_template, request
 
 from core import process_manager
-from utils import get_history_state, get_lawsuit_state, get_users_submits_state, user_is_active
+from database.database import engine, engine_archive_read, engine_read
+from database.lookup import engine_lookup
+from database.metrics import instrument_engines
+from utils import (MAX_LAWSUITS_PER_REQUEST, get_history_state, get_lawsuit_state, get_lawsuit_states,
+                   get_metrics, get_users_submits_state, user_is_active)
+from utils.change_feed import change_feed, sse_stream
+from utils.http_cache import conditional_json, data_version
+from utils.http_handler_helper import SUBMITS_STATE_TTL, history_period
+from utils.jobs import JobStage, job_manager
 
 app = Flask(__name__)
 
+#длительность запросов к базам (gas_db_query_duration_seconds) измеряется только в процессе веб-сервера
+instrument_engines(engine, engine_read, engine_archive_read, engine_lookup)
+
 
 @app.route('/')
 @app.route('/index')
@@ -19,27 +28,47 @@ def sendings_for_cession():
 
 @app.route('/getstate', methods=['GET'])
 def get_state():
-    response = get_users_submits_state()
-    return jsonify(response)
+    """Карточки пользователей, 304 - карточки не изменились с ответа с ETag из If-None-Match"""
+    return conditional_json.response(request, 'getstate', data_version(), get_users_submits_state,
+                                     max_age=SUBMITS_STATE_TTL)
 
 #TODO: добавлена проверка активности пользователя
 @app.route('/startsubmit', methods=['GET'])
 def start_submit():
-    user=request.args.get('username')
+    """Запуск подачи по сотруднику, ответ возвращается сразу, ход запуска - GET /jobs/<jobId>"""
+    return _submit_job(request.args.get('username'))
+
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    data = request.get_json(silent=True) or request.form
+    return _submit_job(data.get('username'))
+
+
+@app.route('/jobs', methods=['GET'])
+def get_jobs():
+    return jsonify([job.to_dict() for job in job_manager.jobs()])
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    if not (job:=job_manager.get(job_id)):
+        return 'Задание не найдено', 404
+    return jsonify(job.to_dict())
+
+
+def _submit_job(user):
+    if not user:
+        return 'Не указан пользователь', 400
     if user_is_active(user):
         return 'У пользователя активна подача', 400
-    subprocess.Popen(
-        [
-            fr"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\venv\Scripts\python.exe",
-            fr"C:\Users\gaspravo-crypto-usr\Documents\GAS_Justice\core\dispatcher.py",
-            "--user_name", user
-        ],
-        creationflags=subprocess.CREATE_NEW_CONSOLE
-    )
-    if user_is_active(owner=user, wait_time_out=True):
-        return jsonify({'success':True})
-    else:
-        return 'Не удалось вернуть результат, попытайтесь снова через 10 минут', 400
+    job, created = job_manager.submit(user)
+    if not created:
+        return jsonify({'success':False, 'jobId':job.job_id, 'job':job.to_dict()}), 409
+    if job.stage==JobStage.FAILED:
+        #процесс подачи не запустился
+        return jsonify({'success':False, 'jobId':job.job_id, 'job':job.to_dict()}), 500
+    return jsonify({'success':True, 'jobId':job.job_id, 'job':job.to_dict()}), 202
 
 
 @app.route('/getresult', methods=['POST'])
@@ -49,11 +78,50 @@ def get_result_submit():
     return jsonify(response)
 
 
+@app.route('/getresults', methods=['POST'])
+def get_results_submits():
+    """Состояния списка подач, тело запроса: {"lawsuitIds": [id, ...]}
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        lawsuits = [int(lawsuit) for lawsuit in data.get('lawsuitIds', [])]
+    except (TypeError, ValueError):
+        return 'lawsuitIds должен быть списком целых чисел', 400
+    if len(lawsuits) > MAX_LAWSUITS_PER_REQUEST:
+        return f'Не более {MAX_LAWSUITS_PER_REQUEST} подач в одном запросе', 400
+    response = get_lawsuit_states(lawsuits)
+    return jsonify(response)
+
+
+@app.route('/events', methods=['GET'])
+def dashboard_events():
+    """Изменения карточек и графиков (Server-Sent Events), 
+    при 503 клиент обновляет данные опросом /getstate и /gethistory
+    """
+    subscriber = change_feed.subscribe()
+    if subscriber is None:
+        return 'Превышено количество подключений, используйте опрос', 503
+    return Response(sse_stream(subscriber), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Метрики подач и процессов в формате Prometheus"""
+    return Response(get_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/gethistory', methods=['GET'])
 def get_history_submits():
+    """История подач за период, 304 - история не изменилась с ответа с ETag из If-None-Match"""
     period=request.args.get('period')
-    response=get_history_state(period)
-    return jsonify(response)
+    try:
+        #начало периода входит в версию: с началом нового дня/недели/месяца ответ пересчитывается
+        version = (data_version(), history_period(period)[-1])
+    except ValueError as ex:
+        return str(ex), 400
+    return conditional_json.response(request, ('gethistory', period), version, 
+                                     lambda: get_history_state(period))
 
 # PARSER 
 
@@ -1,3 +1,5 @@
+import { onDashboardEvent } from './DashboardEvents.js';
+
 export default {
   template: `
     <div style="width:1000px; height:500px;">
@@ -19,6 +21,12 @@ export default {
                     <button @click="changeInterval('Monthly')" type="button" class="btn btn-secondary" 
                         v-bind:class="{disabled: curentInterval=='Monthly'}">Месяц
                     </button>
+                    <button @click="changeInterval('Quarterly')" type="button" class="btn btn-secondary" 
+                        v-bind:class="{disabled: curentInterval=='Quarterly'}">Квартал
+                    </button>
+                    <button @click="changeInterval('Yearly')" type="button" class="btn btn-secondary" 
+                        v-bind:class="{disabled: curentInterval=='Yearly'}">Год
+                    </button>
                 </div>
             </div>
 
@@ -30,7 +38,7 @@ export default {
     return {
     chart:null,
     limitAutoUpdate:10,
-    curentInterval:'Daily', //Daily, Weekly, Monthly 
+    curentInterval:'Daily', //Daily, Weekly, Monthly, Quarterly, Yearly 
     intervals:[],
     results:[],
     currentData:{user:'Все', countSubmit:{succes:[], failure:[], failure_rmc:[]}},
@@ -94,6 +102,9 @@ export default {
 
     async updateChart(){
         await this.getState(this.curentInterval);
+        if (Array.isArray(this.results)) {
+          this.currentData = this.results.find(result => result.user === this.currentData.user) || this.currentData;
+        }
         if (this.limitAutoUpdate<=0) {
             this.renderChart();
             this.limitAutoUpdate=10;
@@ -130,8 +141,30 @@ export default {
    stopUpdate() {
       if (this.update) {
         window.clearInterval(this.update)
+        this.update = null
       }
    },
+//------прирост графика по событиям сервера--------------------
+   applyIncrements(increments) {
+      if (!Array.isArray(this.results) || !this.chart) return;
+      for (const increment of increments) {
+        const position = increment.positions[this.curentInterval];
+        if (position === undefined) continue;
+        for (const result of this.results) {
+          if (result.user === increment.user || result.user === 'Все') {
+            result.countSubmit[increment.key][position] += 1;
+          }
+        }
+      }
+      this.chart.update();
+   },
+//------подписка на события сервера, при недоступности - опрос--------------------
+   subscribeEvents() {
+      onDashboardEvent('open', () => { this.stopUpdate(); this.updateChart(); });
+      onDashboardEvent('closed', () => { if (!this.update) this.updateState(); });
+      onDashboardEvent('history', increments => this.applyIncrements(increments));
+      onDashboardEvent('history_refetch', () => this.updateChart());
+   },
 
     async getState(interval) {
       try {
@@ -164,6 +197,7 @@ export default {
     this.getState('Daily');
     this.renderChart();
 		this.updateState();
+		this.subscribeEvents();
 
   },
 
@@ -0,0 +1,42 @@
+// Общее для всех компонентов подключение к /events (Server-Sent Events)
+// События: open - подключение установлено (нужно один раз обновить данные целиком),
+//          closed - подключение невозможно (сервер вернул ошибку), компоненты переходят на опрос,
+//          cards - изменившиеся карточки пользователей, history - прирост графиков,
+//          history_refetch - графики нужно перечитать целиком (подача ушла из учитываемого статуса)
+//          resync - сервер восстановился после ошибки проверки изменений, данные обновляются целиком (как open)
+let source = null;
+const listeners = {open: [], closed: [], cards: [], history: [], history_refetch: []};
+
+//пауза перед повторной попыткой подключения после перехода на опрос, мс
+const RECONNECT_DELAY = 60000;
+
+function emit(name, data) {
+  listeners[name].forEach(callback => callback(data));
+}
+
+function connect() {
+  if (source) return;
+  if (!window.EventSource) {
+    setTimeout(() => emit('closed'), 0);
+    return;
+  }
+  source = new EventSource(window.location.pathname.replace('/', '')+'/events');
+  source.addEventListener('open', () => emit('open'));
+  source.addEventListener('cards', event => emit('cards', JSON.parse(event.data)));
+  source.addEventListener('history', event => emit('history', JSON.parse(event.data)));
+  source.addEventListener('history_refetch', () => emit('history_refetch'));
+  source.addEventListener('resync', () => emit('open'));
+  source.addEventListener('error', () => {
+    //при обрыве браузер переподключается сам, CLOSED - сервер отказал в подключении
+    if (source.readyState === EventSource.CLOSED) {
+      source = null;
+      emit('closed');
+      setTimeout(connect, RECONNECT_DELAY);
+    }
+  });
+}
+
+export function onDashboardEvent(name, callback) {
+  listeners[name].push(callback);
+  connect();
+}
@@ -1,3 +1,10 @@
+import { onDashboardEvent } from './DashboardEvents.js';
+
+//период опроса задания, мс
+const JOB_POLL_DELAY = 2000;
+//максимум опросов задания: чуть дольше ожидания активной подачи на сервере (utils.jobs.ACTIVE_TIMEOUT, 5 минут)
+const JOB_MAX_POLLS = 180;
+
 export default {
   template: `
     <div class="row d-flex">
@@ -104,9 +111,15 @@ methods: {
         this.modal.updating = true;
         const response = await fetch(window.location.pathname.replace('/', '')+'/startsubmit?username='+this.modal.name);
 
-        // Проверяем статус ответа
+        // Проверяем статус ответа, при ошибке запуска сервер возвращает задание с сообщением
         if (!response.ok) {
-          throw new Error(`HTTP error! status: ${response.status}`);
+          const data = await response.json().catch(() => null);
+          throw new Error(data?.job?.message || `HTTP error! status: ${response.status}`);
+        }
+        const {jobId} = await response.json();
+        const job = await this.waitJob(jobId);
+        if (job.stage == 'failed' || job.stage == 'timeout') {
+          throw new Error(job.message || 'Не удалось запустить подачу');
         }
         this.getState();
         this.hideModal();
@@ -121,6 +134,22 @@ methods: {
 
     },
 
+    async waitJob(jobId) {
+        //Опрашивает задание, пока процесс подачи загружает реестр (этап started), не больше JOB_MAX_POLLS раз
+      for (let poll = 0; poll < JOB_MAX_POLLS; poll++) {
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_DELAY));
+        const response = await fetch(window.location.pathname.replace('/', '')+'/jobs/'+jobId);
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const job = await response.json();
+        if (job.stage != 'started') {
+          return job;
+        }
+      }
+      throw new Error('Не удалось дождаться запуска подачи, обновите страницу');
+    },
+
     async getState() {
         //Обновляет инфу по карточкам
       try {
@@ -155,10 +184,22 @@ methods: {
    stopUpdate() {
       if (this.update) {
         window.clearInterval(this.update)
+        this.update = null
       }
-      if (this.update) {
-        window.clearInterval(this.update)
+   },
+//------замена изменившихся карточек (события сервера)--------------------
+   applyCards(cards) {
+      for (const card of cards) {
+        const index = this.cardsData.findIndex(item => item.nameUser === card.nameUser);
+        if (index >= 0) this.cardsData.splice(index, 1, card);
+        else this.cardsData.push(card);
       }
+   },
+//------подписка на события сервера, при недоступности - опрос--------------------
+   subscribeEvents() {
+      onDashboardEvent('open', () => { this.stopUpdate(); this.getState(); });
+      onDashboardEvent('closed', () => { if (!this.update) this.updateState(); });
+      onDashboardEvent('cards', cards => this.applyCards(cards));
    }
 
 
@@ -171,6 +212,7 @@ methods: {
 //------вызов функции после формирования страницы-----------
 	mounted() {
 		this.updateState();
+		this.subscribeEvents();
 
   },
 